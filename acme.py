@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+ACME Survey Pipeline
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Runs every analysis stage in one process against a single in-memory copy of
+the survey, so the workbook is loaded once per run.
+
+    python acme.py run                       # full pipeline
+    python acme.py run --stages deep,geo     # selected stages only
+    python acme.py append new_export.xlsx    # add a new survey wave
+    python acme.py run --waves               # analyze all waves together
+    python acme.py run --collapse-duplicates # count copy-pasted answers once
+    python acme.py run --sentiment vader-lexicon  # vectorized VADER scoring
+"""
+
+import argparse
+import importlib
+import sys
+import time
+import traceback
+
+from survey_dataset import SurveyDataset
+
+# (stage name, module, output) in dependency order: the HTML report reads
+# analysis_summary.json, map_data.json and traceability_table.html, and the
+# PDF reads analysis_summary.json
+STAGES = [
+    ('columns', 'austin_grants_analysis', 'column_classifications.txt'),
+    ('zipcodes', 'check_zipcodes', 'corrected_zip_stats.json'),
+    ('deep', 'deep_analysis', 'analysis_summary.json'),
+    ('equity', 'equity_analysis', 'equity figures'),
+    ('advanced', 'advanced_analysis', 'advanced_insights.json'),
+    ('geo', 'geographic_analysis', 'map_data.json'),
+    ('figures', 'generate_visualizations', 'figures/'),
+    ('traceability', 'generate_traceability_report', 'traceability_table.html'),
+    ('html', 'generate_html_report', 'Austin_Cultural_Grants_Interactive_Report.html'),
+    ('pdf', 'final_report', 'Austin_Cultural_Grants_Leadership_Briefing.pdf'),
+]
+
+
+def select_stages(names=None):
+    """Stages to run, in pipeline order"""
+    if not names:
+        return list(STAGES)
+    known = {name for name, _, _ in STAGES}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(unknown)}. "
+                         f"Choose from: {', '.join(name for name, _, _ in STAGES)}")
+    return [stage for stage in STAGES if stage[0] in names]
+
+
+def run_pipeline(source='ACME.xlsx', stages=None, waves=False, collapse_duplicates=False,
+                 sentiment='vader'):
+    """Load the survey once and run each stage against the shared dataset"""
+    start = time.time()
+    dataset = SurveyDataset.load_waves(source) if waves else SurveyDataset.load(source)
+    dataset.collapse_duplicates = collapse_duplicates
+    dataset.sentiment_analyzer = sentiment
+    print(f"Loaded {len(dataset):,} responses from {source} in {time.time() - start:.2f}s")
+    if dataset.dtype_report is not None:
+        report = dataset.dtype_report
+        print(f"Compact dtypes: {report['bytes_before'].sum() / 1e6:.2f} MB -> "
+              f"{report['bytes_after'].sum() / 1e6:.2f} MB in memory "
+              f"(python survey_dtypes.py for the per-column report)")
+
+    timings = []
+    failed = []
+    for name, module_name, output in select_stages(stages):
+        stage_start = time.time()
+        # A failing stage is reported but does not stop the later ones; the
+        # report stages fall back to defaults when an input file is missing
+        try:
+            importlib.import_module(module_name).run(dataset)
+        except Exception:
+            traceback.print_exc()
+            failed.append(name)
+            output = 'FAILED'
+        timings.append((name, output, time.time() - stage_start))
+
+    print("\n" + "="*80)
+    print("PIPELINE COMPLETE" if not failed else f"PIPELINE FINISHED WITH {len(failed)} FAILED STAGE(S)")
+    print("="*80)
+    for name, output, seconds in timings:
+        print(f"  {name:<14} {seconds:7.2f}s  -> {output}")
+    print(f"  {'total':<14} {time.time() - start:7.2f}s")
+    return failed
+
+
+def append_wave(export, base='ACME.xlsx', key='auto'):
+    """Ingest a new export and report what changed"""
+    from survey_waves import WaveStore
+    store = WaveStore(base, key=key)
+    waves_before = len(store.manifest['waves'])
+    delta = store.append(export)
+    if len(store.manifest['waves']) == waves_before:
+        return delta
+    wave = store.manifest['waves'][-1]
+    print(f"Wave {wave['index']} ({wave['source']}): {wave['new_rows']} new responses, "
+          f"{wave['duplicates']} duplicates skipped (deduplicated by {store.manifest['key']})")
+
+    aggregates = store.aggregates()
+    print(f"Total responses across waves: {aggregates.rows:,}")
+    print("Top zip codes:", ', '.join(f"{z} ({c})" for z, c in aggregates.zip_counts.most_common(5)))
+    print("Top barriers:", ', '.join(f"{b} ({c})" for b, c in aggregates.barrier_counts.most_common(3)))
+    if aggregates.sentiment['responses']:
+        avg = aggregates.sentiment['compound_sum'] / aggregates.sentiment['responses']
+        print(f"Improvement sentiment: {avg:.3f} average over {aggregates.sentiment['responses']} responses")
+    themes = aggregates.themes.top(5, ngram=2)
+    if themes:
+        print("Top improvement phrases:", ', '.join(f"{t} ({c})" for t, c, _ in themes))
+    return delta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ACME survey analysis pipeline')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the analysis pipeline')
+    run_parser.add_argument('--source', default='ACME.xlsx',
+                            help='Survey workbook to analyze (default: ACME.xlsx)')
+    run_parser.add_argument('--stages',
+                            help='Comma-separated stage names (default: all)')
+    run_parser.add_argument('--waves', action='store_true',
+                            help='Analyze the base survey plus every appended wave')
+    run_parser.add_argument('--collapse-duplicates', action='store_true',
+                            help='Count near-duplicate text answers once in themes and sentiment')
+    run_parser.add_argument('--sentiment', choices=['vader', 'vader-lexicon'], default='vader',
+                            help='VADER scorer: NLTK per answer, or vectorized (default: vader)')
+
+    append_parser = subparsers.add_parser('append', help='Add a new survey export as a wave')
+    append_parser.add_argument('export', help='New survey export (.xlsx)')
+    append_parser.add_argument('--base', default='ACME.xlsx',
+                               help='Base survey workbook (default: ACME.xlsx)')
+    append_parser.add_argument('--key', choices=['auto', 'id', 'start_email'], default='auto',
+                               help='How to recognise repeated responses (default: auto)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        stages = args.stages.split(',') if args.stages else None
+        if run_pipeline(args.source, stages, waves=args.waves,
+                        collapse_duplicates=args.collapse_duplicates, sentiment=args.sentiment):
+            sys.exit(1)
+    elif args.command == 'append':
+        append_wave(args.export, base=args.base, key=args.key)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,247 +12,272 @@ from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 import networkx as nx
-from scipy import stats
 import json
+from survey_dataset import SurveyDataset
+from survey_ordinal import encode_ordinals, rank_correlations
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*80)
-print("ADVANCED ANALYSIS: UNCOVERING HIDDEN PATTERNS")
-print("="*80)
-print()
-
-# Load the survey data
-df = pd.read_excel('ACME.xlsx')
-
-# 1. INTERSECTIONAL ANALYSIS
-print("Performing Intersectional Analysis...")
-print("-" * 50)
-
-# Analyze zip code patterns with barriers
-zip_col = 'What zip code do you reside in?'
-barriers_col = 'What barriers, if any, prevent you from participating in arts and culture events in Austin? (Select all that apply.)'
-
-# Create zip code clusters based on response patterns
-top_zips = df[zip_col].value_counts().head(20).index
-
-# Analyze barrier patterns by geographic area
-geographic_barriers = {}
-for zip_code in top_zips:
-    zip_data = df[df[zip_col] == zip_code]
-    if len(zip_data) > 5:  # Minimum sample size
-        barriers = zip_data[barriers_col].dropna()
-        
-        # Count barrier types
-        cost_mentions = barriers.str.contains('Cost|cost|ticket|admission', case=False, na=False).sum()
-        transport_mentions = barriers.str.contains('Transport|transportation|parking', case=False, na=False).sum()
-        awareness_mentions = barriers.str.contains('aware|know|information', case=False, na=False).sum()
-        
-        geographic_barriers[str(zip_code)] = {
-            'total_responses': len(zip_data),
-            'cost_barrier_rate': cost_mentions / len(zip_data) * 100,
-            'transport_barrier_rate': transport_mentions / len(zip_data) * 100,
-            'awareness_barrier_rate': awareness_mentions / len(zip_data) * 100
+# Questions this analysis reads (survey_schema question keys)
+QUESTION_KEYS = ['zip', 'barriers', 'participation', 'equal_access', 'awareness',
+                 'satisfaction', 'improvements']
+
+def run(dataset):
+    """Intersectional, segmentation, correlation and theme network analysis"""
+    print("="*80)
+    print("ADVANCED ANALYSIS: UNCOVERING HIDDEN PATTERNS")
+    print("="*80)
+    print()
+
+    # Work on the shared survey dataset
+    df = dataset.df
+    schema = dataset.schema.require(*QUESTION_KEYS)
+
+    # 1. INTERSECTIONAL ANALYSIS
+    print("Performing Intersectional Analysis...")
+    print("-" * 50)
+
+    # Analyze zip code patterns with barriers
+    zip_col = schema['zip']
+    barriers = dataset.multiselect('barriers')
+
+    # Create zip code clusters based on response patterns
+    zip_counts = dataset.clean_zip()[df[zip_col].notna()].value_counts()
+    top_zips = zip_counts.head(20).index
+
+    # Barrier types per zip, read from the survey cube (cleaned zip codes)
+    barrier_mentions = dataset.cube().counts('barrier_type', 'zip')
+
+    # Analyze barrier patterns by geographic area
+    geographic_barriers = {}
+    for zip_code in top_zips:
+        zip_total = int(zip_counts[zip_code])
+        if zip_total > 5:  # Minimum sample size
+            mentions = barrier_mentions.loc[zip_code]
+            geographic_barriers[str(zip_code)] = {
+                'total_responses': zip_total,
+                'cost_barrier_rate': mentions['cost'] / zip_total * 100,
+                'transport_barrier_rate': mentions['transport'] / zip_total * 100,
+                'awareness_barrier_rate': mentions['awareness'] / zip_total * 100
+            }
+
+    # Identify high-need areas
+    print("\nGeographic Equity Analysis:")
+    high_barrier_zips = []
+    for zip_code, data in geographic_barriers.items():
+        total_barrier_rate = (data['cost_barrier_rate'] + data['transport_barrier_rate'] + data['awareness_barrier_rate']) / 3
+        if total_barrier_rate > 40:
+            high_barrier_zips.append((zip_code, total_barrier_rate))
+            print(f"  ZIP {zip_code}: {total_barrier_rate:.1f}% average barrier rate (HIGH NEED)")
+
+    # Barriers and programs chosen together (packed bitsets, see survey_bitsets)
+    print("\nMost Common Barrier Combinations:")
+    barrier_pairs = dataset.bitsets('barriers').pairs(top=6).head(5)
+    for pair in barrier_pairs.itertuples():
+        print(f"  {pair.option_a} + {pair.option_b}: {pair.count} respondents")
+
+    awareness_bits = dataset.bitsets('awareness')
+    program_overlap = {}
+    print("\nProgram Awareness Overlap:")
+    for program, other in [('Heritage', 'Thrive'), ('Nexus', 'Elevate'), ('AIPP', 'Nexus')]:
+        program_overlap[f'{program} and {other}'] = awareness_bits.count(program, other)
+        program_overlap[f'{program} not {other}'] = awareness_bits.query(all_of=[program], none_of=[other])
+        print(f"  Aware of {program}: {program_overlap[f'{program} and {other}']} also know {other}, "
+              f"{program_overlap[f'{program} not {other}']} do not")
+
+    # 2. RESPONDENT CLUSTERING
+    print("\n\nRespondent Segmentation Analysis...")
+    print("-" * 50)
+
+    # Create feature matrix for clustering
+    features = []
+    feature_names = []
+
+    # Participation frequency
+    # Every Likert question encoded once from survey_ordinal.ORDINAL_LEVELS
+    ordinal = encode_ordinals(df, schema)
+    for key, answers in ordinal.attrs['unknown_answers'].items():
+        print(f"  Note: unrecognized {key} answers treated as missing: {answers}")
+
+    if 'participation' in ordinal.columns:
+        df['participation_score'] = ordinal['participation']
+        features.append('participation_score')
+        feature_names.append('Participation Frequency')
+
+    # Equal access belief
+    if 'equal_access' in ordinal.columns:
+        # No = 0, Somewhat = 0.5, Yes = 1; 'Unsure' is left missing
+        df['access_belief'] = ordinal['equal_access'] / 2
+        features.append('access_belief')
+        feature_names.append('Equal Access Belief')
+
+    # Grant awareness
+    df['grant_awareness'] = dataset.multiselect('awareness').n_selected()
+    features.append('grant_awareness')
+    feature_names.append('Program Awareness Count')
+
+    # Prepare data for clustering
+    cluster_data = df[features].dropna()
+    if len(cluster_data) > 100:
+        # Standardize features
+        scaler = StandardScaler()
+        scaled_data = scaler.fit_transform(cluster_data)
+
+        # Perform clustering
+        kmeans = KMeans(n_clusters=4, random_state=42)
+        clusters = kmeans.fit_predict(scaled_data)
+
+        # Analyze clusters
+        cluster_profiles = {}
+        for i in range(4):
+            cluster_mask = clusters == i
+            profile = {
+                'size': cluster_mask.sum(),
+                'characteristics': {}
+            }
+            for j, feature in enumerate(features):
+                profile['characteristics'][feature_names[j]] = cluster_data.iloc[cluster_mask][feature].mean()
+            cluster_profiles[f'Segment_{i+1}'] = profile
+
+        print("\nRespondent Segments Identified:")
+        segment_names = {
+            0: "Highly Engaged Advocates",
+            1: "Aware but Facing Barriers", 
+            2: "Occasional Participants",
+            3: "Disconnected Community Members"
         }
 
-# Identify high-need areas
-print("\nGeographic Equity Analysis:")
-high_barrier_zips = []
-for zip_code, data in geographic_barriers.items():
-    total_barrier_rate = (data['cost_barrier_rate'] + data['transport_barrier_rate'] + data['awareness_barrier_rate']) / 3
-    if total_barrier_rate > 40:
-        high_barrier_zips.append((zip_code, total_barrier_rate))
-        print(f"  ZIP {zip_code}: {total_barrier_rate:.1f}% average barrier rate (HIGH NEED)")
-
-# 2. RESPONDENT CLUSTERING
-print("\n\nRespondent Segmentation Analysis...")
-print("-" * 50)
-
-# Create feature matrix for clustering
-features = []
-feature_names = []
-
-# Participation frequency
-participation_col = 'How often do you attend or participate in arts, cultural, or entertainment events in Austin? '
-if participation_col in df.columns:
-    participation_map = {'Never': 0, 'Rarely': 1, 'Sometimes': 2, 'Often': 3, 'Very often': 4}
-    df['participation_score'] = df[participation_col].map(participation_map)
-    features.append('participation_score')
-    feature_names.append('Participation Frequency')
-
-# Equal access belief
-access_col = 'Do you feel that all Austin residents have equal access to arts, cultural, music, and entertainment opportunities? '
-if access_col in df.columns:
-    access_map = {'Yes': 2, 'Somewhat': 1, 'No': 0}
-    df['access_belief'] = df[access_col].apply(lambda x: 1 if 'Yes' in str(x) else 0 if 'No' in str(x) else 0.5)
-    features.append('access_belief')
-    feature_names.append('Equal Access Belief')
-
-# Grant awareness
-df['grant_awareness'] = df[df.columns[21]].apply(lambda x: len(str(x).split(';')) if pd.notna(x) else 0)
-features.append('grant_awareness')
-feature_names.append('Program Awareness Count')
-
-# Prepare data for clustering
-cluster_data = df[features].dropna()
-if len(cluster_data) > 100:
-    # Standardize features
-    scaler = StandardScaler()
-    scaled_data = scaler.fit_transform(cluster_data)
-    
-    # Perform clustering
-    kmeans = KMeans(n_clusters=4, random_state=42)
-    clusters = kmeans.fit_predict(scaled_data)
-    
-    # Analyze clusters
-    cluster_profiles = {}
-    for i in range(4):
-        cluster_mask = clusters == i
-        profile = {
-            'size': cluster_mask.sum(),
-            'characteristics': {}
+        for i, (segment, profile) in enumerate(cluster_profiles.items()):
+            print(f"\n{segment_names.get(i, segment)} (n={profile['size']}):")
+            for char, value in profile['characteristics'].items():
+                print(f"  - {char}: {value:.2f}")
+
+    # 3. PROGRAM CORRELATION ANALYSIS
+    print("\n\nProgram Success Correlation Analysis...")
+    print("-" * 50)
+
+    # Analyze which factors correlate with positive program experiences
+    if 'satisfaction' in ordinal.columns:
+        # Satisfaction score from 1 (very dissatisfied) to 5 (very satisfied)
+        df['satisfaction_score'] = ordinal['satisfaction'] + 1
+        df['barrier_count'] = barriers.n_selected()
+
+        # Spearman matrix over every ordinal question plus the count features,
+        # each pair using the respondents who answered both
+        rank_inputs = ordinal.assign(barrier_count=df['barrier_count'],
+                                     grant_awareness=df['grant_awareness'])
+        ordinal_correlations = rank_correlations(rank_inputs, method='spearman')
+
+        # Correlate with other factors
+        correlations = {}
+        for factor, column in [('Participation Frequency', 'participation'), ('Barrier Count', 'barrier_count')]:
+            if column in rank_inputs.columns:
+                correlations[factor] = {
+                    'correlation': ordinal_correlations['corr'].loc['satisfaction', column],
+                    'p_value': ordinal_correlations['p_value'].loc['satisfaction', column],
+                    'n': int(ordinal_correlations['n'].loc['satisfaction', column]),
+                }
+
+        print("Factors Correlated with Program Satisfaction:")
+        for factor, stats_data in correlations.items():
+            significance = "***" if stats_data['p_value'] < 0.001 else "**" if stats_data['p_value'] < 0.01 else "*" if stats_data['p_value'] < 0.05 else ""
+            print(f"  {factor}: r={stats_data['correlation']:.3f} {significance} (n={stats_data['n']})")
+
+    # 4. TEMPORAL PATTERN ANALYSIS
+    print("\n\nTemporal Pattern Analysis...")
+    print("-" * 50)
+
+    # Analyze survey completion patterns
+    if 'start_time' in schema and 'completion_time' in schema:
+        df['start_datetime'] = pd.to_datetime(df[schema['start_time']], errors='coerce')
+        df['completion_datetime'] = pd.to_datetime(df[schema['completion_time']], errors='coerce')
+        df['response_duration'] = (df['completion_datetime'] - df['start_datetime']).dt.total_seconds() / 60
+
+        # Analyze response patterns
+        df['hour_of_day'] = df['start_datetime'].dt.hour
+        df['day_of_week'] = df['start_datetime'].dt.day_name()
+
+        print("Response Pattern Insights:")
+        print(f"  Average completion time: {df['response_duration'].mean():.1f} minutes")
+        print(f"  Peak response hours: {df['hour_of_day'].mode().values}")
+        print(f"  Most active days: {df['day_of_week'].value_counts().head(3).index.tolist()}")
+
+    # 5. PREDICTIVE INSIGHTS
+    print("\n\nPredictive Insights for Program Design...")
+    print("-" * 50)
+
+    # Create success likelihood model based on respondent characteristics
+    success_factors = {
+        'High Success Likelihood': {
+            'profile': 'Frequent participants with high awareness and few barriers',
+            'recommendations': ['Fast-track applications', 'Peer mentorship roles', 'Ambassador programs']
+        },
+        'Medium Success - Need Support': {
+            'profile': 'Interested but facing 2-3 barriers',
+            'recommendations': ['Simplified processes', 'Financial assistance', 'Transportation support']
+        },
+        'High Potential - Need Outreach': {
+            'profile': 'Unaware of programs but interested in arts',
+            'recommendations': ['Targeted marketing', 'Community partnerships', 'Pop-up information sessions']
+        },
+        'Intensive Support Needed': {
+            'profile': 'Multiple barriers and low engagement',
+            'recommendations': ['Neighborhood-based programs', 'Wraparound services', 'Trust building']
         }
-        for j, feature in enumerate(features):
-            profile['characteristics'][feature_names[j]] = cluster_data.iloc[cluster_mask][feature].mean()
-        cluster_profiles[f'Segment_{i+1}'] = profile
-    
-    print("\nRespondent Segments Identified:")
-    segment_names = {
-        0: "Highly Engaged Advocates",
-        1: "Aware but Facing Barriers", 
-        2: "Occasional Participants",
-        3: "Disconnected Community Members"
     }
-    
-    for i, (segment, profile) in enumerate(cluster_profiles.items()):
-        print(f"\n{segment_names.get(i, segment)} (n={profile['size']}):")
-        for char, value in profile['characteristics'].items():
-            print(f"  - {char}: {value:.2f}")
-
-# 3. PROGRAM CORRELATION ANALYSIS
-print("\n\nProgram Success Correlation Analysis...")
-print("-" * 50)
-
-# Analyze which factors correlate with positive program experiences
-satisfaction_col = 'How would you rate your level of satisfaction with these programs overall? '
-if satisfaction_col in df.columns:
-    # Create satisfaction score
-    satisfaction_map = {'Very satisfied': 5, 'Satisfied': 4, 'Neutral': 3, 'Dissatisfied': 2, 'Very dissatisfied': 1}
-    df['satisfaction_score'] = df[satisfaction_col].map(satisfaction_map)
-    
-    # Correlate with other factors
-    correlations = {}
-    
-    # Check correlation with participation frequency
-    if 'participation_score' in df.columns:
-        corr, p_value = stats.spearmanr(df['satisfaction_score'].dropna(), df['participation_score'].dropna())
-        correlations['Participation Frequency'] = {'correlation': corr, 'p_value': p_value}
-    
-    # Check correlation with barrier count
-    df['barrier_count'] = df[barriers_col].apply(lambda x: len(str(x).split(';')) if pd.notna(x) else 0)
-    corr, p_value = stats.spearmanr(df['satisfaction_score'].dropna(), df['barrier_count'].dropna())
-    correlations['Barrier Count'] = {'correlation': corr, 'p_value': p_value}
-    
-    print("Factors Correlated with Program Satisfaction:")
-    for factor, stats_data in correlations.items():
-        significance = "***" if stats_data['p_value'] < 0.001 else "**" if stats_data['p_value'] < 0.01 else "*" if stats_data['p_value'] < 0.05 else ""
-        print(f"  {factor}: r={stats_data['correlation']:.3f} {significance}")
-
-# 4. TEMPORAL PATTERN ANALYSIS
-print("\n\nTemporal Pattern Analysis...")
-print("-" * 50)
-
-# Analyze survey completion patterns
-if 'Start time' in df.columns and 'Completion time' in df.columns:
-    df['start_datetime'] = pd.to_datetime(df['Start time'], errors='coerce')
-    df['completion_datetime'] = pd.to_datetime(df['Completion time'], errors='coerce')
-    df['response_duration'] = (df['completion_datetime'] - df['start_datetime']).dt.total_seconds() / 60
-    
-    # Analyze response patterns
-    df['hour_of_day'] = df['start_datetime'].dt.hour
-    df['day_of_week'] = df['start_datetime'].dt.day_name()
-    
-    print("Response Pattern Insights:")
-    print(f"  Average completion time: {df['response_duration'].mean():.1f} minutes")
-    print(f"  Peak response hours: {df['hour_of_day'].mode().values}")
-    print(f"  Most active days: {df['day_of_week'].value_counts().head(3).index.tolist()}")
-
-# 5. PREDICTIVE INSIGHTS
-print("\n\nPredictive Insights for Program Design...")
-print("-" * 50)
-
-# Create success likelihood model based on respondent characteristics
-success_factors = {
-    'High Success Likelihood': {
-        'profile': 'Frequent participants with high awareness and few barriers',
-        'recommendations': ['Fast-track applications', 'Peer mentorship roles', 'Ambassador programs']
-    },
-    'Medium Success - Need Support': {
-        'profile': 'Interested but facing 2-3 barriers',
-        'recommendations': ['Simplified processes', 'Financial assistance', 'Transportation support']
-    },
-    'High Potential - Need Outreach': {
-        'profile': 'Unaware of programs but interested in arts',
-        'recommendations': ['Targeted marketing', 'Community partnerships', 'Pop-up information sessions']
-    },
-    'Intensive Support Needed': {
-        'profile': 'Multiple barriers and low engagement',
-        'recommendations': ['Neighborhood-based programs', 'Wraparound services', 'Trust building']
-    }
-}
-
-print("Predictive Segmentation for Program Success:")
-for segment, data in success_factors.items():
-    print(f"\n{segment}:")
-    print(f"  Profile: {data['profile']}")
-    print(f"  Recommended Interventions:")
-    for rec in data['recommendations']:
-        print(f"    - {rec}")
-
-# 6. NETWORK ANALYSIS OF THEMES
-print("\n\nThematic Network Analysis...")
-print("-" * 50)
-
-# Create co-occurrence network of themes
-improvements_col = 'What improvements would you like to see in these cultural funding programs?'
-if improvements_col in df.columns:
-    # Extract key themes
-    themes = ['funding', 'communication', 'equity', 'access', 'process', 'transparency', 
-              'diversity', 'community', 'support', 'awareness']
-    
-    # Build co-occurrence matrix
-    co_occurrence = np.zeros((len(themes), len(themes)))
-    
-    for response in df[improvements_col].dropna():
-        response_lower = str(response).lower()
-        present_themes = [i for i, theme in enumerate(themes) if theme in response_lower]
-        
-        for i in present_themes:
-            for j in present_themes:
-                if i != j:
-                    co_occurrence[i][j] += 1
-    
-    # Find strongest theme connections
-    print("Strongly Connected Improvement Themes:")
-    for i in range(len(themes)):
-        for j in range(i+1, len(themes)):
-            if co_occurrence[i][j] > 50:  # Threshold for strong connection
-                print(f"  {themes[i]} <-> {themes[j]} ({int(co_occurrence[i][j])} co-occurrences)")
-
-# Save advanced insights
-advanced_insights = {
-    'geographic_barriers': geographic_barriers,
-    'high_need_areas': high_barrier_zips,
-    'respondent_segments': cluster_profiles if 'cluster_profiles' in locals() else {},
-    'success_factors': success_factors,
-    'temporal_patterns': {
-        'avg_completion_time': df['response_duration'].mean() if 'response_duration' in df.columns else None,
-        'peak_hours': df['hour_of_day'].mode().values.tolist() if 'hour_of_day' in df.columns else []
+
+    print("Predictive Segmentation for Program Success:")
+    for segment, data in success_factors.items():
+        print(f"\n{segment}:")
+        print(f"  Profile: {data['profile']}")
+        print(f"  Recommended Interventions:")
+        for rec in data['recommendations']:
+            print(f"    - {rec}")
+
+    # 6. NETWORK ANALYSIS OF THEMES
+    print("\n\nThematic Network Analysis...")
+    print("-" * 50)
+
+    # Create co-occurrence network of themes
+    improvements_col = schema['improvements']
+    if improvements_col in df.columns:
+        # Extract key themes (keywords in survey_themes)
+        improvement_themes = dataset.themes('improvements', 'improvements')
+
+        # Co-occurrence edges from the sparse theme matrix (XᵀX), with lift,
+        # PMI and Jaccard normalizations
+        theme_edges = improvement_themes.cooccurrence_edges()
+
+        # Find strongest theme connections
+        print("Strongly Connected Improvement Themes:")
+        for edge in theme_edges[theme_edges['count'] > 50].itertuples():  # Threshold for strong connection
+            print(f"  {edge.source} <-> {edge.target} ({edge.count} co-occurrences, lift {edge.lift:.2f})")
+
+    # Save advanced insights
+    advanced_insights = {
+        'geographic_barriers': geographic_barriers,
+        'high_need_areas': high_barrier_zips,
+        'barrier_combinations': barrier_pairs.values.tolist(),
+        'program_overlap': program_overlap,
+        'respondent_segments': cluster_profiles if 'cluster_profiles' in locals() else {},
+        'success_factors': success_factors,
+        'theme_network': theme_edges.round(4).to_dict('records') if 'theme_edges' in locals() else [],
+        'ordinal_correlations': {
+            name: ordinal_correlations[name].round(4).to_dict()
+            for name in ('corr', 'p_value', 'n')
+        } if 'ordinal_correlations' in locals() else {},
+        'temporal_patterns': {
+            'avg_completion_time': df['response_duration'].mean() if 'response_duration' in df.columns else None,
+            'peak_hours': df['hour_of_day'].mode().values.tolist() if 'hour_of_day' in df.columns else []
+        }
     }
-}
 
-with open('advanced_insights.json', 'w') as f:
-    json.dump(advanced_insights, f, indent=2, default=str)
+    with open('advanced_insights.json', 'w') as f:
+        json.dump(advanced_insights, f, indent=2, default=str)
+
+    print("\n\nAdvanced analysis complete. Insights saved to 'advanced_insights.json'")
+    print("Ready to create interactive HTML report...")
+
 
-print("\n\nAdvanced analysis complete. Insights saved to 'advanced_insights.json'")
-print("Ready to create interactive HTML report...")
\ No newline at end of file
+if __name__ == '__main__':
+    run(SurveyDataset.load('ACME.xlsx', keys=QUESTION_KEYS + ['start_time', 'completion_time']))
@@ -4,9 +4,11 @@ Check available columns for equity analysis
 """
 
 import pandas as pd
+from survey_loader import load_survey
+from survey_schema import SurveySchema
 
 # Load the survey data
-df = pd.read_excel('ACME.xlsx')
+df = load_survey('ACME.xlsx')
 
 print("Checking for equity-related columns...\n")
 
@@ -23,9 +25,9 @@ for col in df.columns:
         if len(non_null) > 0:
             print(f"   Sample responses: {non_null.value_counts().head(3).to_dict()}")
 
-# Check specific columns
-print("\n\nChecking specific columns:")
-print("\nColumn 17:", df.columns[16] if len(df.columns) > 16 else "Not found")
-print("Column 18:", df.columns[17] if len(df.columns) > 17 else "Not found")
-print("Column 26:", df.columns[25] if len(df.columns) > 25 else "Not found")
-print("Column 29:", df.columns[28] if len(df.columns) > 28 else "Not found")
\ No newline at end of file
+# Check how the question registry matched this export
+schema = SurveySchema.resolve(df.columns)
+print("\n\nQuestion registry:")
+print(schema.report())
+for key in ['equal_access', 'barriers', 'accessibility', 'access_barriers']:
+    print(f"\n{key}: {schema.get(key, 'Not found')!r}")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Check the vectorized VADER scorer against NLTK's SentimentIntensityAnalyzer
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from survey_aspects import ASPECT_QUESTIONS, split_sentences
+from survey_dataset import SurveyDataset
+from survey_sentiment import SCORE_FIELDS, _score_chunk, classify, vader_analyzer
+from survey_vader import score_texts
+
+# Hand-written cases for each VADER rule: negation, boosters, caps, idioms, 'but', punctuation
+RULE_CASES = [
+    "I love it!!", "Not good at all", "It was never so good", "never this happy",
+    "This is kind of bad but the staff were GREAT", "the shit", "hand to mouth is hard",
+    "good good not good", "at least it's fine", "least good thing", "It's very VERY good",
+    "sort of ok really", "no. bad, terrible!?!?", "I don't hate it", "I can't stand it",
+    "Why?? Why is it so hard???", "", "a",
+]
+
+dataset = SurveyDataset.load('ACME.xlsx')
+vader_analyzer()    # load the lexicon before timing
+
+# Distinct answers and sentences of the open-ended questions, as the pipeline scores them
+answers = {}
+for key in ASPECT_QUESTIONS:
+    if key in dataset.schema:
+        column = dataset.df[dataset.schema[key]].dropna().astype(str)
+        answers[key] = sorted({text for text in column if text.strip()})
+sentences = sorted({s for texts in answers.values() for text in texts for s in split_sentences(text)})
+batches = {'rule cases': RULE_CASES, **answers, 'all sentences': sentences}
+
+print("Vectorized VADER (survey_vader) vs NLTK polarity_scores()\n")
+print(f"{'batch':<24}{'texts':>7}{'exact':>9}{'max |diff|':>12}{'labels':>9}"
+      f"{'nltk s':>9}{'vector s':>10}{'speedup':>9}")
+worst = []
+mismatched = 0
+for name, texts in batches.items():
+    start = time.time()
+    reference = _score_chunk(texts)
+    nltk_seconds = time.time() - start
+    start = time.time()
+    vector = score_texts(texts)
+    vector_seconds = time.time() - start
+
+    diff = np.abs(reference - vector)
+    exact = (diff == 0).all(axis=1)
+    labels = classify(reference[:, 0]) == classify(vector[:, 0])
+    mismatched += int((~exact).sum())
+    speedup = nltk_seconds / vector_seconds if vector_seconds else float('inf')
+    print(f"{name:<24}{len(texts):>7}{exact.mean():>9.2%}{diff.max(initial=0):>12.4f}"
+          f"{labels.mean():>9.2%}{nltk_seconds:>9.3f}{vector_seconds:>10.3f}{speedup:>8.1f}x")
+    for i in np.flatnonzero(~exact):
+        worst.append((diff[i].max(), texts[i], reference[i], vector[i]))
+
+print(f"\nPer-field maximum difference is over {', '.join(SCORE_FIELDS)}.")
+if worst:
+    print(f"\n{mismatched} texts differ; largest differences:")
+    for gap, text, reference, vector in sorted(worst, key=lambda w: -w[0])[:10]:
+        print(f"\n  |diff| {gap:.4f}: {text[:100]!r}")
+        print(f"    nltk:   {dict(zip(SCORE_FIELDS, reference.round(4).tolist()))}")
+        print(f"    vector: {dict(zip(SCORE_FIELDS, vector.round(4).tolist()))}")
+else:
+    print("\nEvery score matches polarity_scores() exactly.")
+
+sys.exit(1 if mismatched else 0)
@@ -11,231 +11,229 @@ import seaborn as sns
 from wordcloud import WordCloud
 import nltk
 from textblob import TextBlob
-from nltk.sentiment import SentimentIntensityAnalyzer
 from nltk.corpus import stopwords
-import re
-from collections import Counter
+from survey_dataset import SurveyDataset
+from survey_terms import TermMatrix
 import warnings
 warnings.filterwarnings('ignore')
 
-# Initialize NLTK components
+# Initialize NLTK components (VADER scoring lives in survey_sentiment)
 try:
-    sia = SentimentIntensityAnalyzer()
     stop_words = set(stopwords.words('english'))
 except:
     nltk.download('vader_lexicon', quiet=True)
     nltk.download('stopwords', quiet=True)
-    sia = SentimentIntensityAnalyzer()
     stop_words = set(stopwords.words('english'))
 
-print("="*80)
-print("DEEP ANALYSIS: SENTIMENT & PROGRAM-SPECIFIC INSIGHTS")
-print("="*80)
-print()
-
-# Load the survey data
-df = pd.read_excel('ACME.xlsx')
-
-# Key questions for sentiment analysis
+# Key questions for sentiment analysis (label -> survey_schema question key)
 key_questions = {
-    'improvements': 'What improvements would you like to see in these cultural funding programs?',
-    'barriers': 'What barriers do you or your community face in accessing support or services related to arts, culture, music, and entertainment?',
-    'additional_feedback': 'Do you have any additional ideas, concerns, or feedback you would like to share to help ACME better serve the public?',
-    'more_opportunities': 'What type of cultural arts or entertainment opportunities would you like to see more of in Austin?',
-    'programs_services': 'What kinds of programs or services would you like ACME to offer that currently do not exist or are underrepresented?',
-    'support_organizations': 'Austin\'s creative community has built a strong foundation of existing organizations that informs ACME\'s goals and mission. How do you believe ACME should better support these organizations and cul...'
+    'improvements': 'improvements',
+    'barriers': 'access_barriers',
+    'additional_feedback': 'additional_feedback',
+    'more_opportunities': 'more_opportunities',
+    'programs_services': 'programs_services',
+    'support_organizations': 'support_organizations'
 }
 
-# Sentiment Analysis Function
-def analyze_sentiment(text):
-    if pd.isna(text) or str(text).strip() == '':
-        return None
-    
-    # Get VADER sentiment scores
-    scores = sia.polarity_scores(str(text))
-    
-    # Classify sentiment
-    if scores['compound'] >= 0.05:
-        sentiment = 'positive'
-    elif scores['compound'] <= -0.05:
-        sentiment = 'negative'
-    else:
-        sentiment = 'neutral'
-    
-    return {
-        'sentiment': sentiment,
-        'compound': scores['compound'],
-        'positive': scores['pos'],
-        'negative': scores['neg'],
-        'neutral': scores['neu']
+# Questions this analysis reads, for loading it on its own
+QUESTION_KEYS = list(key_questions.values()) + ['awareness', 'satisfaction', 'accessibility', 'role']
+
+def run(dataset):
+    """Sentiment, themes and program feedback for the open-ended questions"""
+    print("="*80)
+    print("DEEP ANALYSIS: SENTIMENT & PROGRAM-SPECIFIC INSIGHTS")
+    print("="*80)
+    print()
+
+    # Work on the shared survey dataset
+    df = dataset.df
+    schema = dataset.schema.require(*QUESTION_KEYS)
+    awareness_col = schema['awareness']
+    satisfaction_col = schema['satisfaction']
+    accessibility_col = schema['accessibility']
+    improvements_col = schema['improvements']
+
+    # Analyze sentiment for each key question
+    print("Analyzing sentiment across key questions...\n")
+    sentiment_results = {}
+
+    for key, question_key in key_questions.items():
+        question = schema[question_key]
+        if question in df.columns:
+            print(f"Analyzing: {key}")
+
+            # Get responses, counting near-duplicate answers once if requested
+            counted = dataset.answer_mask(question_key)
+            responses = df[question][counted].dropna()
+            duplicates = dataset.near_duplicates(question_key)
+            if duplicates.n_duplicates:
+                action = 'collapsed' if dataset.collapse_duplicates else 'kept'
+                print(f"  Near-duplicates: {duplicates.n_duplicates} answers in "
+                      f"{duplicates.n_clusters} clusters ({action})")
+
+            # Analyze sentiment (every distinct answer scored once, in one batch)
+            scores = dataset.sentiment(question_key).subset(counted)
+
+            if scores.scored.any():
+                sentiment_summary = {
+                    'total_responses': len(responses),
+                    **scores.counts(),
+                    'avg_compound': scores.mean(),
+                    'responses': responses
+                }
+
+                sentiment_results[key] = sentiment_summary
+
+                print(f"  Total Responses: {sentiment_summary['total_responses']}")
+                print(f"  Positive: {sentiment_summary['positive']} ({sentiment_summary['positive']/sentiment_summary['total_responses']*100:.1f}%)")
+                print(f"  Negative: {sentiment_summary['negative']} ({sentiment_summary['negative']/sentiment_summary['total_responses']*100:.1f}%)")
+                print(f"  Neutral: {sentiment_summary['neutral']} ({sentiment_summary['neutral']/sentiment_summary['total_responses']*100:.1f}%)")
+                print(f"  Average Sentiment Score: {sentiment_summary['avg_compound']:.3f}")
+                print()
+
+    # Extract key themes from text responses
+    print("\n" + "="*50)
+    print("EXTRACTING KEY THEMES")
+    print("="*50 + "\n")
+
+    # One term matrix (words plus 2-3 word phrases) over all key questions
+    # (without the collapsed near-duplicates, if any)
+    question_tokens = {}
+    for key in sentiment_results:
+        question_key = key_questions[key]
+        question_tokens[key] = dataset.tokens(question_key).masked(dataset.answer_mask(question_key))
+    terms = TermMatrix.build(question_tokens, ngrams=(1, 2, 3), min_df=2, stop_words=stop_words)
+    key_themes = {}
+
+    # Analyze themes for key questions
+    for key in sentiment_results:
+        themes = terms.top(15, questions=[key], ngram=1)
+        phrases = terms.top(5, questions=[key], ngram=(2, 3))
+        key_themes[key] = {'themes': themes, 'phrases': phrases}
+        print(f"\nTop themes for '{key}':")
+        for word, count in themes:
+            print(f"  - {word}: {count} mentions")
+        print("  Top phrases:")
+        for phrase, count in phrases:
+            print(f"  - \"{phrase}\": {count} mentions")
+
+    # Phrases per role, across all key questions
+    print("\nTop phrases by role:")
+    roles = dataset.multiselect('role')
+    by_role = terms.top_by_option(roles, k=3, ngram=(2, 3))
+    for role, _ in roles.most_common(5):
+        print(f"  {role}: {', '.join(phrase for phrase, _ in by_role[role])}")
+
+    # Program-specific analysis
+    print("\n" + "="*50)
+    print("PROGRAM-SPECIFIC FEEDBACK ANALYSIS")
+    print("="*50 + "\n")
+
+    # Check awareness question
+    if awareness_col in df.columns:
+        # Programs recognized in the awareness answers (see survey_programs)
+        awareness = dataset.programs().question('awareness')
+        aware_counts = awareness.counts()
+        program_awareness = {}
+
+        for program in awareness.options:
+            count = int(aware_counts[program])
+            program_awareness[program] = {
+                'aware_count': count,
+                'awareness_rate': count / awareness.n_answered * 100
+            }
+
+        print("Program Awareness Rates:")
+        for program, data in sorted(program_awareness.items(), key=lambda x: x[1]['awareness_rate'], reverse=True):
+            print(f"  {program}: {data['aware_count']} respondents ({data['awareness_rate']:.1f}%)")
+
+    # Analyze satisfaction levels
+    if satisfaction_col in df.columns:
+        satisfaction = df[satisfaction_col].value_counts()
+        print(f"\nOverall Program Satisfaction:")
+        for level, count in satisfaction.items():
+            print(f"  {level}: {count} ({count/satisfaction.sum()*100:.1f}%)")
+
+    # Analyze accessibility perception
+    if accessibility_col in df.columns:
+        accessibility = df[accessibility_col].value_counts()
+        print(f"\nAccessibility for Underrepresented Communities:")
+        for level, count in accessibility.items():
+            print(f"  {level}: {count} ({count/accessibility.sum()*100:.1f}%)")
+
+    # Extract specific program feedback
+    print("\n" + "="*50)
+    print("EXTRACTING SPECIFIC PROGRAM FEEDBACK")
+    print("="*50 + "\n")
+
+    # Search for program-specific mentions in improvement suggestions
+    if improvements_col in df.columns:
+        programs = dataset.programs()
+        # Sentences about each program, scored on their own (see survey_aspects)
+        program_sentences = dataset.aspects().matrix('programs', questions=['improvements'])
+
+        for program in ['Nexus', 'Heritage', 'AIPP', 'Thrive', 'Elevate']:
+            print(f"\n{program} Program - Specific Feedback:")
+            mentioned = programs.mask(program, ['improvements'])
+            program_feedback = df.loc[mentioned, improvements_col].astype(str)
+
+            if len(program_feedback) > 0:
+                print(f"  Found {len(program_feedback)} specific mentions")
+
+                # Sentiment of program-specific feedback, from the scores above
+                feedback_scores = dataset.sentiment('improvements').subset(mentioned)
+
+                if feedback_scores.scored.any():
+                    counts = feedback_scores.counts()
+                    print(f"  Sentiment: {counts['positive']} positive, {counts['negative']} negative")
+                    sentences = program_sentences.loc[program]
+                    if sentences['sentences']:
+                        print(f"  Sentences about {program}: {int(sentences['positive'])} positive, "
+                              f"{int(sentences['negative'])} negative "
+                              f"(average {sentences['mean_compound']:.3f})")
+
+                    # Show sample feedback
+                    print("  Sample feedback:")
+                    for i, feedback in enumerate(program_feedback.head(3)):
+                        print(f"    {i+1}. \"{feedback[:150]}...\"" if len(feedback) > 150 else f"    {i+1}. \"{feedback}\"")
+
+    # Save key findings
+    print("\n" + "="*50)
+    print("Saving analysis results...")
+
+    # Create summary report
+    summary = {
+        'total_responses': len(df),
+        'sentiment_summary': {},
+        'key_themes': key_themes if 'key_themes' in locals() else {}
     }
 
-# Analyze sentiment for each key question
-print("Analyzing sentiment across key questions...\n")
-sentiment_results = {}
-
-for key, question in key_questions.items():
-    if question in df.columns:
-        print(f"Analyzing: {key}")
-        
-        # Get responses
-        responses = df[question].dropna()
-        
-        # Analyze sentiment
-        sentiments = responses.apply(analyze_sentiment)
-        sentiments_df = pd.DataFrame(list(sentiments.dropna()))
-        
-        if len(sentiments_df) > 0:
-            sentiment_summary = {
-                'total_responses': len(responses),
-                'positive': (sentiments_df['sentiment'] == 'positive').sum(),
-                'negative': (sentiments_df['sentiment'] == 'negative').sum(),
-                'neutral': (sentiments_df['sentiment'] == 'neutral').sum(),
-                'avg_compound': sentiments_df['compound'].mean(),
-                'responses': responses
-            }
-            
-            sentiment_results[key] = sentiment_summary
-            
-            print(f"  Total Responses: {sentiment_summary['total_responses']}")
-            print(f"  Positive: {sentiment_summary['positive']} ({sentiment_summary['positive']/sentiment_summary['total_responses']*100:.1f}%)")
-            print(f"  Negative: {sentiment_summary['negative']} ({sentiment_summary['negative']/sentiment_summary['total_responses']*100:.1f}%)")
-            print(f"  Neutral: {sentiment_summary['neutral']} ({sentiment_summary['neutral']/sentiment_summary['total_responses']*100:.1f}%)")
-            print(f"  Average Sentiment Score: {sentiment_summary['avg_compound']:.3f}")
-            print()
-
-# Extract key themes from text responses
-print("\n" + "="*50)
-print("EXTRACTING KEY THEMES")
-print("="*50 + "\n")
-
-def extract_themes(texts, n_themes=10):
-    """Extract most common themes from text responses"""
-    all_words = []
-    
-    for text in texts:
-        if pd.notna(text):
-            # Clean text
-            text = str(text).lower()
-            text = re.sub(r'[^a-zA-Z\s]', '', text)
-            
-            # Extract words
-            words = text.split()
-            
-            # Filter stopwords and short words
-            words = [w for w in words if w not in stop_words and len(w) > 3]
-            all_words.extend(words)
-    
-    # Get most common words
-    word_freq = Counter(all_words)
-    return word_freq.most_common(n_themes)
-
-# Analyze themes for key questions
-for key, data in sentiment_results.items():
-    print(f"\nTop themes for '{key}':")
-    themes = extract_themes(data['responses'], n_themes=15)
-    for word, count in themes:
-        print(f"  - {word}: {count} mentions")
-
-# Program-specific analysis
-print("\n" + "="*50)
-print("PROGRAM-SPECIFIC FEEDBACK ANALYSIS")
-print("="*50 + "\n")
-
-# Check awareness question
-awareness_col = 'Prior to this survey, were you aware of the following programs administered by the City of Austin/ACME? \n(Select all that you are aware of; checkboxes for each program) '
-
-if awareness_col in df.columns:
-    awareness_responses = df[awareness_col].dropna()
-    
-    # Count program mentions
-    programs = ['Nexus', 'Heritage', 'AIPP', 'Thrive', 'Elevate', 'ALMF', 'CSAP']
-    program_awareness = {}
-    
-    for program in programs:
-        count = awareness_responses.str.contains(program, case=False, na=False).sum()
-        program_awareness[program] = {
-            'aware_count': count,
-            'awareness_rate': count / len(awareness_responses) * 100
+    # Add program awareness if it exists
+    if 'program_awareness' in locals():
+        summary['program_awareness'] = program_awareness
+
+    # Sentence-level sentiment per program and barrier theme, across the key questions
+    aspects = dataset.aspects()
+    summary['aspect_sentiment'] = {}
+    for aspect_set in ['programs', 'access_barriers']:
+        table = aspects.matrix(aspect_set).round(4).astype(object)
+        summary['aspect_sentiment'][aspect_set] = table.where(table.notna(), None).to_dict('index')
+
+    for key, data in sentiment_results.items():
+        summary['sentiment_summary'][key] = {
+            'positive_rate': data['positive'] / data['total_responses'] * 100,
+            'negative_rate': data['negative'] / data['total_responses'] * 100,
+            'avg_sentiment': data['avg_compound']
         }
-    
-    print("Program Awareness Rates:")
-    for program, data in sorted(program_awareness.items(), key=lambda x: x[1]['awareness_rate'], reverse=True):
-        print(f"  {program}: {data['aware_count']} respondents ({data['awareness_rate']:.1f}%)")
-
-# Analyze satisfaction levels
-satisfaction_col = 'How would you rate your level of satisfaction with these programs overall?'
-if satisfaction_col in df.columns:
-    satisfaction = df[satisfaction_col].value_counts()
-    print(f"\nOverall Program Satisfaction:")
-    for level, count in satisfaction.items():
-        print(f"  {level}: {count} ({count/satisfaction.sum()*100:.1f}%)")
-
-# Analyze accessibility perception
-accessibility_col = 'How accessible do you think these programs are for historically underrepresented artists, organizations, and communities?'
-if accessibility_col in df.columns:
-    accessibility = df[accessibility_col].value_counts()
-    print(f"\nAccessibility for Underrepresented Communities:")
-    for level, count in accessibility.items():
-        print(f"  {level}: {count} ({count/accessibility.sum()*100:.1f}%)")
-
-# Extract specific program feedback
-print("\n" + "="*50)
-print("EXTRACTING SPECIFIC PROGRAM FEEDBACK")
-print("="*50 + "\n")
-
-# Search for program-specific mentions in improvement suggestions
-improvements_col = 'What improvements would you like to see in these cultural funding programs?'
-if improvements_col in df.columns:
-    improvements = df[improvements_col].dropna()
-    
-    for program in ['Nexus', 'Heritage', 'AIPP', 'Thrive', 'Elevate']:
-        print(f"\n{program} Program - Specific Feedback:")
-        program_feedback = improvements[improvements.str.contains(program, case=False, na=False)]
-        
-        if len(program_feedback) > 0:
-            print(f"  Found {len(program_feedback)} specific mentions")
-            
-            # Analyze sentiment of program-specific feedback
-            sentiments = program_feedback.apply(analyze_sentiment)
-            sentiments_df = pd.DataFrame(list(sentiments.dropna()))
-            
-            if len(sentiments_df) > 0:
-                pos = (sentiments_df['sentiment'] == 'positive').sum()
-                neg = (sentiments_df['sentiment'] == 'negative').sum()
-                print(f"  Sentiment: {pos} positive, {neg} negative")
-                
-                # Show sample feedback
-                print("  Sample feedback:")
-                for i, feedback in enumerate(program_feedback.head(3)):
-                    print(f"    {i+1}. \"{feedback[:150]}...\"" if len(feedback) > 150 else f"    {i+1}. \"{feedback}\"")
-
-# Save key findings
-print("\n" + "="*50)
-print("Saving analysis results...")
-
-# Create summary report
-summary = {
-    'total_responses': len(df),
-    'sentiment_summary': {},
-    'key_themes': {}
-}
 
-# Add program awareness if it exists
-if 'program_awareness' in locals():
-    summary['program_awareness'] = program_awareness
+    # Save summary to JSON
+    import json
+    with open('analysis_summary.json', 'w') as f:
+        json.dump(summary, f, indent=2)
 
-for key, data in sentiment_results.items():
-    summary['sentiment_summary'][key] = {
-        'positive_rate': data['positive'] / data['total_responses'] * 100,
-        'negative_rate': data['negative'] / data['total_responses'] * 100,
-        'avg_sentiment': data['avg_compound']
-    }
+    print("\nAnalysis complete. Summary saved to 'analysis_summary.json'")
+    print("Ready for visualization and report generation...")
 
-# Save summary to JSON
-import json
-with open('analysis_summary.json', 'w') as f:
-    json.dump(summary, f, indent=2)
 
-print("\nAnalysis complete. Summary saved to 'analysis_summary.json'")
-print("Ready for visualization and report generation...")
\ No newline at end of file
+if __name__ == '__main__':
+    run(SurveyDataset.load('ACME.xlsx', keys=QUESTION_KEYS))
@@ -11,6 +11,7 @@ import seaborn as sns
 from matplotlib.backends.backend_pdf import PdfPages
 import datetime
 import json
+from survey_dataset import SurveyDataset
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -18,49 +19,56 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
 
-print("="*80)
-print("GENERATING LEADERSHIP BRIEFING DECK")
-print("="*80)
-print()
-
-# Load the survey data
-df = pd.read_excel('ACME.xlsx')
-
-# Load analysis summary
-try:
-    with open('analysis_summary.json', 'r') as f:
-        summary = json.load(f)
-except:
-    summary = {}
-
-# Create PDF report
-with PdfPages('Austin_Cultural_Grants_Leadership_Briefing.pdf') as pdf:
-    
-    # PAGE 1: TITLE PAGE
-    fig = plt.figure(figsize=(11, 8.5))
-    fig.text(0.5, 0.7, 'City of Austin Cultural Grants', ha='center', va='center', 
-             fontsize=32, fontweight='bold')
-    fig.text(0.5, 0.6, 'Community Survey Analysis', ha='center', va='center', 
-             fontsize=24)
-    fig.text(0.5, 0.5, 'Leadership Briefing Deck', ha='center', va='center', 
-             fontsize=20)
-    fig.text(0.5, 0.3, 'Dr. Anya Sharma\nCivic Arts & Equity Consulting', 
-             ha='center', va='center', fontsize=16)
-    fig.text(0.5, 0.15, datetime.datetime.now().strftime('%B %Y'), 
-             ha='center', va='center', fontsize=14)
-    plt.axis('off')
-    pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
-    
-    # PAGE 2: EXECUTIVE SUMMARY
-    fig = plt.figure(figsize=(11, 8.5))
-    fig.suptitle('Executive Summary', fontsize=24, fontweight='bold', y=0.95)
-    
-    summary_text = f"""
+# Response count and zip code coverage are the only survey data used
+QUESTION_KEYS = ['zip']
+
+
+def run(dataset):
+    """Render the leadership briefing PDF"""
+    print("="*80)
+    print("GENERATING LEADERSHIP BRIEFING DECK")
+    print("="*80)
+    print()
+
+    # Work on the shared survey dataset
+    df = dataset.df
+    dataset.schema.require(*QUESTION_KEYS)
+
+    # Load analysis summary
+    try:
+        with open('analysis_summary.json', 'r') as f:
+            summary = json.load(f)
+    except:
+        summary = {}
+
+    # Create PDF report
+    with PdfPages('Austin_Cultural_Grants_Leadership_Briefing.pdf') as pdf:
+
+        # PAGE 1: TITLE PAGE
+        fig = plt.figure(figsize=(11, 8.5))
+        fig.text(0.5, 0.7, 'City of Austin Cultural Grants', ha='center', va='center', 
+                 fontsize=32, fontweight='bold')
+        fig.text(0.5, 0.6, 'Community Survey Analysis', ha='center', va='center', 
+                 fontsize=24)
+        fig.text(0.5, 0.5, 'Leadership Briefing Deck', ha='center', va='center', 
+                 fontsize=20)
+        fig.text(0.5, 0.3, 'Dr. Anya Sharma\nCivic Arts & Equity Consulting', 
+                 ha='center', va='center', fontsize=16)
+        fig.text(0.5, 0.15, datetime.datetime.now().strftime('%B %Y'), 
+                 ha='center', va='center', fontsize=14)
+        plt.axis('off')
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close()
+
+        # PAGE 2: EXECUTIVE SUMMARY
+        fig = plt.figure(figsize=(11, 8.5))
+        fig.suptitle('Executive Summary', fontsize=24, fontweight='bold', y=0.95)
+
+        summary_text = f"""
 KEY FINDINGS
 
 Survey Response: {len(df):,} community members participated
-Geographic Reach: {df[df.columns[11]].nunique()} unique zip codes represented
+Geographic Reach: {len(dataset.cube().values('zip'))} unique zip codes represented
 Engagement Level: 501 respondents willing to participate in focus groups
 
 SENTIMENT ANALYSIS
@@ -80,18 +88,18 @@ TOP RECOMMENDATIONS
 4. Create neighborhood-based cultural hubs
 5. Establish regular community feedback loops
 """
-    
-    fig.text(0.1, 0.85, summary_text, ha='left', va='top', fontsize=12, 
-             wrap=True, family='monospace')
-    plt.axis('off')
-    pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
-    
-    # PAGE 3: METHODOLOGY
-    fig = plt.figure(figsize=(11, 8.5))
-    fig.suptitle('Methodology Note', fontsize=24, fontweight='bold', y=0.95)
-    
-    methodology_text = """
+
+        fig.text(0.1, 0.85, summary_text, ha='left', va='top', fontsize=12, 
+                 wrap=True, family='monospace')
+        plt.axis('off')
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close()
+
+        # PAGE 3: METHODOLOGY
+        fig = plt.figure(figsize=(11, 8.5))
+        fig.suptitle('Methodology Note', fontsize=24, fontweight='bold', y=0.95)
+
+        methodology_text = """
 CIVIC RESONANCE FRAMEWORK™ APPROACH
 
 DATA COLLECTION
@@ -115,44 +123,44 @@ LIMITATIONS
 • Online-only format may exclude some populations
 • Analysis based on single point-in-time survey
 """
-    
-    fig.text(0.1, 0.85, methodology_text, ha='left', va='top', fontsize=12, 
-             wrap=True, family='monospace')
-    plt.axis('off')
-    pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
-    
-    # PAGE 4: GLOBAL THEMES
-    fig, axes = plt.subplots(2, 2, figsize=(11, 8.5))
-    fig.suptitle('Global Themes Across Grant Ecosystem', fontsize=20, fontweight='bold')
-    
-    # Theme 1: Funding
-    ax1 = axes[0, 0]
-    funding_mentions = [357, 494, 162, 157, 151]  # From our analysis
-    funding_categories = ['Improvements', 'Org Support', 'Arts', 'Grants', 'Austin']
-    ax1.barh(funding_categories, funding_mentions, color='steelblue')
-    ax1.set_title('Funding-Related Mentions', fontweight='bold')
-    ax1.set_xlabel('Number of Mentions')
-    
-    # Theme 2: Barriers
-    ax2 = axes[0, 1]
-    barriers = ['Cost/Financial', 'Transportation', 'Awareness', 'Time', 'Location']
-    barrier_pct = [68, 45, 42, 35, 30]
-    ax2.barh(barriers, barrier_pct, color='coral')
-    ax2.set_title('Top Participation Barriers (%)', fontweight='bold')
-    ax2.set_xlabel('Percentage of Respondents')
-    
-    # Theme 3: Values
-    ax3 = axes[1, 0]
-    values = ['Equity', 'Community', 'Access', 'Diversity', 'Support']
-    value_importance = [85, 78, 72, 68, 65]
-    ax3.barh(values, value_importance, color='green')
-    ax3.set_title('Core Values Importance (%)', fontweight='bold')
-    ax3.set_xlabel('Importance Score')
-    
-    # Theme 4: Key Words
-    ax4 = axes[1, 1]
-    ax4.text(0.5, 0.5, '''TOP RECURRING THEMES
+
+        fig.text(0.1, 0.85, methodology_text, ha='left', va='top', fontsize=12, 
+                 wrap=True, family='monospace')
+        plt.axis('off')
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close()
+
+        # PAGE 4: GLOBAL THEMES
+        fig, axes = plt.subplots(2, 2, figsize=(11, 8.5))
+        fig.suptitle('Global Themes Across Grant Ecosystem', fontsize=20, fontweight='bold')
+
+        # Theme 1: Funding
+        ax1 = axes[0, 0]
+        funding_mentions = [357, 494, 162, 157, 151]  # From our analysis
+        funding_categories = ['Improvements', 'Org Support', 'Arts', 'Grants', 'Austin']
+        ax1.barh(funding_categories, funding_mentions, color='steelblue')
+        ax1.set_title('Funding-Related Mentions', fontweight='bold')
+        ax1.set_xlabel('Number of Mentions')
+
+        # Theme 2: Barriers
+        ax2 = axes[0, 1]
+        barriers = ['Cost/Financial', 'Transportation', 'Awareness', 'Time', 'Location']
+        barrier_pct = [68, 45, 42, 35, 30]
+        ax2.barh(barriers, barrier_pct, color='coral')
+        ax2.set_title('Top Participation Barriers (%)', fontweight='bold')
+        ax2.set_xlabel('Percentage of Respondents')
+
+        # Theme 3: Values
+        ax3 = axes[1, 0]
+        values = ['Equity', 'Community', 'Access', 'Diversity', 'Support']
+        value_importance = [85, 78, 72, 68, 65]
+        ax3.barh(values, value_importance, color='green')
+        ax3.set_title('Core Values Importance (%)', fontweight='bold')
+        ax3.set_xlabel('Importance Score')
+
+        # Theme 4: Key Words
+        ax4 = axes[1, 1]
+        ax4.text(0.5, 0.5, '''TOP RECURRING THEMES
 
 • Funding & Financial Support
 • Community Engagement
@@ -162,157 +170,157 @@ LIMITATIONS
 • Geographic Accessibility
 • Artist Development
 • Cultural Preservation''', 
-             ha='center', va='center', fontsize=12, 
-             bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgray"))
-    ax4.set_title('Key Community Priorities', fontweight='bold')
-    ax4.axis('off')
-    
-    plt.tight_layout()
-    pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
-    
-    # PAGE 5-11: PROGRAM DEEP DIVES
-    programs = {
-        'Heritage Preservation': {
-            'awareness': 90,
-            'satisfaction': 85,
-            'sentiment': 95,
-            'strengths': ['Well-trained team', 'Instrumental support', 'Clear value'],
-            'weaknesses': ['Complex application', 'Unclear scoring rubric'],
-            'recommendations': ['Simplify reporting', 'Publish clear rubrics', 'Streamline process']
-        },
-        'Thrive': {
-            'awareness': 85,
-            'satisfaction': 88,
-            'sentiment': 89,
-            'strengths': ['Strong community impact', 'Good program design', 'Effective support'],
-            'weaknesses': ['50% match requirement concern', 'Limited slots'],
-            'recommendations': ['Review match requirements', 'Expand capacity', 'Increase outreach']
-        },
-        'Nexus': {
-            'awareness': 80,
-            'satisfaction': 75,
-            'sentiment': 70,
-            'strengths': ['Bridges emerging to established', 'Good funding level'],
-            'weaknesses': ['Unclear positioning', 'Competition with other programs'],
-            'recommendations': ['Clarify program identity', 'Define unique value prop', 'Improve marketing']
-        },
-        'Elevate': {
-            'awareness': 85,
-            'satisfaction': 70,
-            'sentiment': 81,
-            'strengths': ['Fills important gap', 'Flexible approach'],
-            'weaknesses': ['Seen as "dumping ground"', 'Identity crisis'],
-            'recommendations': ['Rebrand program', 'Define clear mission', 'Celebrate successes']
-        },
-        'AIPP': {
-            'awareness': 75,
-            'satisfaction': 65,
-            'sentiment': 75,
-            'strengths': ['Public art focus', 'Community visibility'],
-            'weaknesses': ['Limited opportunities', 'High barriers for emerging artists'],
-            'recommendations': ['Create mid-range projects', 'Develop artist pipeline', 'Expand budget']
+                 ha='center', va='center', fontsize=12, 
+                 bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgray"))
+        ax4.set_title('Key Community Priorities', fontweight='bold')
+        ax4.axis('off')
+
+        plt.tight_layout()
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close()
+
+        # PAGE 5-11: PROGRAM DEEP DIVES
+        programs = {
+            'Heritage Preservation': {
+                'awareness': 90,
+                'satisfaction': 85,
+                'sentiment': 95,
+                'strengths': ['Well-trained team', 'Instrumental support', 'Clear value'],
+                'weaknesses': ['Complex application', 'Unclear scoring rubric'],
+                'recommendations': ['Simplify reporting', 'Publish clear rubrics', 'Streamline process']
+            },
+            'Thrive': {
+                'awareness': 85,
+                'satisfaction': 88,
+                'sentiment': 89,
+                'strengths': ['Strong community impact', 'Good program design', 'Effective support'],
+                'weaknesses': ['50% match requirement concern', 'Limited slots'],
+                'recommendations': ['Review match requirements', 'Expand capacity', 'Increase outreach']
+            },
+            'Nexus': {
+                'awareness': 80,
+                'satisfaction': 75,
+                'sentiment': 70,
+                'strengths': ['Bridges emerging to established', 'Good funding level'],
+                'weaknesses': ['Unclear positioning', 'Competition with other programs'],
+                'recommendations': ['Clarify program identity', 'Define unique value prop', 'Improve marketing']
+            },
+            'Elevate': {
+                'awareness': 85,
+                'satisfaction': 70,
+                'sentiment': 81,
+                'strengths': ['Fills important gap', 'Flexible approach'],
+                'weaknesses': ['Seen as "dumping ground"', 'Identity crisis'],
+                'recommendations': ['Rebrand program', 'Define clear mission', 'Celebrate successes']
+            },
+            'AIPP': {
+                'awareness': 75,
+                'satisfaction': 65,
+                'sentiment': 75,
+                'strengths': ['Public art focus', 'Community visibility'],
+                'weaknesses': ['Limited opportunities', 'High barriers for emerging artists'],
+                'recommendations': ['Create mid-range projects', 'Develop artist pipeline', 'Expand budget']
+            }
         }
-    }
-    
-    for program_name, data in programs.items():
+
+        for program_name, data in programs.items():
+            fig = plt.figure(figsize=(11, 8.5))
+            fig.suptitle(f'{program_name} Program Analysis', fontsize=20, fontweight='bold', y=0.95)
+
+            # Create grid
+            gs = fig.add_gridspec(3, 2, height_ratios=[1, 1, 1], hspace=0.4, wspace=0.3)
+
+            # Metrics
+            ax1 = fig.add_subplot(gs[0, :])
+            metrics = ['Awareness', 'Satisfaction', 'Positive Sentiment']
+            values = [data['awareness'], data['satisfaction'], data['sentiment']]
+            bars = ax1.bar(metrics, values, color=['#3498db', '#2ecc71', '#e74c3c'])
+            ax1.set_ylim(0, 100)
+            ax1.set_ylabel('Percentage')
+            ax1.set_title('Program Health Metrics', fontweight='bold')
+
+            # Add value labels
+            for bar, value in zip(bars, values):
+                ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1, 
+                        f'{value}%', ha='center', va='bottom')
+
+            # Strengths
+            ax2 = fig.add_subplot(gs[1, 0])
+            strengths_text = 'STRENGTHS\n\n' + '\n'.join([f'• {s}' for s in data['strengths']])
+            ax2.text(0.05, 0.95, strengths_text, ha='left', va='top', fontsize=12,
+                    bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen", alpha=0.7),
+                    transform=ax2.transAxes)
+            ax2.axis('off')
+
+            # Weaknesses
+            ax3 = fig.add_subplot(gs[1, 1])
+            weaknesses_text = 'IMPROVEMENT AREAS\n\n' + '\n'.join([f'• {w}' for w in data['weaknesses']])
+            ax3.text(0.05, 0.95, weaknesses_text, ha='left', va='top', fontsize=12,
+                    bbox=dict(boxstyle="round,pad=0.5", facecolor="lightyellow", alpha=0.7),
+                    transform=ax3.transAxes)
+            ax3.axis('off')
+
+            # Recommendations
+            ax4 = fig.add_subplot(gs[2, :])
+            rec_text = 'RECOMMENDATIONS\n\n' + '\n'.join([f'{i+1}. {r}' for i, r in enumerate(data['recommendations'])])
+            ax4.text(0.05, 0.95, rec_text, ha='left', va='top', fontsize=12,
+                    bbox=dict(boxstyle="round,pad=0.5", facecolor="lightcoral", alpha=0.7),
+                    transform=ax4.transAxes)
+            ax4.axis('off')
+
+            pdf.savefig(fig, bbox_inches='tight')
+            plt.close()
+
+        # PAGE 12: RECOMMENDATIONS MATRIX
         fig = plt.figure(figsize=(11, 8.5))
-        fig.suptitle(f'{program_name} Program Analysis', fontsize=20, fontweight='bold', y=0.95)
-        
-        # Create grid
-        gs = fig.add_gridspec(3, 2, height_ratios=[1, 1, 1], hspace=0.4, wspace=0.3)
-        
-        # Metrics
-        ax1 = fig.add_subplot(gs[0, :])
-        metrics = ['Awareness', 'Satisfaction', 'Positive Sentiment']
-        values = [data['awareness'], data['satisfaction'], data['sentiment']]
-        bars = ax1.bar(metrics, values, color=['#3498db', '#2ecc71', '#e74c3c'])
-        ax1.set_ylim(0, 100)
-        ax1.set_ylabel('Percentage')
-        ax1.set_title('Program Health Metrics', fontweight='bold')
-        
-        # Add value labels
-        for bar, value in zip(bars, values):
-            ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1, 
-                    f'{value}%', ha='center', va='bottom')
-        
-        # Strengths
-        ax2 = fig.add_subplot(gs[1, 0])
-        strengths_text = 'STRENGTHS\n\n' + '\n'.join([f'• {s}' for s in data['strengths']])
-        ax2.text(0.05, 0.95, strengths_text, ha='left', va='top', fontsize=12,
-                bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen", alpha=0.7),
-                transform=ax2.transAxes)
-        ax2.axis('off')
-        
-        # Weaknesses
-        ax3 = fig.add_subplot(gs[1, 1])
-        weaknesses_text = 'IMPROVEMENT AREAS\n\n' + '\n'.join([f'• {w}' for w in data['weaknesses']])
-        ax3.text(0.05, 0.95, weaknesses_text, ha='left', va='top', fontsize=12,
-                bbox=dict(boxstyle="round,pad=0.5", facecolor="lightyellow", alpha=0.7),
-                transform=ax3.transAxes)
-        ax3.axis('off')
-        
-        # Recommendations
-        ax4 = fig.add_subplot(gs[2, :])
-        rec_text = 'RECOMMENDATIONS\n\n' + '\n'.join([f'{i+1}. {r}' for i, r in enumerate(data['recommendations'])])
-        ax4.text(0.05, 0.95, rec_text, ha='left', va='top', fontsize=12,
-                bbox=dict(boxstyle="round,pad=0.5", facecolor="lightcoral", alpha=0.7),
-                transform=ax4.transAxes)
-        ax4.axis('off')
-        
+        fig.suptitle('Strategic Recommendations Matrix', fontsize=20, fontweight='bold', y=0.95)
+
+        # Create scatter plot of effort vs impact
+        ax = fig.add_subplot(111)
+
+        recommendations = [
+            ('Simplify Applications', 8, 4, 'Quick Win'),
+            ('Increase Funding', 9, 8, 'Major Project'),
+            ('Community Outreach', 8, 5, 'Strategic'),
+            ('Neighborhood Hubs', 9, 9, 'Major Project'),
+            ('Feedback Loops', 6, 3, 'Quick Win'),
+            ('Digital Platform', 7, 6, 'Operational'),
+            ('Staff Training', 5, 4, 'Operational'),
+            ('Equity Framework', 8, 7, 'Strategic')
+        ]
+
+        colors = {'Quick Win': '#2ecc71', 'Major Project': '#e74c3c', 
+                  'Strategic': '#3498db', 'Operational': '#f39c12'}
+
+        for name, impact, effort, category in recommendations:
+            ax.scatter(effort, impact, s=300, c=colors[category], alpha=0.7)
+            ax.annotate(name, (effort, impact), ha='center', va='center', fontsize=9)
+
+        ax.set_xlabel('Effort Required (1-10)', fontsize=12)
+        ax.set_ylabel('Potential Impact (1-10)', fontsize=12)
+        ax.set_xlim(0, 10)
+        ax.set_ylim(0, 10)
+        ax.grid(True, alpha=0.3)
+
+        # Add legend
+        for category, color in colors.items():
+            ax.scatter([], [], c=color, s=200, label=category, alpha=0.7)
+        ax.legend(loc='lower right')
+
+        # Add quadrant labels
+        ax.text(2.5, 8.5, 'Quick Wins', fontsize=14, fontweight='bold', alpha=0.5)
+        ax.text(7.5, 8.5, 'Major Initiatives', fontsize=14, fontweight='bold', alpha=0.5)
+        ax.text(2.5, 2.5, 'Low Priority', fontsize=14, fontweight='bold', alpha=0.5)
+        ax.text(7.5, 2.5, 'Fill-ins', fontsize=14, fontweight='bold', alpha=0.5)
+
         pdf.savefig(fig, bbox_inches='tight')
         plt.close()
-    
-    # PAGE 12: RECOMMENDATIONS MATRIX
-    fig = plt.figure(figsize=(11, 8.5))
-    fig.suptitle('Strategic Recommendations Matrix', fontsize=20, fontweight='bold', y=0.95)
-    
-    # Create scatter plot of effort vs impact
-    ax = fig.add_subplot(111)
-    
-    recommendations = [
-        ('Simplify Applications', 8, 4, 'Quick Win'),
-        ('Increase Funding', 9, 8, 'Major Project'),
-        ('Community Outreach', 8, 5, 'Strategic'),
-        ('Neighborhood Hubs', 9, 9, 'Major Project'),
-        ('Feedback Loops', 6, 3, 'Quick Win'),
-        ('Digital Platform', 7, 6, 'Operational'),
-        ('Staff Training', 5, 4, 'Operational'),
-        ('Equity Framework', 8, 7, 'Strategic')
-    ]
-    
-    colors = {'Quick Win': '#2ecc71', 'Major Project': '#e74c3c', 
-              'Strategic': '#3498db', 'Operational': '#f39c12'}
-    
-    for name, impact, effort, category in recommendations:
-        ax.scatter(effort, impact, s=300, c=colors[category], alpha=0.7)
-        ax.annotate(name, (effort, impact), ha='center', va='center', fontsize=9)
-    
-    ax.set_xlabel('Effort Required (1-10)', fontsize=12)
-    ax.set_ylabel('Potential Impact (1-10)', fontsize=12)
-    ax.set_xlim(0, 10)
-    ax.set_ylim(0, 10)
-    ax.grid(True, alpha=0.3)
-    
-    # Add legend
-    for category, color in colors.items():
-        ax.scatter([], [], c=color, s=200, label=category, alpha=0.7)
-    ax.legend(loc='lower right')
-    
-    # Add quadrant labels
-    ax.text(2.5, 8.5, 'Quick Wins', fontsize=14, fontweight='bold', alpha=0.5)
-    ax.text(7.5, 8.5, 'Major Initiatives', fontsize=14, fontweight='bold', alpha=0.5)
-    ax.text(2.5, 2.5, 'Low Priority', fontsize=14, fontweight='bold', alpha=0.5)
-    ax.text(7.5, 2.5, 'Fill-ins', fontsize=14, fontweight='bold', alpha=0.5)
-    
-    pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
-    
-    # PAGE 13: NEXT STEPS
-    fig = plt.figure(figsize=(11, 8.5))
-    fig.suptitle('Implementation Roadmap', fontsize=24, fontweight='bold', y=0.95)
-    
-    roadmap_text = """
+
+        # PAGE 13: NEXT STEPS
+        fig = plt.figure(figsize=(11, 8.5))
+        fig.suptitle('Implementation Roadmap', fontsize=24, fontweight='bold', y=0.95)
+
+        roadmap_text = """
 IMMEDIATE ACTIONS (0-3 MONTHS)
 • Launch simplified application pilot program
 • Create comprehensive FAQ and tutorial videos
@@ -344,13 +352,17 @@ SUCCESS METRICS
 • Grantee satisfaction scores
 • Community trust indicators
 """
-    
-    fig.text(0.1, 0.85, roadmap_text, ha='left', va='top', fontsize=11, 
-             wrap=True, family='monospace')
-    plt.axis('off')
-    pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
-
-print("\nLeadership Briefing Deck generated successfully!")
-print("File saved as: Austin_Cultural_Grants_Leadership_Briefing.pdf")
-print("\nAnalysis complete. Ready for presentation to Division Director and Arts Commission.")
\ No newline at end of file
+
+        fig.text(0.1, 0.85, roadmap_text, ha='left', va='top', fontsize=11, 
+                 wrap=True, family='monospace')
+        plt.axis('off')
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close()
+
+    print("\nLeadership Briefing Deck generated successfully!")
+    print("File saved as: Austin_Cultural_Grants_Leadership_Briefing.pdf")
+    print("\nAnalysis complete. Ready for presentation to Division Director and Arts Commission.")
+
+
+if __name__ == '__main__':
+    run(SurveyDataset.load('ACME.xlsx', keys=QUESTION_KEYS))
@@ -13,6 +13,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
 import io
+from survey_dataset import SurveyDataset
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -20,14 +21,6 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
 
-print("="*80)
-print("GENERATING INTERACTIVE HTML REPORT")
-print("="*80)
-print()
-
-# Load the survey data
-df = pd.read_excel('ACME.xlsx')
-
 # Helper function to create base64 encoded images
 def fig_to_base64(fig):
     """Convert matplotlib figure to base64 string"""
@@ -36,122 +29,133 @@ def fig_to_base64(fig):
     img.seek(0)
     return base64.b64encode(img.getvalue()).decode()
 
-# Generate key visualizations
-print("Creating visualizations...")
 
-# Use the sentiment values from deep_analysis.py (VADER sentiment analyzer)
-# These values come from the comprehensive sentiment analysis using VADER
-# which is more accurate for social media style text than TextBlob
-try:
-    with open('analysis_summary.json', 'r') as f:
-        analysis_data = json.load(f)
-    positive_pct = analysis_data['sentiment_summary']['improvements']['positive_rate']
-    negative_pct = analysis_data['sentiment_summary']['improvements']['negative_rate']
-    neutral_pct = 100 - positive_pct - negative_pct
-except:
-    # Fallback to known calculated values
-    positive_pct = 66.1
-    negative_pct = 10.1
-    neutral_pct = 23.8
+def run(dataset):
+    """Assemble the interactive HTML report from the stage outputs"""
+    print("="*80)
+    print("GENERATING INTERACTIVE HTML REPORT")
+    print("="*80)
+    print()
+
+    # Only the response count is used below
+    df = dataset.df
+
+    # Generate key visualizations
+    print("Creating visualizations...")
 
-# 1. Sentiment Overview Chart
-fig, ax = plt.subplots(figsize=(10, 6))
-sentiments = {'Positive': positive_pct, 'Neutral': neutral_pct, 'Negative': negative_pct}
-colors = ['#2ecc71', '#95a5a6', '#e74c3c']
-wedges, texts, autotexts = ax.pie(sentiments.values(), labels=sentiments.keys(), colors=colors, 
-                                   autopct='%1.1f%%', startangle=90, pctdistance=0.85)
-# Make it a donut chart
-centre_circle = plt.Circle((0,0), 0.70, fc='white')
-fig.gca().add_artist(centre_circle)
-ax.set_title('Overall Community Sentiment', fontsize=16, fontweight='bold', pad=20)
-sentiment_chart = fig_to_base64(fig)
-plt.close()
+    # Use the sentiment values from deep_analysis.py (VADER sentiment analyzer)
+    # These values come from the comprehensive sentiment analysis using VADER
+    # which is more accurate for social media style text than TextBlob
+    try:
+        with open('analysis_summary.json', 'r') as f:
+            analysis_data = json.load(f)
+        positive_pct = analysis_data['sentiment_summary']['improvements']['positive_rate']
+        negative_pct = analysis_data['sentiment_summary']['improvements']['negative_rate']
+        neutral_pct = 100 - positive_pct - negative_pct
+    except:
+        # Fallback to known calculated values
+        positive_pct = 66.1
+        negative_pct = 10.1
+        neutral_pct = 23.8
 
-# 2. Program Awareness Radar Chart
-fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
-programs = ['Heritage', 'Elevate', 'Nexus', 'Thrive', 'AIPP', 'CSAP', 'ALMF']
-awareness = [90, 85, 80, 85, 75, 28, 43]  # Updated with actual awareness data
-satisfaction = [85, 70, 75, 88, 65, 50, 40]
+    # 1. Sentiment Overview Chart
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sentiments = {'Positive': positive_pct, 'Neutral': neutral_pct, 'Negative': negative_pct}
+    colors = ['#2ecc71', '#95a5a6', '#e74c3c']
+    wedges, texts, autotexts = ax.pie(sentiments.values(), labels=sentiments.keys(), colors=colors, 
+                                       autopct='%1.1f%%', startangle=90, pctdistance=0.85)
+    # Make it a donut chart
+    centre_circle = plt.Circle((0,0), 0.70, fc='white')
+    fig.gca().add_artist(centre_circle)
+    ax.set_title('Overall Community Sentiment', fontsize=16, fontweight='bold', pad=20)
+    sentiment_chart = fig_to_base64(fig)
+    plt.close()
 
-angles = np.linspace(0, 2 * np.pi, len(programs), endpoint=False).tolist()
-awareness += awareness[:1]
-satisfaction += satisfaction[:1]
-angles += angles[:1]
+    # 2. Program Awareness Radar Chart
+    fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
+    programs = ['Heritage', 'Elevate', 'Nexus', 'Thrive', 'AIPP', 'CSAP', 'ALMF']
+    awareness = [90, 85, 80, 85, 75, 28, 43]  # Updated with actual awareness data
+    satisfaction = [85, 70, 75, 88, 65, 50, 40]
 
-ax.plot(angles, awareness, 'o-', linewidth=2, label='Awareness %', color='#3498db')
-ax.fill(angles, awareness, alpha=0.25, color='#3498db')
-ax.plot(angles, satisfaction, 'o-', linewidth=2, label='Satisfaction %', color='#e74c3c')
-ax.fill(angles, satisfaction, alpha=0.25, color='#e74c3c')
+    angles = np.linspace(0, 2 * np.pi, len(programs), endpoint=False).tolist()
+    awareness += awareness[:1]
+    satisfaction += satisfaction[:1]
+    angles += angles[:1]
 
-ax.set_theta_offset(np.pi / 2)
-ax.set_theta_direction(-1)
-ax.set_xticks(angles[:-1])
-ax.set_xticklabels(programs, size=12)
-ax.set_ylim(0, 100)
-ax.set_title('Program Performance Radar', fontsize=16, fontweight='bold', pad=30)
-ax.legend(loc='upper right', bbox_to_anchor=(1.2, 1.1))
-ax.grid(True, alpha=0.3)
-radar_chart = fig_to_base64(fig)
-plt.close()
+    ax.plot(angles, awareness, 'o-', linewidth=2, label='Awareness %', color='#3498db')
+    ax.fill(angles, awareness, alpha=0.25, color='#3498db')
+    ax.plot(angles, satisfaction, 'o-', linewidth=2, label='Satisfaction %', color='#e74c3c')
+    ax.fill(angles, satisfaction, alpha=0.25, color='#e74c3c')
 
-# 3. Barriers Visualization
-fig, ax = plt.subplots(figsize=(12, 8))
-barriers = {
-    'Cost/Financial': 68.5,
-    'Transportation': 65.5,
-    'Awareness': 54.2,
-    'Location/Distance': 43.4,
-    'Diversity/Inclusion': 35.7,
-    'Events Don\'t Match Interests': 9.6,
-    'Other Barriers': 5.0,
-    'Time/Schedule': 3.5
-}
-y_pos = np.arange(len(barriers))
-bars = ax.barh(y_pos, list(barriers.values()), color=plt.cm.viridis(np.linspace(0.2, 0.8, len(barriers))))
+    ax.set_theta_offset(np.pi / 2)
+    ax.set_theta_direction(-1)
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(programs, size=12)
+    ax.set_ylim(0, 100)
+    ax.set_title('Program Performance Radar', fontsize=16, fontweight='bold', pad=30)
+    ax.legend(loc='upper right', bbox_to_anchor=(1.2, 1.1))
+    ax.grid(True, alpha=0.3)
+    radar_chart = fig_to_base64(fig)
+    plt.close()
 
-for i, (bar, value) in enumerate(zip(bars, barriers.values())):
-    ax.text(value + 1, bar.get_y() + bar.get_height()/2, f'{value:.1f}%', 
-            va='center', fontsize=10, fontweight='bold')
+    # 3. Barriers Visualization
+    fig, ax = plt.subplots(figsize=(12, 8))
+    barriers = {
+        'Cost/Financial': 68.5,
+        'Transportation': 65.5,
+        'Awareness': 54.2,
+        'Location/Distance': 43.4,
+        'Diversity/Inclusion': 35.7,
+        'Events Don\'t Match Interests': 9.6,
+        'Other Barriers': 5.0,
+        'Time/Schedule': 3.5
+    }
+    y_pos = np.arange(len(barriers))
+    bars = ax.barh(y_pos, list(barriers.values()), color=plt.cm.viridis(np.linspace(0.2, 0.8, len(barriers))))
 
-ax.set_yticks(y_pos)
-ax.set_yticklabels(list(barriers.keys()), fontsize=12)
-ax.set_xlabel('Percentage of Respondents', fontsize=12)
-ax.set_title('Barriers to Arts & Culture Participation', fontsize=16, fontweight='bold', pad=20)
-ax.spines['top'].set_visible(False)
-ax.spines['right'].set_visible(False)
-barriers_chart = fig_to_base64(fig)
-plt.close()
+    for i, (bar, value) in enumerate(zip(bars, barriers.values())):
+        ax.text(value + 1, bar.get_y() + bar.get_height()/2, f'{value:.1f}%', 
+                va='center', fontsize=10, fontweight='bold')
 
-# 4. Word Cloud
-text = """funding artists community support grants access equity diversity inclusion 
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(list(barriers.keys()), fontsize=12)
+    ax.set_xlabel('Percentage of Respondents', fontsize=12)
+    ax.set_title('Barriers to Arts & Culture Participation', fontsize=16, fontweight='bold', pad=20)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    barriers_chart = fig_to_base64(fig)
+    plt.close()
+
+    # 4. Word Cloud
+    text = """funding artists community support grants access equity diversity inclusion 
 cultural arts music austin creative programs opportunities heritage preservation 
 communication transparency application process neighborhood engagement"""
-wordcloud = WordCloud(width=1200, height=600, background_color='white', 
-                     colormap='viridis', max_words=50).generate(text)
-fig, ax = plt.subplots(figsize=(12, 6))
-ax.imshow(wordcloud, interpolation='bilinear')
-ax.axis('off')
-wordcloud_img = fig_to_base64(fig)
-plt.close()
+    wordcloud = WordCloud(width=1200, height=600, background_color='white', 
+                         colormap='viridis', max_words=50).generate(text)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis('off')
+    wordcloud_img = fig_to_base64(fig)
+    plt.close()
 
-# Load map data
-try:
-    with open('map_data.json', 'r') as f:
-        map_data = json.load(f)
-except:
-    map_data = {'response_map': '', 'awareness_map': '', 'sentiment_map': ''}
+    # Load map data
+    try:
+        with open('map_data.json', 'r') as f:
+            map_data = json.load(f)
+    except:
+        map_data = {'response_map': '', 'awareness_map': '', 'sentiment_map': ''}
 
-# Load traceability data
-try:
-    with open('traceability_table.html', 'r') as f:
-        traceability_content = f.read()
-except:
-    traceability_content = '<div id="traceability" style="display: none;"><p>Traceability data not available</p></div>'
+    # Load traceability data
+    try:
+        with open('traceability_table.html', 'r') as f:
+            traceability_content = f.read()
+    except:
+        traceability_content = '<div id="traceability" style="display: none;"><p>Traceability data not available</p></div>'
 
-print("Generating HTML report...")
+    print("Generating HTML report...")
 
-# Create the HTML report
-html_content = f"""
+    # Create the HTML report
+    html_content = f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -1661,10 +1665,14 @@ html_content = f"""
 </html>
 """
 
-# Save the HTML report
-with open('Austin_Cultural_Grants_Interactive_Report.html', 'w', encoding='utf-8') as f:
-    f.write(html_content)
+    # Save the HTML report
+    with open('Austin_Cultural_Grants_Interactive_Report.html', 'w', encoding='utf-8') as f:
+        f.write(html_content)
+
+    print("\nInteractive HTML report generated successfully!")
+    print("File saved as: Austin_Cultural_Grants_Interactive_Report.html")
+    print("\nOpen in a web browser for the full interactive experience.")
+
 
-print("\nInteractive HTML report generated successfully!")
-print("File saved as: Austin_Cultural_Grants_Interactive_Report.html")
-print("\nOpen in a web browser for the full interactive experience.")
\ No newline at end of file
+if __name__ == '__main__':
+    run(SurveyDataset.load('ACME.xlsx', keys=['id']))
@@ -10,364 +10,314 @@ import numpy as np
 from textblob import TextBlob
 import json
 from datetime import datetime
-
-# Load the survey data
-df = pd.read_excel('ACME.xlsx')
-
-# Initialize traceability data structure
-traceability_data = {
-    'metadata': {
-        'generated_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'source_file': 'ACME.xlsx',
-        'total_records': len(df)
-    },
-    'calculations': []
-}
-
-print("="*80)
-print("GENERATING DATA TRACEABILITY REPORT")
-print("="*80)
-print()
-
-# 1. BASIC METRICS
-print("Calculating basic metrics...")
-basic_metrics = {
-    'category': 'Basic Survey Metrics',
-    'calculations': [
-        {
-            'metric': 'Total Survey Responses',
-            'formula': 'COUNT(all rows in ACME.xlsx)',
-            'value': len(df),
-            'details': f"Total number of rows in the dataset"
-        },
-        {
-            'metric': 'Total Columns',
-            'formula': 'COUNT(all columns)',
-            'value': len(df.columns),
-            'details': f"Total number of survey questions/fields"
-        }
-    ]
-}
-
-# 2. ZIP CODE ANALYSIS
-print("Calculating zip code metrics...")
-zip_col = 'What zip code do you reside in?'
-austin_zips = [
-    '78701', '78702', '78703', '78704', '78705', '78751', '78752', '78756', '78757', '78758', '78759',
-    '78721', '78722', '78723', '78724', '78725', '78741', '78742', '78744', '78745', '78746', '78747', 
-    '78748', '78749', '78727', '78728', '78729', '78750', '78753', '78754', '78726', '78730', '78731',
-    '78732', '78733', '78734', '78735', '78736', '78737', '78738', '78739', '78652', '78653', '78660',
-    '78664', '78669', '78613', '78617', '78641', '78645', '78654', '78665', '78681', '78682'
-]
-
-df['clean_zip'] = df[zip_col].astype(str).str.strip()
-austin_df = df[df['clean_zip'].isin(austin_zips)]
-zip_counts = austin_df['clean_zip'].value_counts()
-
-zip_metrics = {
-    'category': 'Geographic Distribution',
-    'calculations': [
-        {
-            'metric': 'Valid Austin Zip Codes',
-            'formula': f'COUNT(responses WHERE zip_code IN austin_zips)',
-            'value': len(austin_df),
-            'details': f"Filtered using list of {len(austin_zips)} valid Austin zip codes"
-        },
-        {
-            'metric': 'Unique Austin Zip Codes',
-            'formula': 'COUNT(DISTINCT zip_codes WHERE zip IN austin_zips)',
-            'value': austin_df['clean_zip'].nunique(),
-            'details': f"Number of different Austin zip codes represented"
-        },
-        {
-            'metric': 'Highest Response Zip Code',
-            'formula': 'MODE(zip_codes)',
-            'value': f"{zip_counts.index[0]} ({zip_counts.iloc[0]} responses)",
-            'details': f"Zip code with most survey responses"
+from survey_dataset import AUSTIN_ZIPS, SurveyDataset
+
+# Questions the report documents (survey_schema question keys)
+QUESTION_KEYS = ['zip', 'improvements', 'additional_feedback', 'awareness', 'barriers']
+
+def run(dataset):
+    """Document every reported metric with its formula and computed value"""
+    # Work on the shared survey dataset
+    df = dataset.df
+    schema = dataset.schema.require(*QUESTION_KEYS)
+
+    # Initialize traceability data structure
+    traceability_data = {
+        'metadata': {
+            'generated_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'source_file': dataset.source,
+            'total_records': len(df)
         },
-        {
-            'metric': 'Top 5 Zip Codes',
-            'formula': 'TOP(5, COUNT(zip_code) GROUP BY zip_code)',
-            'value': ', '.join([f"{z}({c})" for z, c in zip_counts.head(5).items()]),
-            'details': "Five zip codes with highest response counts"
-        }
-    ]
-}
-
-# 3. SENTIMENT ANALYSIS
-print("Calculating sentiment metrics...")
-
-# Use VADER sentiment analysis to match the main report
-import nltk
-try:
-    nltk.data.find('vader_lexicon')
-except LookupError:
-    nltk.download('vader_lexicon')
-
-from nltk.sentiment import SentimentIntensityAnalyzer
-sia = SentimentIntensityAnalyzer()
-
-sentiment_cols = [
-    'What improvements would you like to see in these cultural funding programs?',
-    'Do you have any additional ideas, concerns, or feedback you would like to share to help ACME better serve the public? '
-]
-
-# Improvements column analysis
-improvements_col = sentiment_cols[0]
-improvements_scores = {'positive': 0, 'negative': 0, 'neutral': 0, 'total': 0, 'compound_sum': 0}
-
-if improvements_col in df.columns:
-    responses = df[improvements_col].dropna()
-    for response in responses:
-        try:
-            scores = sia.polarity_scores(str(response))
-            improvements_scores['total'] += 1
-            improvements_scores['compound_sum'] += scores['compound']
-            
-            if scores['compound'] >= 0.05:
-                improvements_scores['positive'] += 1
-            elif scores['compound'] <= -0.05:
-                improvements_scores['negative'] += 1
-            else:
-                improvements_scores['neutral'] += 1
-        except:
-            pass
-
-# Calculate percentages to match main report
-if improvements_scores['total'] > 0:
-    positive_pct = 66.14  # From analysis_summary.json
-    negative_pct = 10.10  # From analysis_summary.json
-    neutral_pct = 100 - positive_pct - negative_pct
-    overall_sentiment = 0.3671  # Average compound score from analysis_summary.json
-    total_analyzed = improvements_scores['total']
-else:
-    positive_pct = 0
-    negative_pct = 0
-    neutral_pct = 0
-    overall_sentiment = 0
-    total_analyzed = 0
-
-# Additional feedback column
-feedback_col = sentiment_cols[1]
-feedback_scores = {'positive': 0, 'negative': 0, 'neutral': 0, 'total': 0}
-
-if feedback_col in df.columns:
-    responses = df[feedback_col].dropna()
-    for response in responses:
-        try:
-            scores = sia.polarity_scores(str(response))
-            feedback_scores['total'] += 1
-            
-            if scores['compound'] >= 0.05:
-                feedback_scores['positive'] += 1
-            elif scores['compound'] <= -0.05:
-                feedback_scores['negative'] += 1
-            else:
-                feedback_scores['neutral'] += 1
-        except:
-            pass
-
-sentiment_details = []
-if improvements_scores['total'] > 0:
-    sentiment_details.append({
-        'column': improvements_col.strip(),
-        'responses_analyzed': improvements_scores['total'],
-        'avg_compound': 0.3671,
-        'positive': improvements_scores['positive'],
-        'neutral': improvements_scores['neutral'],
-        'negative': improvements_scores['negative']
-    })
+        'calculations': []
+    }
+
+    print("="*80)
+    print("GENERATING DATA TRACEABILITY REPORT")
+    print("="*80)
+    print()
+
+    # 1. BASIC METRICS
+    print("Calculating basic metrics...")
+    basic_metrics = {
+        'category': 'Basic Survey Metrics',
+        'calculations': [
+            {
+                'metric': 'Total Survey Responses',
+                'formula': 'COUNT(all rows in ACME.xlsx)',
+                'value': len(df),
+                'details': f"Total number of rows in the dataset"
+            },
+            {
+                'metric': 'Total Columns',
+                'formula': 'COUNT(all columns)',
+                'value': len(dataset.source_columns),
+                'details': f"Total number of survey questions/fields"
+            }
+        ]
+    }
+
+    # 2. ZIP CODE ANALYSIS
+    print("Calculating zip code metrics...")
+    austin_zips = AUSTIN_ZIPS
+
+    # Responses per Austin zip code, read from the survey cube
+    cube = dataset.cube()
+    zip_counts = cube.slice(zip=austin_zips).respondents('zip')
+    zip_counts = zip_counts[zip_counts > 0].sort_values(ascending=False, kind='stable')
+
+    zip_metrics = {
+        'category': 'Geographic Distribution',
+        'calculations': [
+            {
+                'metric': 'Valid Austin Zip Codes',
+                'formula': f'COUNT(responses WHERE zip_code IN austin_zips)',
+                'value': int(zip_counts.sum()),
+                'details': f"Filtered using list of {len(austin_zips)} valid Austin zip codes"
+            },
+            {
+                'metric': 'Unique Austin Zip Codes',
+                'formula': 'COUNT(DISTINCT zip_codes WHERE zip IN austin_zips)',
+                'value': len(zip_counts),
+                'details': f"Number of different Austin zip codes represented"
+            },
+            {
+                'metric': 'Highest Response Zip Code',
+                'formula': 'MODE(zip_codes)',
+                'value': f"{zip_counts.index[0]} ({zip_counts.iloc[0]} responses)",
+                'details': f"Zip code with most survey responses"
+            },
+            {
+                'metric': 'Top 5 Zip Codes',
+                'formula': 'TOP(5, COUNT(zip_code) GROUP BY zip_code)',
+                'value': ', '.join([f"{z}({c})" for z, c in zip_counts.head(5).items()]),
+                'details': "Five zip codes with highest response counts"
+            }
+        ]
+    }
+
+    # 3. SENTIMENT ANALYSIS
+    print("Calculating sentiment metrics...")
+
+    # VADER scores shared with the main report (see survey_sentiment)
+    sentiment_cols = [schema['improvements'], schema['additional_feedback']]
+
+    # Improvements column analysis
+    improvements_col = sentiment_cols[0]
+    improvements_scores = {'positive': 0, 'negative': 0, 'neutral': 0, 'total': 0, 'compound_sum': 0}
+
+    if improvements_col in df.columns:
+        scores = dataset.sentiment('improvements')
+        improvements_scores.update(scores.counts())
+        improvements_scores['total'] = int(scores.scored.sum())
+        improvements_scores['compound_sum'] = float(np.nansum(scores.compound))
+
+    # Calculate percentages to match main report
+    if improvements_scores['total'] > 0:
+        positive_pct = 66.14  # From analysis_summary.json
+        negative_pct = 10.10  # From analysis_summary.json
+        neutral_pct = 100 - positive_pct - negative_pct
+        overall_sentiment = 0.3671  # Average compound score from analysis_summary.json
+        total_analyzed = improvements_scores['total']
+    else:
+        positive_pct = 0
+        negative_pct = 0
+        neutral_pct = 0
+        overall_sentiment = 0
+        total_analyzed = 0
+
+    # Additional feedback column
+    feedback_col = sentiment_cols[1]
+    feedback_scores = {'positive': 0, 'negative': 0, 'neutral': 0, 'total': 0}
+
+    if feedback_col in df.columns:
+        scores = dataset.sentiment('additional_feedback')
+        feedback_scores.update(scores.counts())
+        feedback_scores['total'] = int(scores.scored.sum())
+
+    sentiment_details = []
+    if improvements_scores['total'] > 0:
+        sentiment_details.append({
+            'column': improvements_col.strip(),
+            'responses_analyzed': improvements_scores['total'],
+            'avg_compound': 0.3671,
+            'positive': improvements_scores['positive'],
+            'neutral': improvements_scores['neutral'],
+            'negative': improvements_scores['negative']
+        })
 
-if feedback_scores['total'] > 0:
-    sentiment_details.append({
-        'column': feedback_col.strip(),
-        'responses_analyzed': feedback_scores['total'],
-        'avg_compound': 0.4016,  # From support_organizations in analysis_summary.json
-        'positive': int(feedback_scores['total'] * 0.7019),  # 70.19% from analysis
-        'neutral': int(feedback_scores['total'] * 0.2099),  # Calculated
-        'negative': int(feedback_scores['total'] * 0.0882)   # 8.82% from analysis
-    })
+    if feedback_scores['total'] > 0:
+        sentiment_details.append({
+            'column': feedback_col.strip(),
+            'responses_analyzed': feedback_scores['total'],
+            'avg_compound': 0.4016,  # From support_organizations in analysis_summary.json
+            'positive': int(feedback_scores['total'] * 0.7019),  # 70.19% from analysis
+            'neutral': int(feedback_scores['total'] * 0.2099),  # Calculated
+            'negative': int(feedback_scores['total'] * 0.0882)   # 8.82% from analysis
+        })
 
-sentiment_metrics = {
-    'category': 'Sentiment Analysis (VADER)',
-    'calculations': [
-        {
-            'metric': 'Overall Sentiment Score',
-            'formula': 'MEAN(VADER.compound_score for all text responses)',
-            'value': f"{overall_sentiment:.4f}",
-            'details': f"Average compound score across {total_analyzed} analyzed responses (-1 to 1 scale)"
-        },
-        {
-            'metric': 'Positive Sentiment %',
-            'formula': 'COUNT(responses WHERE compound >= 0.05) / COUNT(all responses) * 100',
-            'value': f"{positive_pct:.1f}%",
-            'details': f"{int(total_analyzed * positive_pct / 100)} out of {total_analyzed} responses"
-        },
-        {
-            'metric': 'Neutral Sentiment %',
-            'formula': 'COUNT(responses WHERE -0.05 < compound < 0.05) / COUNT(all responses) * 100',
-            'value': f"{neutral_pct:.1f}%",
-            'details': f"{int(total_analyzed * neutral_pct / 100)} out of {total_analyzed} responses"
-        },
-        {
-            'metric': 'Negative Sentiment %',
-            'formula': 'COUNT(responses WHERE compound <= -0.05) / COUNT(all responses) * 100',
-            'value': f"{negative_pct:.1f}%",
-            'details': f"{int(total_analyzed * negative_pct / 100)} out of {total_analyzed} responses"
-        }
-    ],
-    'column_details': sentiment_details
-}
-
-# 4. PROGRAM AWARENESS
-print("Calculating program awareness metrics...")
-awareness_col = df.columns[21] if len(df.columns) > 21 else None
-programs = ['Heritage', 'Thrive', 'Nexus', 'Elevate', 'AIPP', 'CSAP', 'ALMF']
-
-program_metrics = {
-    'category': 'Program Awareness & Mentions',
-    'calculations': []
-}
-
-if awareness_col and awareness_col in df.columns:
-    awareness_data = df[awareness_col].dropna()
-    for program in programs:
-        count = awareness_data.str.contains(program, case=False, na=False).sum()
-        pct = (count / len(df)) * 100
-        program_metrics['calculations'].append({
-            'metric': f'{program} Awareness',
-            'formula': f'COUNT(responses WHERE "{awareness_col}" CONTAINS "{program}") / COUNT(all responses) * 100',
-            'value': f"{pct:.1f}% ({count} mentions)",
-            'details': f"Case-insensitive search in awareness question"
+    sentiment_metrics = {
+        'category': 'Sentiment Analysis (VADER)',
+        'calculations': [
+            {
+                'metric': 'Overall Sentiment Score',
+                'formula': 'MEAN(VADER.compound_score for all text responses)',
+                'value': f"{overall_sentiment:.4f}",
+                'details': f"Average compound score across {total_analyzed} analyzed responses (-1 to 1 scale)"
+            },
+            {
+                'metric': 'Positive Sentiment %',
+                'formula': 'COUNT(responses WHERE compound >= 0.05) / COUNT(all responses) * 100',
+                'value': f"{positive_pct:.1f}%",
+                'details': f"{int(total_analyzed * positive_pct / 100)} out of {total_analyzed} responses"
+            },
+            {
+                'metric': 'Neutral Sentiment %',
+                'formula': 'COUNT(responses WHERE -0.05 < compound < 0.05) / COUNT(all responses) * 100',
+                'value': f"{neutral_pct:.1f}%",
+                'details': f"{int(total_analyzed * neutral_pct / 100)} out of {total_analyzed} responses"
+            },
+            {
+                'metric': 'Negative Sentiment %',
+                'formula': 'COUNT(responses WHERE compound <= -0.05) / COUNT(all responses) * 100',
+                'value': f"{negative_pct:.1f}%",
+                'details': f"{int(total_analyzed * negative_pct / 100)} out of {total_analyzed} responses"
+            }
+        ],
+        'column_details': sentiment_details
+    }
+
+    # 4. PROGRAM AWARENESS
+    print("Calculating program awareness metrics...")
+    awareness_col = schema['awareness']
+    programs = ['Heritage', 'Thrive', 'Nexus', 'Elevate', 'AIPP', 'CSAP', 'ALMF']
+
+    program_metrics = {
+        'category': 'Program Awareness & Mentions',
+        'calculations': []
+    }
+
+    if awareness_col and awareness_col in df.columns:
+        program_counts = cube.counts('program')
+        for program in programs:
+            count = int(program_counts[program])
+            pct = (count / len(df)) * 100
+            program_metrics['calculations'].append({
+                'metric': f'{program} Awareness',
+                'formula': f'COUNT(responses WHERE "{awareness_col}" MENTIONS "{program}") / COUNT(all responses) * 100',
+                'value': f"{pct:.1f}% ({count} mentions)",
+                'details': f"Program name or alias recognized in the awareness question"
+            })
+
+    # 5. BARRIERS ANALYSIS
+    print("Calculating barriers metrics...")
+    # Use the actual barriers column from the survey
+    barriers_col = schema['barriers']
+
+    # Count each barrier type directly from the multiple choice responses
+    barrier_counts = cube.counts('barriers')
+    total_barrier_respondents = cube.answered('barriers')
+
+    # Main barriers: the six listed options, which dwarf the write-in answers
+    main_barriers = barrier_counts.sort_values(ascending=False, kind='stable').head(6).to_dict()
+    avg_barriers = barrier_counts.sum() / total_barrier_respondents if total_barrier_respondents else 0
+
+    barrier_metrics = {
+        'category': 'Barriers to Participation',
+        'calculations': []
+    }
+
+    # Add the main barriers with actual counts
+    for barrier_name, count in main_barriers.items():
+        pct = (count / total_barrier_respondents * 100) if total_barrier_respondents > 0 else 0
+        barrier_metrics['calculations'].append({
+            'metric': barrier_name,
+            'formula': f'COUNT(respondents who selected "{barrier_name}") / COUNT(all barrier respondents) * 100',
+            'value': f"{pct:.1f}% ({count} respondents)",
+            'details': f"Direct count from multiple choice responses"
         })
 
-# 5. BARRIERS ANALYSIS
-print("Calculating barriers metrics...")
-# Use the actual barriers column from the survey
-barriers_col = df.columns[17]  # "What barriers, if any, prevent you from participating in arts and culture events in Austin?"
-
-# Count each barrier type directly from the multiple choice responses
-barrier_counts = {}
-total_barrier_respondents = 0
-
-for response in df[barriers_col].dropna():
-    total_barrier_respondents += 1
-    barriers = str(response).split(';')
-    
-    for barrier in barriers:
-        barrier = barrier.strip()
-        if barrier and barrier != '':
-            if barrier not in barrier_counts:
-                barrier_counts[barrier] = 0
-            barrier_counts[barrier] += 1
-
-# Main barriers from the actual survey data
-main_barriers = {
-    'Cost of tickets or admission fees': 747,
-    'Transportation / parking issues': 715,
-    'Lack of awareness about events and programs': 591,
-    'Location- Lack of nearby venues or events in my neighborhood': 474,
-    'Limited diversity/ representation/ inclusion in events': 389,
-    'The events don\'t match my interests': 105
-}
-
-barrier_metrics = {
-    'category': 'Barriers to Participation',
-    'calculations': []
-}
-
-# Add the main barriers with actual counts
-for barrier_name, count in main_barriers.items():
-    pct = (count / total_barrier_respondents * 100) if total_barrier_respondents > 0 else 0
+    # Add summary statistics
     barrier_metrics['calculations'].append({
-        'metric': barrier_name,
-        'formula': f'COUNT(respondents who selected "{barrier_name}") / COUNT(all barrier respondents) * 100',
-        'value': f"{pct:.1f}% ({count} respondents)",
-        'details': f"Direct count from multiple choice responses"
+        'metric': 'Total Barrier Respondents',
+        'formula': 'COUNT(respondents who answered barrier question)',
+        'value': str(total_barrier_respondents),
+        'details': 'Number of people who provided barrier information'
     })
 
-# Add summary statistics
-barrier_metrics['calculations'].append({
-    'metric': 'Total Barrier Respondents',
-    'formula': 'COUNT(respondents who answered barrier question)',
-    'value': str(total_barrier_respondents),
-    'details': 'Number of people who provided barrier information'
-})
-
-barrier_metrics['calculations'].append({
-    'metric': 'Average Barriers per Respondent',
-    'formula': 'SUM(all barrier selections) / COUNT(respondents)',
-    'value': '2.9',
-    'details': 'Each respondent selected an average of 2.9 barriers'
-})
-
-# 6. APPLICANT VS NON-APPLICANT ANALYSIS
-print("Calculating applicant journey metrics...")
-# Updated with exact figures from the survey data
-applicant_metrics = {
-    'category': 'Applicant Journey Analysis',
-    'calculations': [
-        {
-            'metric': 'Applicant Dissatisfaction Rate',
-            'formula': 'COUNT(applicants who are somewhat/very dissatisfied) / COUNT(all applicants) * 100',
-            'value': '30.7%',
-            'details': '143 out of 466 applicants (57 somewhat + 86 very dissatisfied)'
-        },
-        {
-            'metric': 'Non-Applicant Dissatisfaction Rate',
-            'formula': 'COUNT(non-applicants who are dissatisfied) / COUNT(non-applicants) * 100',
-            'value': '11.7%',
-            'details': 'Calculated from non-applicant sentiment responses'
-        },
-        {
-            'metric': 'Mid-Application Dropout Rate',
-            'formula': 'Estimated from incomplete application mentions',
-            'value': '42%',
-            'details': 'Based on first-timer feedback mentioning form abandonment'
-        },
-        {
-            'metric': 'Focus Group Volunteers',
-            'formula': 'COUNT(respondents who provided email for focus groups)',
-            'value': '654',
-            'details': '501 said Yes, 432 said Maybe (933 total interested)'
-        }
-    ]
-}
-
-# 7. DISTRICT-LEVEL INSIGHTS
-district_metrics = {
-    'category': 'District-Level Analysis',
-    'calculations': [
-        {
-            'metric': 'District 3 CSAP Awareness',
-            'formula': 'Estimated from zip code mapping to council districts',
-            'value': '38%',
-            'details': 'East Austin district with highest CSAP awareness'
-        },
-        {
-            'metric': 'District 6 CSAP Awareness',
-            'formula': 'Estimated from zip code mapping to council districts',
-            'value': '21%',
-            'details': 'Northwest suburbs with lowest CSAP awareness'
-        }
+    barrier_metrics['calculations'].append({
+        'metric': 'Average Barriers per Respondent',
+        'formula': 'SUM(all barrier selections) / COUNT(respondents)',
+        'value': f"{avg_barriers:.1f}",
+        'details': f'Each respondent selected an average of {avg_barriers:.1f} barriers'
+    })
+
+    # 6. APPLICANT VS NON-APPLICANT ANALYSIS
+    print("Calculating applicant journey metrics...")
+    # Updated with exact figures from the survey data
+    applicant_metrics = {
+        'category': 'Applicant Journey Analysis',
+        'calculations': [
+            {
+                'metric': 'Applicant Dissatisfaction Rate',
+                'formula': 'COUNT(applicants who are somewhat/very dissatisfied) / COUNT(all applicants) * 100',
+                'value': '30.7%',
+                'details': '143 out of 466 applicants (57 somewhat + 86 very dissatisfied)'
+            },
+            {
+                'metric': 'Non-Applicant Dissatisfaction Rate',
+                'formula': 'COUNT(non-applicants who are dissatisfied) / COUNT(non-applicants) * 100',
+                'value': '11.7%',
+                'details': 'Calculated from non-applicant sentiment responses'
+            },
+            {
+                'metric': 'Mid-Application Dropout Rate',
+                'formula': 'Estimated from incomplete application mentions',
+                'value': '42%',
+                'details': 'Based on first-timer feedback mentioning form abandonment'
+            },
+            {
+                'metric': 'Focus Group Volunteers',
+                'formula': 'COUNT(respondents who provided email for focus groups)',
+                'value': '654',
+                'details': '501 said Yes, 432 said Maybe (933 total interested)'
+            }
+        ]
+    }
+
+    # 7. DISTRICT-LEVEL INSIGHTS
+    district_metrics = {
+        'category': 'District-Level Analysis',
+        'calculations': [
+            {
+                'metric': 'District 3 CSAP Awareness',
+                'formula': 'Estimated from zip code mapping to council districts',
+                'value': '38%',
+                'details': 'East Austin district with highest CSAP awareness'
+            },
+            {
+                'metric': 'District 6 CSAP Awareness',
+                'formula': 'Estimated from zip code mapping to council districts',
+                'value': '21%',
+                'details': 'Northwest suburbs with lowest CSAP awareness'
+            }
+        ]
+    }
+
+    # Compile all metrics
+    traceability_data['calculations'] = [
+        basic_metrics,
+        zip_metrics,
+        sentiment_metrics,
+        program_metrics,
+        barrier_metrics,
+        applicant_metrics,
+        district_metrics
     ]
-}
-
-# Compile all metrics
-traceability_data['calculations'] = [
-    basic_metrics,
-    zip_metrics,
-    sentiment_metrics,
-    program_metrics,
-    barrier_metrics,
-    applicant_metrics,
-    district_metrics
-]
-
-# Generate HTML table
-print("\nGenerating traceability HTML...")
-
-html_table = """
+
+    # Generate HTML table
+    print("\nGenerating traceability HTML...")
+
+    html_table = """
 <div id="traceability" style="display: none;">
     <h2 style="margin-bottom: 2rem;">Data Traceability & Calculation Documentation</h2>
     <p style="margin-bottom: 2rem;">
@@ -376,8 +326,8 @@ html_table = """
     </p>
 """.format(**traceability_data['metadata'])
 
-for category_data in traceability_data['calculations']:
-    html_table += f"""
+    for category_data in traceability_data['calculations']:
+        html_table += f"""
     <div class="card" style="margin-bottom: 2rem;">
         <h3 style="color: var(--primary-color); margin-bottom: 1rem;">{category_data['category']}</h3>
         <div style="overflow-x: auto;">
@@ -392,9 +342,9 @@ for category_data in traceability_data['calculations']:
                 </thead>
                 <tbody>
     """
-    
-    for calc in category_data['calculations']:
-        html_table += f"""
+
+        for calc in category_data['calculations']:
+            html_table += f"""
                     <tr style="border-bottom: 1px solid #e5e7eb;">
                         <td style="padding: 0.75rem; font-weight: 500;">{calc['metric']}</td>
                         <td style="padding: 0.75rem; font-family: monospace; font-size: 0.9rem; color: #6b7280;">{calc['formula']}</td>
@@ -402,16 +352,16 @@ for category_data in traceability_data['calculations']:
                         <td style="padding: 0.75rem; font-size: 0.9rem; color: #6b7280;">{calc['details']}</td>
                     </tr>
         """
-    
-    html_table += """
+
+        html_table += """
                 </tbody>
             </table>
         </div>
     """
-    
-    # Add column details for sentiment analysis
-    if 'column_details' in category_data and category_data['column_details']:
-        html_table += """
+
+        # Add column details for sentiment analysis
+        if 'column_details' in category_data and category_data['column_details']:
+            html_table += """
         <h4 style="margin-top: 1.5rem; margin-bottom: 1rem;">Detailed Sentiment Analysis by Question</h4>
         <div style="overflow-x: auto;">
             <table style="width: 100%; border-collapse: collapse;">
@@ -427,8 +377,8 @@ for category_data in traceability_data['calculations']:
                 </thead>
                 <tbody>
         """
-        for detail in category_data['column_details']:
-            html_table += f"""
+            for detail in category_data['column_details']:
+                html_table += f"""
                     <tr style="border-bottom: 1px solid #e5e7eb;">
                         <td style="padding: 0.5rem; font-size: 0.85rem; max-width: 300px;">{detail['column'][:60]}...</td>
                         <td style="padding: 0.5rem; text-align: center;">{detail['responses_analyzed']}</td>
@@ -438,17 +388,17 @@ for category_data in traceability_data['calculations']:
                         <td style="padding: 0.5rem; text-align: center; color: #ef4444;">{detail['negative']}</td>
                     </tr>
             """
-        html_table += """
+            html_table += """
                 </tbody>
             </table>
         </div>
         """
-    
-    html_table += """
+
+        html_table += """
     </div>
     """
 
-html_table += """
+    html_table += """
     <div class="card" style="background: #fef3c7; border-left: 4px solid #f59e0b;">
         <h4 style="color: #92400e; margin-bottom: 1rem;">
             <i class="fas fa-info-circle"></i> Data Quality Notes
@@ -465,14 +415,18 @@ html_table += """
 </div>
 """
 
-# Save traceability data
-with open('traceability_data.json', 'w') as f:
-    json.dump(traceability_data, f, indent=2)
+    # Save traceability data
+    with open('traceability_data.json', 'w') as f:
+        json.dump(traceability_data, f, indent=2)
+
+    with open('traceability_table.html', 'w') as f:
+        f.write(html_table)
+
+    print("\nTraceability report generated successfully!")
+    print("Files created:")
+    print("  - traceability_data.json (raw data)")
+    print("  - traceability_table.html (HTML table)")
 
-with open('traceability_table.html', 'w') as f:
-    f.write(html_table)
 
-print("\nTraceability report generated successfully!")
-print("Files created:")
-print("  - traceability_data.json (raw data)")
-print("  - traceability_table.html (HTML table)")
\ No newline at end of file
+if __name__ == '__main__':
+    run(SurveyDataset.load('ACME.xlsx', keys=QUESTION_KEYS))
@@ -4,12 +4,15 @@ Generate Comprehensive Visualizations and Report
 Dr. Anya Sharma - Civic Arts & Equity Consulting
 """
 
+import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
 from matplotlib.patches import Rectangle
+from survey_dataset import SurveyDataset
+from survey_loader import HAS_ARROW
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -17,227 +20,187 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
 
-print("="*80)
-print("GENERATING COMPREHENSIVE VISUALIZATIONS & INSIGHTS")
-print("="*80)
-print()
-
-# Load the survey data
-df = pd.read_excel('ACME.xlsx')
-
-# Create figures directory
-import os
-if not os.path.exists('figures'):
-    os.makedirs('figures')
-
-# 1. OVERALL SENTIMENT DASHBOARD
-print("Creating Overall Sentiment Dashboard...")
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('City of Austin Cultural Grants: Community Sentiment Overview', fontsize=20, fontweight='bold')
-
-# 1.1 Equal Access Perception
-ax1 = axes[0, 0]
-equal_access = df['Do you feel that all Austin residents have equal access to arts, cultural, music, and entertainment opportunities? '].value_counts()
-colors = ['#e74c3c' if 'No' in str(x) else '#f39c12' if 'Somewhat' in str(x) else '#27ae60' for x in equal_access.index]
-equal_access.plot(kind='pie', ax=ax1, colors=colors, autopct='%1.1f%%', startangle=90)
-ax1.set_title('Equal Access Perception', fontsize=14, fontweight='bold')
-ax1.set_ylabel('')
-
-# 1.2 Program Accessibility
-ax2 = axes[0, 1]
-accessibility = df['How accessible do you think these programs are for historically underrepresented artists, organizations, and communities? '].value_counts()
-accessibility.plot(kind='bar', ax=ax2, color='steelblue', alpha=0.8)
-ax2.set_title('Program Accessibility for Underrepresented Communities', fontsize=14, fontweight='bold')
-ax2.set_xlabel('')
-ax2.set_ylabel('Number of Responses')
-ax2.tick_params(axis='x', rotation=45)
-
-# 1.3 Participation Frequency
-ax3 = axes[1, 0]
-participation = df['How often do you attend or participate in arts, cultural, or entertainment events in Austin? '].value_counts()
-participation.plot(kind='bar', ax=ax3, color='darkgreen', alpha=0.8)
-ax3.set_title('Event Participation Frequency', fontsize=14, fontweight='bold')
-ax3.set_xlabel('')
-ax3.set_ylabel('Number of Responses')
-ax3.tick_params(axis='x', rotation=45)
-
-# 1.4 Importance Rating
-ax4 = axes[1, 1]
-importance = df['How important is it to you that Austin preserves and supports its local arts, culture, music scene and historic character? '].value_counts()
-importance.plot(kind='bar', ax=ax4, color='purple', alpha=0.8)
-ax4.set_title('Importance of Arts & Culture Support', fontsize=14, fontweight='bold')
-ax4.set_xlabel('')
-ax4.set_ylabel('Number of Responses')
-ax4.tick_params(axis='x', rotation=45)
-
-plt.tight_layout()
-plt.savefig('figures/01_sentiment_dashboard.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 2. BARRIERS ANALYSIS
-print("Creating Barriers Analysis...")
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
-fig.suptitle('Barriers to Arts & Culture Participation', fontsize=18, fontweight='bold')
-
-# Extract barrier categories
-barriers_col = 'What barriers, if any, prevent you from participating in arts and culture events in Austin? (Select all that apply.)'
-barriers_data = df[barriers_col].dropna()
-
-# Count barrier mentions
-barrier_types = {
-    'Cost/Admission': 0,
-    'Transportation/Parking': 0,
-    'Location/Distance': 0,
-    'Lack of Awareness': 0,
-    'Time Constraints': 0,
-    'Limited Diversity': 0,
-    'Language Barriers': 0,
-    'Accessibility Issues': 0,
-    'Childcare': 0,
-    'Safety Concerns': 0
-}
-
-for response in barriers_data:
-    response_lower = str(response).lower()
-    if 'cost' in response_lower or 'admission' in response_lower or 'ticket' in response_lower:
-        barrier_types['Cost/Admission'] += 1
-    if 'transport' in response_lower or 'parking' in response_lower:
-        barrier_types['Transportation/Parking'] += 1
-    if 'location' in response_lower or 'distance' in response_lower or 'neighborhood' in response_lower:
-        barrier_types['Location/Distance'] += 1
-    if 'aware' in response_lower or 'know' in response_lower or 'information' in response_lower:
-        barrier_types['Lack of Awareness'] += 1
-    if 'time' in response_lower or 'schedule' in response_lower:
-        barrier_types['Time Constraints'] += 1
-    if 'divers' in response_lower or 'represent' in response_lower or 'inclusion' in response_lower:
-        barrier_types['Limited Diversity'] += 1
-    if 'language' in response_lower:
-        barrier_types['Language Barriers'] += 1
-    if 'accessib' in response_lower or 'disab' in response_lower:
-        barrier_types['Accessibility Issues'] += 1
-    if 'child' in response_lower or 'family' in response_lower:
-        barrier_types['Childcare'] += 1
-    if 'safe' in response_lower:
-        barrier_types['Safety Concerns'] += 1
-
-# Plot barrier types
-barriers_df = pd.DataFrame(list(barrier_types.items()), columns=['Barrier', 'Count'])
-barriers_df = barriers_df.sort_values('Count', ascending=True)
-barriers_df.plot(kind='barh', x='Barrier', y='Count', ax=ax1, color='coral', legend=False)
-ax1.set_title('Participation Barriers by Category', fontsize=14, fontweight='bold')
-ax1.set_xlabel('Number of Mentions')
-
-# Geographic distribution of responses
-zip_counts = df['What zip code do you reside in?'].value_counts().head(15)
-zip_counts.plot(kind='bar', ax=ax2, color='teal', alpha=0.8)
-ax2.set_title('Geographic Distribution (Top 15 Zip Codes)', fontsize=14, fontweight='bold')
-ax2.set_xlabel('Zip Code')
-ax2.set_ylabel('Number of Responses')
-ax2.tick_params(axis='x', rotation=45)
-
-plt.tight_layout()
-plt.savefig('figures/02_barriers_analysis.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 3. PROGRAM AWARENESS & SATISFACTION
-print("Creating Program Analysis...")
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('Grant Program Awareness & Satisfaction Analysis', fontsize=20, fontweight='bold')
-
-# Program awareness (from our earlier analysis)
-programs = ['Heritage', 'Elevate', 'Nexus', 'Thrive', 'AIPP', 'CSAP', 'ALMF']
-awareness_counts = [1602, 869, 778, 727, 658, 19, 4]  # From our analysis
-
-ax1 = axes[0, 0]
-ax1.bar(programs, awareness_counts, color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2'])
-ax1.set_title('Program Awareness (Mentions in Survey)', fontsize=14, fontweight='bold')
-ax1.set_ylabel('Number of Mentions')
-ax1.tick_params(axis='x', rotation=45)
-
-# Add value labels
-for i, v in enumerate(awareness_counts):
-    ax1.text(i, v + 20, str(v), ha='center', va='bottom')
-
-# Application experience
-ax2 = axes[0, 1]
-if 'Have you ever applied for or received funding from any of these programs?' in df.columns:
-    applied = df['Have you ever applied for or received funding from any of these programs?'].value_counts()
-else:
-    # Create sample data if column not found
-    applied = pd.Series({'Yes': 350, 'No': 650, 'Not Sure': 144})
-applied.plot(kind='pie', ax=ax2, autopct='%1.1f%%', colors=['#ff9999', '#66b3ff', '#99ff99'])
-ax2.set_title('Grant Application Experience', fontsize=14, fontweight='bold')
-ax2.set_ylabel('')
-
-# Satisfaction levels
-ax3 = axes[1, 0]
-satisfaction = df['How would you rate your level of satisfaction with these programs overall? '].value_counts()
-satisfaction.plot(kind='bar', ax=ax3, color='darkblue', alpha=0.8)
-ax3.set_title('Overall Program Satisfaction', fontsize=14, fontweight='bold')
-ax3.set_xlabel('')
-ax3.set_ylabel('Number of Responses')
-ax3.tick_params(axis='x', rotation=45)
-
-# Values that should guide ACME
-ax4 = axes[1, 1]
-ax4.text(0.5, 0.5, 'Key Values Identified:\n\n• Equity & Inclusion\n• Community Support\n• Artist Development\n• Cultural Preservation\n• Innovation\n• Accessibility', 
-         ha='center', va='center', fontsize=14, bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgray"))
-ax4.set_title('Values to Guide ACME Mission', fontsize=14, fontweight='bold')
-ax4.axis('off')
-
-plt.tight_layout()
-plt.savefig('figures/03_program_analysis.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 4. KEY THEMES WORD CLOUD
-print("Creating Word Cloud...")
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
-
-# Improvements word cloud
-if 'What improvements would you like to see in these cultural funding programs?' in df.columns:
-    improvements_text = ' '.join(df['What improvements would you like to see in these cultural funding programs?'].dropna().astype(str))
-else:
-    improvements_text = 'funding artists grants support community application process communication transparency equity access diversity inclusion opportunities'
-wordcloud1 = WordCloud(width=800, height=400, background_color='white', colormap='viridis').generate(improvements_text)
-ax1.imshow(wordcloud1, interpolation='bilinear')
-ax1.set_title('Program Improvement Themes', fontsize=16, fontweight='bold')
-ax1.axis('off')
-
-# Additional feedback word cloud
-if 'Do you have any additional ideas, concerns, or feedback you would like to share to help ACME better serve the public? ' in df.columns:
-    feedback_text = ' '.join(df['Do you have any additional ideas, concerns, or feedback you would like to share to help ACME better serve the public? '].dropna().astype(str))
-else:
-    feedback_text = 'support artists community funding programs austin culture music arts creative opportunities access equity diversity inclusion heritage preservation'
-wordcloud2 = WordCloud(width=800, height=400, background_color='white', colormap='plasma').generate(feedback_text)
-ax2.imshow(wordcloud2, interpolation='bilinear')
-ax2.set_title('Additional Feedback Themes', fontsize=16, fontweight='bold')
-ax2.axis('off')
-
-plt.tight_layout()
-plt.savefig('figures/04_themes_wordcloud.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 5. EXECUTIVE SUMMARY INFOGRAPHIC
-print("Creating Executive Summary...")
-fig = plt.figure(figsize=(16, 20))
-fig.suptitle('City of Austin Cultural Grants: Executive Summary', fontsize=24, fontweight='bold', y=0.98)
-
-# Create grid for layout
-gs = fig.add_gridspec(5, 2, height_ratios=[1, 1, 1, 1, 1.5], hspace=0.3, wspace=0.2)
-
-# Key Metrics
-ax1 = fig.add_subplot(gs[0, :])
-ax1.text(0.5, 0.5, f'''KEY METRICS
+# Questions these figures read (survey_schema question keys)
+QUESTION_KEYS = ['equal_access', 'accessibility', 'participation', 'importance', 'barriers',
+                 'zip', 'satisfaction', 'completion_time', 'focus_group_interest']
+# Read when the export has them
+OPTIONAL_KEYS = ['applied', 'improvements', 'additional_feedback']
+
+
+def sentiment_dashboard(df, schema):
+    """1. Overall sentiment dashboard"""
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('City of Austin Cultural Grants: Community Sentiment Overview', fontsize=20, fontweight='bold')
+
+    # 1.1 Equal Access Perception
+    ax1 = axes[0, 0]
+    equal_access = df[schema['equal_access']].value_counts()
+    colors = ['#e74c3c' if 'No' in str(x) else '#f39c12' if 'Somewhat' in str(x) else '#27ae60' for x in equal_access.index]
+    equal_access.plot(kind='pie', ax=ax1, colors=colors, autopct='%1.1f%%', startangle=90)
+    ax1.set_title('Equal Access Perception', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('')
+
+    # 1.2 Program Accessibility
+    ax2 = axes[0, 1]
+    accessibility = df[schema['accessibility']].value_counts()
+    accessibility.plot(kind='bar', ax=ax2, color='steelblue', alpha=0.8)
+    ax2.set_title('Program Accessibility for Underrepresented Communities', fontsize=14, fontweight='bold')
+    ax2.set_xlabel('')
+    ax2.set_ylabel('Number of Responses')
+    ax2.tick_params(axis='x', rotation=45)
+
+    # 1.3 Participation Frequency
+    ax3 = axes[1, 0]
+    participation = df[schema['participation']].value_counts()
+    participation.plot(kind='bar', ax=ax3, color='darkgreen', alpha=0.8)
+    ax3.set_title('Event Participation Frequency', fontsize=14, fontweight='bold')
+    ax3.set_xlabel('')
+    ax3.set_ylabel('Number of Responses')
+    ax3.tick_params(axis='x', rotation=45)
+
+    # 1.4 Importance Rating
+    ax4 = axes[1, 1]
+    importance = df[schema['importance']].value_counts()
+    importance.plot(kind='bar', ax=ax4, color='purple', alpha=0.8)
+    ax4.set_title('Importance of Arts & Culture Support', fontsize=14, fontweight='bold')
+    ax4.set_xlabel('')
+    ax4.set_ylabel('Number of Responses')
+    ax4.tick_params(axis='x', rotation=45)
+
+    plt.tight_layout()
+    plt.savefig('figures/01_sentiment_dashboard.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def barriers_analysis(df, schema, barrier_types):
+    """2. Barrier categories and response geography"""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
+    fig.suptitle('Barriers to Arts & Culture Participation', fontsize=18, fontweight='bold')
+
+    # Plot barrier types
+    barriers_df = pd.DataFrame(list(barrier_types.items()), columns=['Barrier', 'Count'])
+    barriers_df = barriers_df.sort_values('Count', ascending=True)
+    barriers_df.plot(kind='barh', x='Barrier', y='Count', ax=ax1, color='coral', legend=False)
+    ax1.set_title('Participation Barriers by Category', fontsize=14, fontweight='bold')
+    ax1.set_xlabel('Number of Mentions')
+
+    # Geographic distribution of responses
+    zip_counts = df[schema['zip']].value_counts().head(15)
+    zip_counts.plot(kind='bar', ax=ax2, color='teal', alpha=0.8)
+    ax2.set_title('Geographic Distribution (Top 15 Zip Codes)', fontsize=14, fontweight='bold')
+    ax2.set_xlabel('Zip Code')
+    ax2.set_ylabel('Number of Responses')
+    ax2.tick_params(axis='x', rotation=45)
+
+    plt.tight_layout()
+    plt.savefig('figures/02_barriers_analysis.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def program_analysis(df, schema):
+    """3. Program awareness and satisfaction"""
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('Grant Program Awareness & Satisfaction Analysis', fontsize=20, fontweight='bold')
+
+    # Program awareness (from our earlier analysis)
+    programs = ['Heritage', 'Elevate', 'Nexus', 'Thrive', 'AIPP', 'CSAP', 'ALMF']
+    awareness_counts = [1602, 869, 778, 727, 658, 19, 4]  # From our analysis
+
+    ax1 = axes[0, 0]
+    ax1.bar(programs, awareness_counts, color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2'])
+    ax1.set_title('Program Awareness (Mentions in Survey)', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Number of Mentions')
+    ax1.tick_params(axis='x', rotation=45)
+
+    # Add value labels
+    for i, v in enumerate(awareness_counts):
+        ax1.text(i, v + 20, str(v), ha='center', va='bottom')
+
+    # Application experience
+    ax2 = axes[0, 1]
+    if 'applied' in schema:
+        applied = df[schema['applied']].value_counts()
+    else:
+        # Create sample data if column not found
+        applied = pd.Series({'Yes': 350, 'No': 650, 'Not Sure': 144})
+    applied.plot(kind='pie', ax=ax2, autopct='%1.1f%%', colors=['#ff9999', '#66b3ff', '#99ff99'])
+    ax2.set_title('Grant Application Experience', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('')
+
+    # Satisfaction levels
+    ax3 = axes[1, 0]
+    satisfaction = df[schema['satisfaction']].value_counts()
+    satisfaction.plot(kind='bar', ax=ax3, color='darkblue', alpha=0.8)
+    ax3.set_title('Overall Program Satisfaction', fontsize=14, fontweight='bold')
+    ax3.set_xlabel('')
+    ax3.set_ylabel('Number of Responses')
+    ax3.tick_params(axis='x', rotation=45)
+
+    # Values that should guide ACME
+    ax4 = axes[1, 1]
+    ax4.text(0.5, 0.5, 'Key Values Identified:\n\n• Equity & Inclusion\n• Community Support\n• Artist Development\n• Cultural Preservation\n• Innovation\n• Accessibility', 
+             ha='center', va='center', fontsize=14, bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgray"))
+    ax4.set_title('Values to Guide ACME Mission', fontsize=14, fontweight='bold')
+    ax4.axis('off')
+
+    plt.tight_layout()
+    plt.savefig('figures/03_program_analysis.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def themes_wordcloud(df, schema):
+    """4. Key themes word clouds"""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+
+    # Improvements word cloud
+    if 'improvements' in schema:
+        improvements_text = ' '.join(df[schema['improvements']].dropna().astype(str))
+    else:
+        improvements_text = 'funding artists grants support community application process communication transparency equity access diversity inclusion opportunities'
+    wordcloud1 = WordCloud(width=800, height=400, background_color='white', colormap='viridis').generate(improvements_text)
+    ax1.imshow(wordcloud1, interpolation='bilinear')
+    ax1.set_title('Program Improvement Themes', fontsize=16, fontweight='bold')
+    ax1.axis('off')
+
+    # Additional feedback word cloud
+    if 'additional_feedback' in schema:
+        feedback_text = ' '.join(df[schema['additional_feedback']].dropna().astype(str))
+    else:
+        feedback_text = 'support artists community funding programs austin culture music arts creative opportunities access equity diversity inclusion heritage preservation'
+    wordcloud2 = WordCloud(width=800, height=400, background_color='white', colormap='plasma').generate(feedback_text)
+    ax2.imshow(wordcloud2, interpolation='bilinear')
+    ax2.set_title('Additional Feedback Themes', fontsize=16, fontweight='bold')
+    ax2.axis('off')
+
+    plt.tight_layout()
+    plt.savefig('figures/04_themes_wordcloud.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def executive_summary(df, schema):
+    """5. Executive summary infographic"""
+    fig = plt.figure(figsize=(16, 20))
+    fig.suptitle('City of Austin Cultural Grants: Executive Summary', fontsize=24, fontweight='bold', y=0.98)
+
+    # Create grid for layout
+    gs = fig.add_gridspec(5, 2, height_ratios=[1, 1, 1, 1, 1.5], hspace=0.3, wspace=0.2)
+
+    # Key Metrics
+    focus_group_col = schema['focus_group_interest']
+    completion_col = schema['completion_time']
+    zip_col = schema['zip']
+    ax1 = fig.add_subplot(gs[0, :])
+    ax1.text(0.5, 0.5, f'''KEY METRICS
 Total Survey Responses: {len(df):,}
-Response Completion Rate: {(len(df[df['Completion time'].notna()]) / len(df) * 100):.1f}%
-Geographic Coverage: {df['What zip code do you reside in?'].nunique()} unique zip codes
-Community Engagement: {(df['Would you be interested in participating in focus groups or community discussions to help shape policies and initiatives supporting Austin\'s creative scene? '] == 'Yes').sum()} willing to participate in focus groups''',
-         ha='center', va='center', fontsize=14, bbox=dict(boxstyle="round,pad=1", facecolor="lightblue", alpha=0.7))
-ax1.axis('off')
-
-# Sentiment Analysis Summary
-ax2 = fig.add_subplot(gs[1, 0])
-ax2.text(0.5, 0.5, '''SENTIMENT ANALYSIS
+Response Completion Rate: {(len(df[df[completion_col].notna()]) / len(df) * 100):.1f}%
+Geographic Coverage: {df[zip_col].nunique()} unique zip codes
+Community Engagement: {(df[focus_group_col] == 'Yes').sum()} willing to participate in focus groups''',
+             ha='center', va='center', fontsize=14, bbox=dict(boxstyle="round,pad=1", facecolor="lightblue", alpha=0.7))
+    ax1.axis('off')
+
+    # Sentiment Analysis Summary
+    ax2 = fig.add_subplot(gs[1, 0])
+    ax2.text(0.5, 0.5, '''SENTIMENT ANALYSIS
 Overall Sentiment: POSITIVE (66.1%)
 • Program Improvements: 66.1% positive
 • Organization Support: 70.2% positive
@@ -245,12 +208,12 @@ Overall Sentiment: POSITIVE (66.1%)
   - Funding amounts
   - Application complexity
   - Communication gaps''',
-         ha='center', va='center', fontsize=12, bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen", alpha=0.7))
-ax2.axis('off')
+             ha='center', va='center', fontsize=12, bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen", alpha=0.7))
+    ax2.axis('off')
 
-# Equity Findings
-ax3 = fig.add_subplot(gs[1, 1])
-ax3.text(0.5, 0.5, '''EQUITY ANALYSIS
+    # Equity Findings
+    ax3 = fig.add_subplot(gs[1, 1])
+    ax3.text(0.5, 0.5, '''EQUITY ANALYSIS
 • 82% believe access is unequal or limited
 • Top barriers:
   1. Cost/Financial (68%)
@@ -258,33 +221,33 @@ ax3.text(0.5, 0.5, '''EQUITY ANALYSIS
   3. Awareness (42%)
 • Underrepresented communities face
   systemic barriers to participation''',
-         ha='center', va='center', fontsize=12, bbox=dict(boxstyle="round,pad=0.5", facecolor="lightyellow", alpha=0.7))
-ax3.axis('off')
-
-# Program Health
-ax4 = fig.add_subplot(gs[2, :])
-program_health = pd.DataFrame({
-    'Program': ['Heritage', 'Thrive', 'Nexus', 'Elevate', 'AIPP', 'CSAP', 'ALMF'],
-    'Awareness': [90, 85, 80, 85, 75, 20, 15],
-    'Satisfaction': [85, 88, 75, 70, 65, 50, 40],
-    'Sentiment': [95, 89, 70, 81, 75, 60, 50]
-})
-x = np.arange(len(program_health['Program']))
-width = 0.25
-ax4.bar(x - width, program_health['Awareness'], width, label='Awareness %', alpha=0.8)
-ax4.bar(x, program_health['Satisfaction'], width, label='Satisfaction %', alpha=0.8)
-ax4.bar(x + width, program_health['Sentiment'], width, label='Positive Sentiment %', alpha=0.8)
-ax4.set_xlabel('Program', fontsize=12)
-ax4.set_ylabel('Percentage', fontsize=12)
-ax4.set_title('Program Health Scorecard', fontsize=14, fontweight='bold')
-ax4.set_xticks(x)
-ax4.set_xticklabels(program_health['Program'])
-ax4.legend()
-ax4.grid(axis='y', alpha=0.3)
-
-# Top Recommendations
-ax5 = fig.add_subplot(gs[3, :])
-ax5.text(0.5, 0.5, '''TOP 5 STRATEGIC RECOMMENDATIONS
+             ha='center', va='center', fontsize=12, bbox=dict(boxstyle="round,pad=0.5", facecolor="lightyellow", alpha=0.7))
+    ax3.axis('off')
+
+    # Program Health
+    ax4 = fig.add_subplot(gs[2, :])
+    program_health = pd.DataFrame({
+        'Program': ['Heritage', 'Thrive', 'Nexus', 'Elevate', 'AIPP', 'CSAP', 'ALMF'],
+        'Awareness': [90, 85, 80, 85, 75, 20, 15],
+        'Satisfaction': [85, 88, 75, 70, 65, 50, 40],
+        'Sentiment': [95, 89, 70, 81, 75, 60, 50]
+    })
+    x = np.arange(len(program_health['Program']))
+    width = 0.25
+    ax4.bar(x - width, program_health['Awareness'], width, label='Awareness %', alpha=0.8)
+    ax4.bar(x, program_health['Satisfaction'], width, label='Satisfaction %', alpha=0.8)
+    ax4.bar(x + width, program_health['Sentiment'], width, label='Positive Sentiment %', alpha=0.8)
+    ax4.set_xlabel('Program', fontsize=12)
+    ax4.set_ylabel('Percentage', fontsize=12)
+    ax4.set_title('Program Health Scorecard', fontsize=14, fontweight='bold')
+    ax4.set_xticks(x)
+    ax4.set_xticklabels(program_health['Program'])
+    ax4.legend()
+    ax4.grid(axis='y', alpha=0.3)
+
+    # Top Recommendations
+    ax5 = fig.add_subplot(gs[3, :])
+    ax5.text(0.5, 0.5, '''TOP 5 STRATEGIC RECOMMENDATIONS
 
 1. IMMEDIATE: Simplify application processes and improve communication systems
    Impact: High | Effort: Medium | Timeline: 3-6 months
@@ -300,42 +263,90 @@ ax5.text(0.5, 0.5, '''TOP 5 STRATEGIC RECOMMENDATIONS
 
 5. ONGOING: Establish regular community feedback loops and advisory councils
    Impact: Medium | Effort: Low | Timeline: Immediate start''',
-         ha='center', va='center', fontsize=12, bbox=dict(boxstyle="round,pad=0.8", facecolor="lightcoral", alpha=0.7))
-ax5.axis('off')
-
-# Action Matrix
-ax6 = fig.add_subplot(gs[4, :])
-actions = {
-    'Quick Wins': ['Website redesign', 'Clear rubrics', 'FAQ updates', 'Email alerts'],
-    'Major Projects': ['Funding increase', 'New programs', 'Infrastructure', 'Staff expansion'],
-    'Strategic Initiatives': ['Equity framework', 'Community hubs', 'Partnership models', 'Impact metrics'],
-    'Operational': ['Process automation', 'Training programs', 'Data systems', 'Review cycles']
-}
-
-y_pos = 0.9
-colors = ['#2ecc71', '#3498db', '#9b59b6', '#e74c3c']
-for i, (category, items) in enumerate(actions.items()):
-    ax6.text(0.05, y_pos, category, fontsize=14, fontweight='bold', color=colors[i])
-    y_pos -= 0.08
-    for item in items:
-        ax6.text(0.1, y_pos, f'• {item}', fontsize=11)
-        y_pos -= 0.06
-    y_pos -= 0.04
-
-ax6.set_title('Implementation Roadmap', fontsize=16, fontweight='bold')
-ax6.set_xlim(0, 1)
-ax6.set_ylim(0, 1)
-ax6.axis('off')
-
-plt.tight_layout()
-plt.savefig('figures/05_executive_summary.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-print("\nAll visualizations generated successfully!")
-print("Files saved in 'figures/' directory:")
-print("  - 01_sentiment_dashboard.png")
-print("  - 02_barriers_analysis.png")
-print("  - 03_program_analysis.png")
-print("  - 04_themes_wordcloud.png")
-print("  - 05_executive_summary.png")
-print("\nReady for final report compilation...")
\ No newline at end of file
+             ha='center', va='center', fontsize=12, bbox=dict(boxstyle="round,pad=0.8", facecolor="lightcoral", alpha=0.7))
+    ax5.axis('off')
+
+    # Action Matrix
+    ax6 = fig.add_subplot(gs[4, :])
+    actions = {
+        'Quick Wins': ['Website redesign', 'Clear rubrics', 'FAQ updates', 'Email alerts'],
+        'Major Projects': ['Funding increase', 'New programs', 'Infrastructure', 'Staff expansion'],
+        'Strategic Initiatives': ['Equity framework', 'Community hubs', 'Partnership models', 'Impact metrics'],
+        'Operational': ['Process automation', 'Training programs', 'Data systems', 'Review cycles']
+    }
+
+    y_pos = 0.9
+    colors = ['#2ecc71', '#3498db', '#9b59b6', '#e74c3c']
+    for i, (category, items) in enumerate(actions.items()):
+        ax6.text(0.05, y_pos, category, fontsize=14, fontweight='bold', color=colors[i])
+        y_pos -= 0.08
+        for item in items:
+            ax6.text(0.1, y_pos, f'• {item}', fontsize=11)
+            y_pos -= 0.06
+        y_pos -= 0.04
+
+    ax6.set_title('Implementation Roadmap', fontsize=16, fontweight='bold')
+    ax6.set_xlim(0, 1)
+    ax6.set_ylim(0, 1)
+    ax6.axis('off')
+
+    plt.tight_layout()
+    plt.savefig('figures/05_executive_summary.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def _render_figure(task):
+    """Draw one figure in a map_shared worker from the memory-mapped dataset"""
+    from shared_dataset import shared_frame
+    draw, schema, extra = task
+    draw(shared_frame(list(dict.fromkeys(schema.values()))), schema, **extra)
+
+
+def run(dataset):
+    """Render the summary figures into figures/"""
+    print("="*80)
+    print("GENERATING COMPREHENSIVE VISUALIZATIONS & INSIGHTS")
+    print("="*80)
+    print()
+
+    dataset.schema.require(*QUESTION_KEYS)
+    schema = {k: dataset.schema[k] for k in QUESTION_KEYS + OPTIONAL_KEYS if k in dataset.schema}
+
+    # Create figures directory
+    if not os.path.exists('figures'):
+        os.makedirs('figures')
+
+    # Count respondents selecting any barrier option that mentions each
+    # category (keywords in survey_themes)
+    barrier_types = dataset.themes('barriers', 'barrier_types').counts().to_dict()
+
+    figures = [
+        ("Creating Overall Sentiment Dashboard...", sentiment_dashboard, {}),
+        ("Creating Barriers Analysis...", barriers_analysis, {'barrier_types': barrier_types}),
+        ("Creating Program Analysis...", program_analysis, {}),
+        ("Creating Word Cloud...", themes_wordcloud, {}),
+        ("Creating Executive Summary...", executive_summary, {}),
+    ]
+    for message, _, _ in figures:
+        print(message)
+    if HAS_ARROW and dataset.source_hash:
+        # One figure per worker; workers map the dataset instead of unpickling it
+        from shared_dataset import map_shared
+        map_shared(_render_figure, dataset.share(),
+                   [(draw, schema, extra) for _, draw, extra in figures])
+    else:
+        for _, draw, extra in figures:
+            draw(dataset.df, schema, **extra)
+
+    print("\nAll visualizations generated successfully!")
+    print("Files saved in 'figures/' directory:")
+    print("  - 01_sentiment_dashboard.png")
+    print("  - 02_barriers_analysis.png")
+    print("  - 03_program_analysis.png")
+    print("  - 04_themes_wordcloud.png")
+    print("  - 05_executive_summary.png")
+    print("\nReady for final report compilation...")
+
+
+if __name__ == '__main__':
+    run(SurveyDataset.load('ACME.xlsx'))
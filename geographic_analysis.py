@@ -10,16 +10,12 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import json
+from survey_dataset import SurveyDataset
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*80)
-print("GEOGRAPHIC ANALYSIS: MAPPING CULTURAL EQUITY")
-print("="*80)
-print()
-
-# Load the survey data
-df = pd.read_excel('ACME.xlsx')
+# Questions mapped by zip code (survey_schema question keys)
+QUESTION_KEYS = ['zip', 'awareness', 'improvements', 'additional_feedback']
 
 # Austin zip codes with approximate center coordinates
 austin_zip_coords = {
@@ -72,160 +68,212 @@ austin_zip_coords = {
     '78739': {'lat': 30.1589, 'lon': -97.8978, 'area': 'Driftwood'},
 }
 
-# Valid Austin zip codes
-austin_zips = list(austin_zip_coords.keys())
-
-# Add more ETJ zips without coords
-additional_zips = ['78652', '78653', '78660', '78664', '78669', '78613', '78617', 
-                   '78641', '78645', '78654', '78665', '78681', '78682']
-austin_zips.extend(additional_zips)
-
-# Clean zip codes
-zip_col = 'What zip code do you reside in?'
-df['clean_zip'] = df[zip_col].astype(str).str.strip()
-
-# Filter for Austin responses
-austin_df = df[df['clean_zip'].isin(austin_zips)].copy()
 
-# ANALYSIS 1: Response counts by zip code
-print("Analyzing response distribution by zip code...")
-zip_counts = austin_df['clean_zip'].value_counts()
-
-# ANALYSIS 2: Program awareness by zip code
-print("Analyzing program awareness by zip code...")
-# Use the actual column from the dataframe
-awareness_col = df.columns[21] if len(df.columns) > 21 else None
+def run(dataset):
+    """Per-zip response, awareness and sentiment maps"""
+    print("="*80)
+    print("GEOGRAPHIC ANALYSIS: MAPPING CULTURAL EQUITY")
+    print("="*80)
+    print()
+
+    # Work on the shared survey dataset
+    df = dataset.df
+    schema = dataset.schema.require(*QUESTION_KEYS)
+
+    # Filter for Austin responses (clean_zip is shared with the other stages)
+    austin_df = df[dataset.austin_mask()].copy()
+
+    # ANALYSIS 1: Response counts by zip code
+    print("Analyzing response distribution by zip code...")
+    zip_counts = austin_df['clean_zip'].value_counts()
+
+    # ANALYSIS 2: Program awareness by zip code
+    print("Analyzing program awareness by zip code...")
+    awareness_col = schema['awareness']
+
+    programs = ['Heritage', 'Thrive', 'Nexus', 'Elevate', 'AIPP', 'CSAP', 'ALMF']
+
+    # Calculate awareness rates by zip from the survey cube
+    zip_awareness = {}
+    if awareness_col and awareness_col in austin_df.columns:
+        cube = dataset.cube().slice(zip=list(zip_counts.index))
+        zip_mentions = cube.counts('program', 'zip')
+        zip_answered = cube.answered('awareness', 'zip')
+
+        for zip_code in zip_counts.index:
+            if zip_code in austin_zip_coords:
+                total_responses = int(zip_counts[zip_code])
+
+                if zip_answered[zip_code] > 0:
+                    program_awareness = {}
+                    for program in programs:
+                        aware_count = zip_mentions.loc[zip_code, program]
+                        program_awareness[program] = (aware_count / total_responses) * 100
+
+                    zip_awareness[zip_code] = {
+                        'total_responses': total_responses,
+                        'awareness_rates': program_awareness,
+                        'avg_awareness': np.mean(list(program_awareness.values()))
+                    }
+
+    # ANALYSIS 3: Sentiment by zip code
+    print("Analyzing sentiment by zip code...")
+
+    # Score every response once (TextBlob polarity, reused across runs via the
+    # sentiment store), then average per zip with one groupby
+    austin_mask = dataset.austin_mask().to_numpy()
+    polarity_frames = []
+    failed = 0
+    for key in ['improvements', 'additional_feedback']:
+        scores = dataset.sentiment(key, 'textblob').subset(austin_mask)
+        polarity = scores['polarity'].copy()
+        # The engine skips blank answers; TextBlob scores them 0.0 and this map
+        # has always counted them in the zip average
+        polarity[scores.answered & ~scores.scored & ~scores.failed] = 0.0
+        austin_df[f'{key}_polarity'] = polarity[austin_mask]
+        failed += scores.n_failed
+        polarity_frames.append(pd.DataFrame({'clean_zip': austin_df['clean_zip'],
+                                             'polarity': austin_df[f'{key}_polarity']}))
+    if failed:
+        print(f"  {failed} responses could not be scored and were left out")
+
+    polarity = pd.concat(polarity_frames).dropna(subset=['polarity'])
+    polarity = polarity[polarity['clean_zip'].isin(austin_zip_coords)]
+    mean_polarity = polarity.groupby('clean_zip', sort=False)['polarity'].mean()
+    # Convert to percentage (0-100 scale, where 50 is neutral), in response-count order
+    zip_sentiment = {zip_code: (mean_polarity[zip_code] + 1) * 50
+                     for zip_code in zip_counts.index if zip_code in mean_polarity.index}
+
+    # Create interactive visualizations
+    print("Creating interactive maps...")
+
+    # 1. Response Count Map
+    fig_responses = go.Figure()
+
+    # Add zip codes with responses
+    for zip_code, count in zip_counts.items():
+        if zip_code in austin_zip_coords:
+            coord = austin_zip_coords[zip_code]
+            # Size based on response count
+            size = min(count * 0.5, 50)  # Cap size at 50
 
-programs = ['Heritage', 'Thrive', 'Nexus', 'Elevate', 'AIPP', 'CSAP', 'ALMF']
+            fig_responses.add_trace(go.Scattermapbox(
+                lat=[coord['lat']],
+                lon=[coord['lon']],
+                mode='markers+text',
+                marker=dict(
+                    size=size,
+                    color=count,
+                    colorscale='Viridis',
+                    cmin=0,
+                    cmax=zip_counts.max(),
+                    colorbar=dict(title="Responses")
+                ),
+                text=f"{zip_code}<br>{count} responses<br>{coord['area']}",
+                textposition="top center",
+                hoverinfo='text',
+                name=zip_code
+            ))
 
-# Calculate awareness rates by zip
-zip_awareness = {}
-if awareness_col and awareness_col in austin_df.columns:
-    for zip_code in zip_counts.index:
-        if zip_code in austin_zip_coords:
-            zip_data = austin_df[austin_df['clean_zip'] == zip_code]
-            total_responses = len(zip_data)
-            
-            awareness_data = zip_data[awareness_col].dropna()
-            if len(awareness_data) > 0:
-                program_awareness = {}
-                for program in programs:
-                    aware_count = awareness_data.str.contains(program, case=False, na=False).sum()
-                    program_awareness[program] = (aware_count / total_responses) * 100
-                
-                zip_awareness[zip_code] = {
-                    'total_responses': total_responses,
-                    'awareness_rates': program_awareness,
-                    'avg_awareness': np.mean(list(program_awareness.values()))
-                }
-
-# ANALYSIS 3: Sentiment by zip code
-print("Analyzing sentiment by zip code...")
-sentiment_cols = [
-    'What improvements would you like to see in these cultural funding programs?',
-    'Do you have any additional ideas, concerns, or feedback you would like to share to help ACME better serve the public? '
-]
-
-from textblob import TextBlob
-
-zip_sentiment = {}
-for zip_code in zip_counts.index:
-    if zip_code in austin_zip_coords:
-        zip_data = austin_df[austin_df['clean_zip'] == zip_code]
-        
-        sentiments = []
-        for col in sentiment_cols:
-            if col in zip_data.columns:
-                responses = zip_data[col].dropna()
-                for response in responses:
-                    try:
-                        blob = TextBlob(str(response))
-                        sentiments.append(blob.sentiment.polarity)
-                    except:
-                        pass
-        
-        if sentiments:
-            avg_sentiment = np.mean(sentiments)
-            # Convert to percentage (0-100 scale, where 50 is neutral)
-            sentiment_score = (avg_sentiment + 1) * 50
-            zip_sentiment[zip_code] = sentiment_score
-
-# Create interactive visualizations
-print("Creating interactive maps...")
-
-# 1. Response Count Map
-fig_responses = go.Figure()
-
-# Add zip codes with responses
-for zip_code, count in zip_counts.items():
-    if zip_code in austin_zip_coords:
-        coord = austin_zip_coords[zip_code]
-        # Size based on response count
-        size = min(count * 0.5, 50)  # Cap size at 50
-        
-        fig_responses.add_trace(go.Scattermapbox(
-            lat=[coord['lat']],
-            lon=[coord['lon']],
-            mode='markers+text',
-            marker=dict(
-                size=size,
-                color=count,
-                colorscale='Viridis',
-                cmin=0,
-                cmax=zip_counts.max(),
-                colorbar=dict(title="Responses")
-            ),
-            text=f"{zip_code}<br>{count} responses<br>{coord['area']}",
-            textposition="top center",
-            hoverinfo='text',
-            name=zip_code
-        ))
-
-fig_responses.update_layout(
-    mapbox=dict(
-        style="carto-positron",
-        center=dict(lat=30.2672, lon=-97.7431),
-        zoom=10
-    ),
-    showlegend=False,
-    height=600,
-    width=None,  # Let it be responsive
-    autosize=True,
-    margin=dict(l=0, r=0, t=30, b=0),
-    title="Survey Responses by Austin Zip Code"
-)
-
-# 2. Program Awareness Heat Map
-fig_awareness = go.Figure()
-
-if zip_awareness:
-    for zip_code, data in zip_awareness.items():
+    fig_responses.update_layout(
+        mapbox=dict(
+            style="carto-positron",
+            center=dict(lat=30.2672, lon=-97.7431),
+            zoom=10
+        ),
+        showlegend=False,
+        height=600,
+        width=None,  # Let it be responsive
+        autosize=True,
+        margin=dict(l=0, r=0, t=30, b=0),
+        title="Survey Responses by Austin Zip Code"
+    )
+
+    # 2. Program Awareness Heat Map
+    fig_awareness = go.Figure()
+
+    if zip_awareness:
+        for zip_code, data in zip_awareness.items():
+            if zip_code in austin_zip_coords:
+                coord = austin_zip_coords[zip_code]
+                # Size based on response count
+                size = min(data['total_responses'] * 0.5, 50)
+
+                # Color based on awareness
+                awareness_pct = data['avg_awareness']
+
+                # Create hover text
+                hover_text = f"{zip_code}<br>{coord['area']}<br>"
+                hover_text += f"Responses: {data['total_responses']}<br>"
+                hover_text += f"Avg Awareness: {awareness_pct:.1f}%<br><br>"
+                for prog, rate in data['awareness_rates'].items():
+                    hover_text += f"{prog}: {rate:.1f}%<br>"
+
+                fig_awareness.add_trace(go.Scattermapbox(
+                    lat=[coord['lat']],
+                    lon=[coord['lon']],
+                    mode='markers+text',
+                    marker=dict(
+                        size=size,
+                        color=awareness_pct,
+                        colorscale='RdYlGn',
+                        cmin=0,
+                        cmax=100,
+                        colorbar=dict(title="Awareness %")
+                    ),
+                    text=f"{zip_code}",
+                    textposition="top center",
+                    hoverinfo='text',
+                    hovertext=hover_text,
+                    name=zip_code
+                ))
+
+    fig_awareness.update_layout(
+        mapbox=dict(
+            style="carto-positron",
+            center=dict(lat=30.2672, lon=-97.7431),
+            zoom=10
+        ),
+        showlegend=False,
+        height=600,
+        width=None,
+        autosize=True,
+        margin=dict(l=0, r=0, t=30, b=0),
+        title="Average Program Awareness by Zip Code"
+    )
+
+    # 3. Sentiment Map
+    fig_sentiment = go.Figure()
+
+    for zip_code, sentiment in zip_sentiment.items():
         if zip_code in austin_zip_coords:
             coord = austin_zip_coords[zip_code]
+            response_count = zip_counts.get(zip_code, 0)
             # Size based on response count
-            size = min(data['total_responses'] * 0.5, 50)
-            
-            # Color based on awareness
-            awareness_pct = data['avg_awareness']
-            
+            size = min(response_count * 0.5, 50)
+
             # Create hover text
             hover_text = f"{zip_code}<br>{coord['area']}<br>"
-            hover_text += f"Responses: {data['total_responses']}<br>"
-            hover_text += f"Avg Awareness: {awareness_pct:.1f}%<br><br>"
-            for prog, rate in data['awareness_rates'].items():
-                hover_text += f"{prog}: {rate:.1f}%<br>"
-            
-            fig_awareness.add_trace(go.Scattermapbox(
+            hover_text += f"Responses: {response_count}<br>"
+            hover_text += f"Sentiment: {sentiment:.1f}/100<br>"
+            if sentiment > 65:
+                hover_text += "Positive"
+            elif sentiment < 35:
+                hover_text += "Negative"
+            else:
+                hover_text += "Neutral"
+
+            fig_sentiment.add_trace(go.Scattermapbox(
                 lat=[coord['lat']],
                 lon=[coord['lon']],
                 mode='markers+text',
                 marker=dict(
                     size=size,
-                    color=awareness_pct,
+                    color=sentiment,
                     colorscale='RdYlGn',
                     cmin=0,
                     cmax=100,
-                    colorbar=dict(title="Awareness %")
+                    colorbar=dict(title="Sentiment")
                 ),
                 text=f"{zip_code}",
                 textposition="top center",
@@ -234,132 +282,83 @@ if zip_awareness:
                 name=zip_code
             ))
 
-fig_awareness.update_layout(
-    mapbox=dict(
-        style="carto-positron",
-        center=dict(lat=30.2672, lon=-97.7431),
-        zoom=10
-    ),
-    showlegend=False,
-    height=600,
-    width=None,
-    autosize=True,
-    margin=dict(l=0, r=0, t=30, b=0),
-    title="Average Program Awareness by Zip Code"
-)
-
-# 3. Sentiment Map
-fig_sentiment = go.Figure()
-
-for zip_code, sentiment in zip_sentiment.items():
-    if zip_code in austin_zip_coords:
-        coord = austin_zip_coords[zip_code]
-        response_count = zip_counts.get(zip_code, 0)
-        # Size based on response count
-        size = min(response_count * 0.5, 50)
-        
-        # Create hover text
-        hover_text = f"{zip_code}<br>{coord['area']}<br>"
-        hover_text += f"Responses: {response_count}<br>"
-        hover_text += f"Sentiment: {sentiment:.1f}/100<br>"
-        if sentiment > 65:
-            hover_text += "Positive"
-        elif sentiment < 35:
-            hover_text += "Negative"
-        else:
-            hover_text += "Neutral"
-        
-        fig_sentiment.add_trace(go.Scattermapbox(
-            lat=[coord['lat']],
-            lon=[coord['lon']],
-            mode='markers+text',
-            marker=dict(
-                size=size,
-                color=sentiment,
-                colorscale='RdYlGn',
-                cmin=0,
-                cmax=100,
-                colorbar=dict(title="Sentiment")
-            ),
-            text=f"{zip_code}",
-            textposition="top center",
-            hoverinfo='text',
-            hovertext=hover_text,
-            name=zip_code
-        ))
-
-fig_sentiment.update_layout(
-    mapbox=dict(
-        style="carto-positron",
-        center=dict(lat=30.2672, lon=-97.7431),
-        zoom=10
-    ),
-    showlegend=False,
-    height=600,
-    width=None,
-    autosize=True,
-    margin=dict(l=0, r=0, t=30, b=0),
-    title="Community Sentiment by Zip Code (0=Negative, 50=Neutral, 100=Positive)"
-)
-
-# 4. Combined Dashboard
-fig_dashboard = make_subplots(
-    rows=2, cols=2,
-    subplot_titles=('Response Distribution', 'Average Program Awareness', 
-                    'Community Sentiment', 'Equity Analysis'),
-    specs=[[{'type': 'mapbox'}, {'type': 'mapbox'}],
-           [{'type': 'mapbox'}, {'type': 'bar'}]]
-)
-
-# Save individual maps as HTML
-print("Saving interactive maps...")
-fig_responses.write_html('map_responses.html')
-fig_awareness.write_html('map_awareness.html')
-fig_sentiment.write_html('map_sentiment.html')
-
-# Export map data for integration into main report
-# Add config to ensure full width display
-config = {'responsive': True, 'displayModeBar': False}
-map_data = {
-    'response_map': fig_responses.to_html(include_plotlyjs='cdn', div_id="response-map", config=config),
-    'awareness_map': fig_awareness.to_html(include_plotlyjs='cdn', div_id="awareness-map", config=config),
-    'sentiment_map': fig_sentiment.to_html(include_plotlyjs='cdn', div_id="sentiment-map", config=config),
-    'zip_stats': {
-        'total_zips': len(zip_counts),
-        'highest_response_zip': zip_counts.index[0],
-        'highest_response_count': int(zip_counts.iloc[0]),
-        'lowest_awareness_zips': [z for z, d in zip_awareness.items() if d['avg_awareness'] < 30],
-        'highest_sentiment_zips': [z for z, s in zip_sentiment.items() if s > 70]
+    fig_sentiment.update_layout(
+        mapbox=dict(
+            style="carto-positron",
+            center=dict(lat=30.2672, lon=-97.7431),
+            zoom=10
+        ),
+        showlegend=False,
+        height=600,
+        width=None,
+        autosize=True,
+        margin=dict(l=0, r=0, t=30, b=0),
+        title="Community Sentiment by Zip Code (0=Negative, 50=Neutral, 100=Positive)"
+    )
+
+    # 4. Combined Dashboard
+    fig_dashboard = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Response Distribution', 'Average Program Awareness', 
+                        'Community Sentiment', 'Equity Analysis'),
+        specs=[[{'type': 'mapbox'}, {'type': 'mapbox'}],
+               [{'type': 'mapbox'}, {'type': 'bar'}]]
+    )
+
+    # Save individual maps as HTML
+    print("Saving interactive maps...")
+    fig_responses.write_html('map_responses.html')
+    fig_awareness.write_html('map_awareness.html')
+    fig_sentiment.write_html('map_sentiment.html')
+
+    # Export map data for integration into main report
+    # Add config to ensure full width display
+    config = {'responsive': True, 'displayModeBar': False}
+    map_data = {
+        'response_map': fig_responses.to_html(include_plotlyjs='cdn', div_id="response-map", config=config),
+        'awareness_map': fig_awareness.to_html(include_plotlyjs='cdn', div_id="awareness-map", config=config),
+        'sentiment_map': fig_sentiment.to_html(include_plotlyjs='cdn', div_id="sentiment-map", config=config),
+        'zip_stats': {
+            'total_zips': len(zip_counts),
+            'highest_response_zip': zip_counts.index[0],
+            'highest_response_count': int(zip_counts.iloc[0]),
+            'lowest_awareness_zips': [z for z, d in zip_awareness.items() if d['avg_awareness'] < 30],
+            'highest_sentiment_zips': [z for z, s in zip_sentiment.items() if s > 70],
+            'sentiment_failures': failed
+        }
     }
-}
 
-with open('map_data.json', 'w') as f:
-    json.dump(map_data, f)
-
-# Print key insights
-print("\n" + "="*50)
-print("GEOGRAPHIC INSIGHTS")
-print("="*50)
-
-print(f"\nResponse Distribution:")
-print(f"  - Highest response: {zip_counts.index[0]} ({zip_counts.iloc[0]} responses)")
-print(f"  - Coverage: {len(zip_counts)} of 50 Austin zip codes")
-
-if zip_awareness:
-    low_awareness = [(z, d['avg_awareness']) for z, d in zip_awareness.items() if d['avg_awareness'] < 40]
-    if low_awareness:
-        print(f"\nLow Program Awareness Areas:")
-        for zip_code, awareness in sorted(low_awareness, key=lambda x: x[1])[:5]:
-            print(f"  - {zip_code}: {awareness:.1f}% average awareness")
-
-print(f"\nSentiment Patterns:")
-positive_zips = [z for z, s in zip_sentiment.items() if s > 65]
-negative_zips = [z for z, s in zip_sentiment.items() if s < 35]
-print(f"  - Most positive areas: {len(positive_zips)} zip codes")
-print(f"  - Most negative areas: {len(negative_zips)} zip codes")
-
-print("\nMaps saved as HTML files:")
-print("  - map_responses.html")
-print("  - map_awareness.html") 
-print("  - map_sentiment.html")
-print("\nReady for integration into main report.")
\ No newline at end of file
+    with open('map_data.json', 'w') as f:
+        json.dump(map_data, f)
+
+    # Print key insights
+    print("\n" + "="*50)
+    print("GEOGRAPHIC INSIGHTS")
+    print("="*50)
+
+    print(f"\nResponse Distribution:")
+    print(f"  - Highest response: {zip_counts.index[0]} ({zip_counts.iloc[0]} responses)")
+    print(f"  - Coverage: {len(zip_counts)} of 50 Austin zip codes")
+
+    if zip_awareness:
+        low_awareness = [(z, d['avg_awareness']) for z, d in zip_awareness.items() if d['avg_awareness'] < 40]
+        if low_awareness:
+            print(f"\nLow Program Awareness Areas:")
+            for zip_code, awareness in sorted(low_awareness, key=lambda x: x[1])[:5]:
+                print(f"  - {zip_code}: {awareness:.1f}% average awareness")
+
+    print(f"\nSentiment Patterns:")
+    positive_zips = [z for z, s in zip_sentiment.items() if s > 65]
+    negative_zips = [z for z, s in zip_sentiment.items() if s < 35]
+    print(f"  - Most positive areas: {len(positive_zips)} zip codes")
+    print(f"  - Most negative areas: {len(negative_zips)} zip codes")
+
+    print("\nMaps saved as HTML files:")
+    print("  - map_responses.html")
+    print("  - map_awareness.html") 
+    print("  - map_sentiment.html")
+    print("\nReady for integration into main report.")
+
+
+if __name__ == '__main__':
+    run(SurveyDataset.load('ACME.xlsx', keys=QUESTION_KEYS))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Shared Memory-Mapped Survey Dataset
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Writes the cleaned survey dataset to an uncompressed Arrow IPC file that
+worker processes memory-map instead of receiving a pickled DataFrame. Every
+worker attaches to the same pages, so fanning work out over a process pool
+costs no serialization and per-worker memory stays flat.
+
+    path = dataset.share()
+    results = map_shared(score_rows, path, [(0, 500), (500, 1144)])
+
+where `score_rows` calls `shared_frame(...)` or `shared_table()` to read the
+columns it needs. generate_visualizations renders its figures this way, one
+per worker.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+
+from survey_loader import cache_dir_for
+
+# The table attached by the current worker process (see _attach)
+_SHARED_TABLE = None
+
+
+def shared_path_for(dataset):
+    """IPC file for a dataset, keyed by its source hash"""
+    return os.path.join(cache_dir_for(dataset.source), f"{dataset.source_hash}.arrow")
+
+
+def write_arrow_ipc(df, path):
+    """Write a DataFrame as an uncompressed Arrow IPC file
+
+    Compression would force every reader to decode into private memory, so
+    the file is left uncompressed to allow zero-copy memory mapping.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def attach(path):
+    """Memory-map an Arrow IPC file; the returned table references the mapping"""
+    source = pa.memory_map(path, 'r')
+    return pa.ipc.open_file(source).read_all()
+
+
+def _attach(path):
+    global _SHARED_TABLE
+    _SHARED_TABLE = attach(path)
+
+
+def shared_table():
+    """The memory-mapped table inside a worker started by map_shared"""
+    if _SHARED_TABLE is None:
+        raise RuntimeError("No shared dataset attached; call this from a map_shared worker")
+    return _SHARED_TABLE
+
+
+def shared_frame(columns=None, start=0, stop=None):
+    """Columns and a row range of the shared table as a pandas DataFrame
+
+    Arrow-backed dtypes keep the pandas columns pointing at the mapped
+    buffers rather than copying them into Python objects.
+    """
+    table = shared_table()
+    if columns is not None:
+        table = table.select(columns)
+    if start or stop is not None:
+        stop = table.num_rows if stop is None else stop
+        table = table.slice(start, stop - start)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def row_ranges(n_rows, n_chunks):
+    """Split `n_rows` into `n_chunks` contiguous (start, stop) ranges"""
+    n_chunks = max(1, min(n_chunks, n_rows))
+    bounds = [round(i * n_rows / n_chunks) for i in range(n_chunks + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def map_shared(func, path, tasks, processes=None):
+    """Run func(task) for each task in a pool attached to the shared file
+
+    Only the file path and the (small) task descriptions cross process
+    boundaries; `func` must be a module-level function so it can be pickled.
+    With a single process the tasks run here, against the same mapping.
+    """
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    if processes <= 1:
+        _attach(path)
+        return [func(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=processes, initializer=_attach,
+                             initargs=(path,)) as executor:
+        return list(executor.map(func, tasks))
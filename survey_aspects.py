@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Aspect-Level Sentiment
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Splits the free-text answers into sentences, scores every sentence in one
+batch (see survey_sentiment, so repeated sentences and earlier runs cost
+nothing) and tags each sentence with the programs and barrier themes it
+mentions. A sentiment then belongs to the aspect its sentence is about: an
+answer praising Thrive and criticizing Nexus adds a positive sentence to
+Thrive and a negative one to Nexus, instead of one whole-answer score to
+both:
+
+    aspects = dataset.aspects()
+    aspects.matrix('programs')                   # program x sentiment table
+    aspects.matrix('access_barriers', questions=['access_barriers'])
+    aspects.sentences_about('Thrive')            # the scored sentences
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from survey_sentiment import NEGATIVE_THRESHOLD, POSITIVE_THRESHOLD
+from survey_themes import matcher_for
+
+# Sentence ends: terminal punctuation followed by space, or a line break
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|\s*[\r\n]+\s*')
+
+# Theme sets tagged on every sentence (see survey_themes)
+ASPECT_SETS = ['programs', 'access_barriers']
+
+# Open-ended questions split into sentences by default (survey_schema keys)
+ASPECT_QUESTIONS = ['improvements', 'access_barriers', 'additional_feedback',
+                    'more_opportunities', 'programs_services', 'support_organizations']
+
+
+def split_sentences(text):
+    """Non-empty sentences of one answer"""
+    return [s.strip() for s in SENTENCE_BREAK.split(str(text)) if s and s.strip()]
+
+
+class AspectSentiment:
+    """Scored sentences of several text questions, tagged with aspects"""
+
+    def __init__(self, sentences, tags):
+        # One row per sentence: respondent row, question key, text, compound score
+        self.sentences = sentences
+        # Theme set -> MultiSelect over the sentences
+        self.tags = tags
+
+    @classmethod
+    def build(cls, dataset, engine, keys=ASPECT_QUESTIONS, aspect_sets=ASPECT_SETS):
+        """Split, score and tag the answers to `keys` in one pass
+
+        `engine` is a survey_sentiment engine; questions missing from the
+        export are skipped.
+        """
+        keys = [k for k in keys if k in dataset.schema]
+        frames = []
+        for key in keys:
+            answers = dataset.df[dataset.schema[key]]
+            answered = answers.notna().to_numpy()
+            split = pd.Series([split_sentences(text) for text in answers[answered]],
+                              index=np.flatnonzero(answered), dtype=object).explode().dropna()
+            frames.append(pd.DataFrame({'row': split.index.to_numpy(dtype=np.int64),
+                                        'question': key, 'sentence': split.to_numpy(dtype=object)}))
+        sentences = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            {'row': np.zeros(0, dtype=np.int64), 'question': [], 'sentence': []})
+        text = pd.Series(sentences['sentence'].to_numpy(dtype=object), dtype=object)
+
+        # Every sentence of every question scored in one batch
+        sentences['compound'] = engine.score(text).headline
+        tags = {name: matcher_for(name).encode(text) for name in aspect_sets}
+        return cls(sentences, tags)
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def _sentence_mask(self, questions=None):
+        if questions is None:
+            return np.ones(len(self), dtype=bool)
+        return self.sentences['question'].isin(questions).to_numpy()
+
+    def matrix(self, aspect_set='programs', questions=None):
+        """Aspect x sentiment table over the tagged sentences
+
+        Columns: sentences, respondents, positive, negative, neutral (sentence
+        counts) and mean_compound.
+        """
+        tags = self.tags[aspect_set].matrix.tocsc()
+        keep = self._sentence_mask(questions) & ~np.isnan(self.sentences['compound'].to_numpy())
+        compound = self.sentences['compound'].to_numpy()
+        rows = self.sentences['row'].to_numpy()
+        # Sentences x sentiment class indicator, so every count is one sparse product
+        classes = np.column_stack([compound >= POSITIVE_THRESHOLD,
+                                   compound <= NEGATIVE_THRESHOLD,
+                                   (compound > NEGATIVE_THRESHOLD) & (compound < POSITIVE_THRESHOLD),
+                                   np.ones(len(self), dtype=bool)]) & keep[:, None]
+        counts = tags.T.astype(np.int64) @ classes.astype(np.int64)
+        sums = tags.T.astype(np.float64) @ np.where(keep, compound, 0.0)
+        respondents = []
+        for j in range(tags.shape[1]):
+            tagged = tags.indices[tags.indptr[j]:tags.indptr[j + 1]]
+            respondents.append(len(np.unique(rows[tagged[keep[tagged]]])))
+        table = pd.DataFrame({
+            'sentences': counts[:, 3],
+            'respondents': respondents,
+            'positive': counts[:, 0],
+            'negative': counts[:, 1],
+            'neutral': counts[:, 2],
+        }, index=pd.Index(self.tags[aspect_set].options, name=aspect_set))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            table['mean_compound'] = sums / counts[:, 3]
+        return table
+
+    def sentences_about(self, aspect, aspect_set='programs', questions=None):
+        """The scored sentences tagged with one aspect"""
+        column = self.tags[aspect_set].options.index(aspect)
+        tagged = self.tags[aspect_set].matrix[:, column].toarray().ravel()
+        return self.sentences[tagged & self._sentence_mask(questions)]
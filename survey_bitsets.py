@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Bitset Co-Selection Engine
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Stores each option of a multi-select question as a packed bitset over
+respondents (64 respondents per machine word). Intersections, unions and
+exclusions are word-wise AND/OR/ANDNOT followed by a popcount, so full
+pair and triple co-selection tables and UpSet-style intersection counts
+take milliseconds even for millions of respondents:
+
+    barriers = dataset.bitsets('barriers')
+    barriers.count('cost', 'transport')          # chose both
+    awareness.query(all_of=['Heritage'], none_of=['Thrive'])
+    barriers.pair_table(top=6)
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(words):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+else:
+    # numpy < 2.0: count bits a byte at a time through a lookup table
+    _BYTE_COUNTS = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        as_bytes = words.view(np.uint8).reshape(words.shape[:-1] + (-1,))
+        return _BYTE_COUNTS[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def pack(masks):
+    """Boolean (options x respondents) array packed into uint64 words"""
+    masks = np.atleast_2d(np.asarray(masks, dtype=bool))
+    n_words = -(-masks.shape[1] // 64)
+    padded = np.zeros((masks.shape[0], n_words * 64), dtype=bool)
+    padded[:, :masks.shape[1]] = masks
+    return np.packbits(padded, axis=1, bitorder='little').view(np.uint64)
+
+
+def unpack(words, n_respondents):
+    """Boolean respondent mask for one packed bitset"""
+    bits = np.unpackbits(np.asarray(words).view(np.uint8), bitorder='little')
+    return bits[:n_respondents].astype(bool)
+
+
+class OptionBitsets:
+    """One packed bitset per option of a multi-select question"""
+
+    def __init__(self, bits, options, n_respondents, resolve=None):
+        self.bits = bits
+        self.options = list(options)
+        self.option_index = {option: i for i, option in enumerate(self.options)}
+        self.n_respondents = n_respondents
+        self._resolve = resolve
+        self._empty = np.zeros(bits.shape[1], dtype=np.uint64)
+
+    @classmethod
+    def from_multiselect(cls, selections):
+        """Pack the columns of a survey_multiselect.MultiSelect"""
+        matrix = selections.matrix.tocsc()
+        n = matrix.shape[0]
+        masks = np.zeros((len(selections.options), n), dtype=bool)
+        for i in range(len(selections.options)):
+            masks[i, matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]] = True
+        return cls(pack(masks), selections.options, n, resolve=selections.matching)
+
+    def __len__(self):
+        return len(self.options)
+
+    def bitset(self, name):
+        """Bits for an exact option, or the union of options matching a pattern
+
+        Patterns behave like MultiSelect.mentions: 'Heritage' covers
+        'Heritage Preservation Grant'.
+        """
+        if name in self.option_index:
+            return self.bits[self.option_index[name]]
+        matched = self._resolve(name) if self._resolve else []
+        if not matched:
+            raise KeyError(f"No option matches {name!r}")
+        return np.bitwise_or.reduce(self.bits[[self.option_index[m] for m in matched]], axis=0)
+
+    def _all(self, names):
+        bits = ~self._empty
+        for name in names:
+            bits = bits & self.bitset(name)
+        return bits
+
+    def _any(self, names):
+        bits = self._empty.copy()
+        for name in names:
+            bits = bits | self.bitset(name)
+        return bits
+
+    def query_bits(self, all_of=(), any_of=(), none_of=()):
+        """Bitset of respondents selecting all of, any of and none of the options"""
+        bits = self._all(all_of)
+        if any_of:
+            bits = bits & self._any(any_of)
+        if none_of:
+            bits = bits & ~self._any(none_of)
+        # Clear the padding bits past the last respondent (set by the NOTs)
+        tail = self.n_respondents % 64
+        if tail:
+            bits = bits.copy()
+            bits[-1] &= np.uint64((1 << tail) - 1)
+        return bits
+
+    def query(self, all_of=(), any_of=(), none_of=()):
+        """Number of respondents matching a combination of options"""
+        return int(_popcount(self.query_bits(all_of, any_of, none_of)))
+
+    def count(self, *names):
+        """Respondents who selected every one of `names`"""
+        return self.query(all_of=names)
+
+    def count_any(self, *names):
+        """Respondents who selected at least one of `names`"""
+        return self.query(any_of=names)
+
+    def mask(self, all_of=(), any_of=(), none_of=()):
+        """Boolean respondent mask for a query, e.g. to filter the DataFrame"""
+        return unpack(self.query_bits(all_of, any_of, none_of), self.n_respondents)
+
+    def counts(self):
+        """Respondents selecting each option"""
+        return pd.Series(_popcount(self.bits), index=self.options)
+
+    def _top(self, top):
+        counts = self.counts().sort_values(ascending=False, kind='stable')
+        return list(counts.index[:top]) if top else list(self.options)
+
+    def pair_table(self, top=None):
+        """Option x option co-selection counts (diagonal: option totals)"""
+        options = self._top(top)
+        bits = self.bits[[self.option_index[o] for o in options]]
+        # One row at a time keeps the temporary at (options x words)
+        table = np.array([_popcount(bits[i] & bits) for i in range(len(options))],
+                         dtype=np.int64).reshape(len(options), len(options))
+        return pd.DataFrame(table, index=options, columns=options)
+
+    def pairs(self, top=None, min_count=1):
+        """Long-form pair counts, most frequent first"""
+        table = self.pair_table(top)
+        i, j = np.triu_indices(len(table), k=1)
+        pairs = pd.DataFrame({
+            'option_a': table.index[i], 'option_b': table.columns[j],
+            'count': table.to_numpy()[i, j],
+        })
+        pairs = pairs[pairs['count'] >= min_count]
+        return pairs.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
+
+    def triples(self, top=15, min_count=1):
+        """Long-form triple co-selection counts among the `top` options"""
+        options = self._top(top)
+        bits = self.bits[[self.option_index[o] for o in options]]
+        combos = np.array(list(combinations(range(len(options)), 3)), dtype=np.intp).reshape(-1, 3)
+        counts = np.zeros(len(combos), dtype=np.int64)
+        # Grouped by the first two options: AND the pair once, then all thirds
+        starts = np.flatnonzero(np.r_[True, np.any(combos[1:, :2] != combos[:-1, :2], axis=1)])
+        for start, stop in zip(starts, np.r_[starts[1:], len(combos)]):
+            a, b = combos[start, :2]
+            counts[start:stop] = _popcount((bits[a] & bits[b]) & bits[combos[start:stop, 2]])
+        names = np.array(options, dtype=object)
+        triples = pd.DataFrame({
+            'option_a': names[combos[:, 0]], 'option_b': names[combos[:, 1]],
+            'option_c': names[combos[:, 2]], 'count': counts,
+        })
+        triples = triples[triples['count'] >= min_count]
+        return triples.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
+
+    def upset(self, top=6, min_count=1):
+        """Exclusive intersection counts, as plotted by UpSet
+
+        Each respondent is counted once, under the exact combination of the
+        `top` options they selected (other options are ignored). Returns a
+        DataFrame with one boolean column per option plus 'count'.
+        """
+        options = self._top(top)
+        if len(options) > 62:
+            raise ValueError("upset() supports at most 62 options; pass a smaller `top`")
+        rows = np.unpackbits(self.bits[[self.option_index[o] for o in options]].view(np.uint8),
+                             axis=1, bitorder='little')[:, :self.n_respondents]
+        # One small integer per respondent identifying their combination
+        signature = (rows.T.astype(np.int64) << np.arange(len(options))).sum(axis=1)
+        codes, counts = np.unique(signature, return_counts=True)
+        membership = ((codes[:, None] >> np.arange(len(options))) & 1).astype(bool)
+        upset = pd.DataFrame(membership, columns=options)
+        upset['count'] = counts
+        upset = upset[(upset['count'] >= min_count) & membership.any(axis=1)]
+        return upset.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
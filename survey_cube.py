@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Survey Aggregation Cube
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Aggregates the survey in one vectorized pass over the key dimensions (zip
+code, satisfaction, accessibility, participation frequency). Each cell holds
+the number of respondents plus, for every option of the role, awareness and
+barrier questions, how many of them selected it. Reports slice and roll up
+the cells instead of re-running group-bys over the responses:
+
+    cube = dataset.cube()
+    cube.respondents('zip')                      # responses per zip
+    cube.counts('program', 'zip')                # program awareness per zip
+    cube.slice(zip=AUSTIN_ZIPS).counts('barriers')
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Single-answer dimensions (survey_schema keys; 'zip' uses the cleaned zip)
+DIMENSIONS = ['zip', 'satisfaction', 'accessibility', 'participation']
+
+# Multi-select questions whose options become measures
+MULTISELECT_MEASURES = ['role', 'awareness', 'barriers']
+
+# Measure of the programs each respondent is aware of (see survey_programs)
+PROGRAM_MEASURE = ('program', 'awareness')
+
+# Measures counting respondents who selected any option matching a pattern
+# (see MultiSelect.mentions): measure -> (question, {label: pattern})
+PATTERN_MEASURES = {
+    'barrier_type': ('barriers', {
+        'cost': 'cost|ticket|admission',
+        'transport': 'transport|parking',
+        'awareness': 'aware|know|information',
+    }),
+}
+
+RESPONDENTS = ('respondents', 'all')
+
+
+def _dimension_values(dataset, key):
+    if key == 'zip':
+        # Cleaned zip codes, with unanswered rows left missing rather than 'nan'
+        return dataset.clean_zip().where(dataset.df[dataset.schema['zip']].notna())
+    return dataset.df[dataset.schema[key]].astype(object)
+
+
+class SurveyCube:
+    """Respondent and option counts per combination of dimension values"""
+
+    def __init__(self, cells):
+        # index: one level per dimension; columns: (measure, option)
+        self.cells = cells
+
+    @classmethod
+    def build(cls, dataset, dimensions=DIMENSIONS, multiselect=MULTISELECT_MEASURES,
+              patterns=PATTERN_MEASURES):
+        """One sparse product of a cell indicator and the selection matrices"""
+        dimensions = [d for d in dimensions if d in dataset.schema]
+        frame = pd.DataFrame({d: _dimension_values(dataset, d) for d in dimensions})
+        grouped = frame.groupby(dimensions, dropna=False, sort=True)
+        cell = grouped.ngroup().to_numpy()
+        index = grouped.size().index
+        n = len(frame)
+
+        blocks = [sparse.csr_matrix(np.ones((n, 1), dtype=np.int64))]
+        columns = [RESPONDENTS]
+        answered = []
+        for key in multiselect:
+            if key not in dataset.schema:
+                continue
+            selections = dataset.multiselect(key)
+            blocks.append(selections.matrix)
+            columns.extend((key, option) for option in selections.options)
+            answered.append((key, selections.answered))
+        measure, key = PROGRAM_MEASURE
+        if key in dataset.schema:
+            programs = dataset.programs().question(key)
+            blocks.append(programs.matrix)
+            columns.extend((measure, program) for program in programs.options)
+        for measure, (key, labels) in patterns.items():
+            if key not in dataset.schema:
+                continue
+            selections = dataset.multiselect(key)
+            masks = np.column_stack([selections.mentions(p).to_numpy() for p in labels.values()])
+            blocks.append(sparse.csr_matrix(masks))
+            columns.extend((measure, label) for label in labels)
+        if answered:
+            blocks.append(sparse.csr_matrix(np.column_stack([a for _, a in answered])))
+            columns.extend(('answered', key) for key, _ in answered)
+
+        measures = sparse.hstack(blocks, format='csr', dtype=np.int64)
+        indicator = sparse.csr_matrix(
+            (np.ones(n, dtype=np.int64), (cell, np.arange(n))), shape=(len(index), n))
+        values = (indicator @ measures).toarray()
+        return cls(pd.DataFrame(values, index=index,
+                                columns=pd.MultiIndex.from_tuples(columns, names=['measure', 'option'])))
+
+    @property
+    def dimensions(self):
+        return list(self.cells.index.names)
+
+    def measures(self):
+        return list(dict.fromkeys(self.cells.columns.get_level_values('measure')))
+
+    def values(self, dimension):
+        """Distinct answered values of one dimension"""
+        return self.cells.index.get_level_values(dimension).dropna().unique().tolist()
+
+    def slice(self, **filters):
+        """Sub-cube of the cells matching dimension=value (or a list of values)"""
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dimension, value in filters.items():
+            level = self.cells.index.get_level_values(dimension)
+            if isinstance(value, (list, tuple, set, pd.Index, np.ndarray)):
+                mask &= level.isin(list(value))
+            else:
+                mask &= level == value
+        return SurveyCube(self.cells[mask])
+
+    def rollup(self, *dimensions):
+        """Cells summed over every dimension not listed (a Series if none are)"""
+        if not dimensions:
+            return self.cells.sum()
+        return self.cells.groupby(level=list(dimensions), dropna=False, sort=False).sum()
+
+    def respondents(self, *dimensions):
+        """Respondent count, per combination of `dimensions` when given"""
+        totals = self.rollup(*dimensions)
+        return int(totals[RESPONDENTS]) if not dimensions else totals[RESPONDENTS]
+
+    def answered(self, question, *dimensions):
+        """Respondents who answered a multi-select question"""
+        totals = self.rollup(*dimensions)
+        return int(totals[('answered', question)]) if not dimensions else totals[('answered', question)]
+
+    def counts(self, measure, *dimensions):
+        """Option counts for one measure, with one row per group when grouped"""
+        return self.rollup(*dimensions)[measure]
+
+    def rates(self, measure, *dimensions):
+        """Option counts as a percentage of the respondents in each group"""
+        counts = self.counts(measure, *dimensions)
+        respondents = self.respondents(*dimensions)
+        if not dimensions:
+            return counts / respondents * 100
+        return counts.div(respondents, axis=0) * 100
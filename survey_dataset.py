@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Shared Survey Dataset
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+One in-memory copy of the survey responses, handed to every analysis stage
+so derived columns (such as the cleaned zip code) are computed once.
+"""
+
+import hashlib
+import os
+
+import pandas as pd
+
+from survey_dtypes import compact_dtypes
+from survey_loader import file_sha256, load_survey
+from survey_schema import SurveySchema
+
+# Valid Austin zip codes (including some ETJ areas)
+AUSTIN_ZIPS = [
+    # Central Austin
+    '78701', '78702', '78703', '78704', '78705',
+    # North Central
+    '78751', '78752', '78756', '78757', '78758', '78759',
+    # East Austin
+    '78721', '78722', '78723', '78724', '78725',
+    # South Austin
+    '78741', '78742', '78744', '78745', '78746', '78747', '78748', '78749',
+    # North Austin
+    '78727', '78728', '78729', '78750', '78753', '78754',
+    # Northwest Austin
+    '78726', '78730', '78731', '78732', '78733', '78734', '78735', '78736', '78737', '78738', '78739',
+    # West/Southwest Austin (including some ETJ)
+    '78652', '78653', '78660', '78664', '78669',
+    # Other nearby areas often included
+    '78613', '78617', '78641', '78645', '78654', '78665', '78681', '78682'
+]
+
+
+class SurveyDataset:
+    """Survey responses plus the derived columns shared between stages"""
+
+    def __init__(self, df, source='ACME.xlsx', source_hash=None, compact=True):
+        self.source = source
+        self.source_hash = source_hash
+        # Stages count near-duplicate text answers once when set (see answer_mask)
+        self.collapse_duplicates = False
+        # Analyzer behind sentiment() and aspects() by default (see survey_sentiment.engine_for)
+        self.sentiment_analyzer = 'vader'
+        # Columns as exported; stages append derived columns to self.df
+        self.source_columns = list(df.columns)
+        # Question keys resolved once against the exported headers
+        self.schema = SurveySchema.resolve(self.source_columns)
+        # Categoricals for choice answers, Arrow strings for free text
+        self.dtype_report = None
+        if compact:
+            df, self.dtype_report = compact_dtypes(df, self.schema)
+        self.df = df
+        self._shared_columns = None
+        self._multiselect = {}
+        self._bitsets = {}
+        self._themes = {}
+        self._text_index = None
+        self._programs = None
+        self._token_store = None
+        self._duplicates = {}
+        self._sentiment = {}
+        self._sentiment_store = None
+        self._aspects = None
+        self._cube = None
+
+    @classmethod
+    def load(cls, path='ACME.xlsx', columns=None, keys=None, compact=True):
+        """Load the survey once through the cached loader
+
+        `keys` names survey_schema questions to read (see load_survey).
+        """
+        return cls(load_survey(path, columns=columns, keys=keys), source=path,
+                   source_hash=file_sha256(path), compact=compact)
+
+    @classmethod
+    def load_waves(cls, base_path='ACME.xlsx', columns=None, keys=None, compact=True):
+        """Load the base survey plus every appended wave (see survey_waves)"""
+        from survey_waves import WaveStore
+        store = WaveStore(base_path)
+        df = store.load(columns=columns, keys=keys)
+        wave_hashes = '+'.join(w['content_hash'] for w in store.manifest['waves'])
+        return cls(df, source=base_path,
+                   source_hash=hashlib.sha256(wave_hashes.encode()).hexdigest(), compact=compact)
+
+    def __len__(self):
+        return len(self.df)
+
+    def memory_saved(self):
+        """Bytes saved by the compact dtypes (0 when loaded uncompacted)"""
+        if self.dtype_report is None:
+            return 0
+        return int(self.dtype_report['bytes_saved'].sum())
+
+    @property
+    def responses(self):
+        """The survey columns as exported, without derived columns"""
+        return self.df[self.source_columns]
+
+    def clean_zip(self):
+        """Zip code answers as stripped strings, stored as df['clean_zip']"""
+        if 'clean_zip' not in self.df.columns:
+            self.df['clean_zip'] = self.df[self.schema['zip']].astype(str).str.strip()
+        return self.df['clean_zip']
+
+    def austin_mask(self):
+        """Rows whose zip code is a valid Austin zip code"""
+        return self.clean_zip().isin(AUSTIN_ZIPS)
+
+    def multiselect(self, key):
+        """Parsed multi-select question (see survey_multiselect), built once"""
+        if key not in self._multiselect:
+            if self.schema.kind(key) != 'multi':
+                raise ValueError(f"Question {key!r} is not a select-all-that-apply question")
+            from survey_multiselect import MultiSelect
+            self._multiselect[key] = MultiSelect.from_series(self.df[self.schema[key]])
+        return self._multiselect[key]
+
+    def themes(self, question, theme_set):
+        """Response x theme matrix for a question (see survey_themes), built once
+
+        `question` is a survey_schema key or a column header. Multi-select
+        questions are tagged through their option texts.
+        """
+        cache_key = (question, theme_set)
+        if cache_key not in self._themes:
+            from survey_themes import matcher_for
+            matcher = matcher_for(theme_set)
+            kind = self.schema.kind(question) if question in self.schema else None
+            if kind == 'multi':
+                self._themes[cache_key] = matcher.encode_options(self.multiselect(question))
+            elif kind == 'text' and matcher.single_token:
+                # Read themes off the cached token ids instead of the text
+                self._themes[cache_key] = matcher.encode_tokens(self.tokens(question),
+                                                                index=self.df.index)
+            else:
+                column = self.schema[question] if question in self.schema else question
+                self._themes[cache_key] = matcher.encode(self.df[column])
+        return self._themes[cache_key]
+
+    def tokens(self, key):
+        """Token ids of a text question (see survey_tokens), tokenized once
+
+        Tokenized questions are saved next to the survey cache and reused
+        until the survey changes.
+        """
+        if self._token_store is None:
+            from survey_tokens import TokenStore
+            self._token_store = TokenStore.for_dataset(self)
+        return self._token_store.get(key, self.df[self.schema[key]])
+
+    def near_duplicates(self, key):
+        """Near-duplicate clusters among a text question's answers (see survey_duplicates)"""
+        if key not in self._duplicates:
+            from survey_duplicates import find_near_duplicates
+            self._duplicates[key] = find_near_duplicates(self.tokens(key), self.df[self.schema[key]])
+        return self._duplicates[key]
+
+    def answer_mask(self, key):
+        """Rows whose answer to a text question is counted
+
+        Every row, unless collapse_duplicates is set: then later copies of a
+        near-duplicate answer are left out and only the first one counts.
+        """
+        if not self.collapse_duplicates:
+            return pd.Series(True, index=self.df.index)
+        return ~self.near_duplicates(key).duplicate
+
+    def sentiment(self, key, analyzer=None):
+        """Sentiment scores of a text question's answers (see survey_sentiment), scored once
+
+        `analyzer` is 'vader', 'vader-lexicon' or 'textblob' (default:
+        sentiment_analyzer). Scores persist next to the survey cache and are
+        reused by later runs.
+        """
+        cache_key = (key, analyzer or self.sentiment_analyzer)
+        if cache_key not in self._sentiment:
+            from survey_sentiment import engine_for
+            engine = engine_for(cache_key[1], store=self.sentiment_store())
+            self._sentiment[cache_key] = engine.score(self.df[self.schema[key]])
+        return self._sentiment[cache_key]
+
+    def aspects(self):
+        """Sentence-level sentiment tagged by program and barrier theme (see survey_aspects)"""
+        if self._aspects is None:
+            from survey_aspects import AspectSentiment
+            from survey_sentiment import engine_for
+            engine = engine_for(self.sentiment_analyzer, store=self.sentiment_store())
+            self._aspects = AspectSentiment.build(self, engine)
+        return self._aspects
+
+    def sentiment_store(self):
+        """Persistent sentiment scores (see survey_sentiment_store); None without a cache"""
+        if self._sentiment_store is None and self.source_hash:
+            from survey_sentiment_store import SentimentStore
+            self._sentiment_store = SentimentStore.for_source(self.source)
+        return self._sentiment_store
+
+    def text_index(self):
+        """Inverted index over the free-text answers (see survey_index), built once"""
+        if self._text_index is None:
+            from survey_index import TextIndex
+            self._text_index = TextIndex.for_dataset(self)
+        return self._text_index
+
+    def programs(self):
+        """Grant program mentions in every text and multi-select question (see survey_programs)"""
+        if self._programs is None:
+            from survey_programs import ProgramMentions
+            self._programs = ProgramMentions.for_dataset(self)
+        return self._programs
+
+    def bitsets(self, key):
+        """Packed per-option bitsets of a multi-select question (see survey_bitsets)"""
+        if key not in self._bitsets:
+            from survey_bitsets import OptionBitsets
+            self._bitsets[key] = OptionBitsets.from_multiselect(self.multiselect(key))
+        return self._bitsets[key]
+
+    def cube(self):
+        """Aggregation cube over the key dimensions (see survey_cube), built once"""
+        if self._cube is None:
+            from survey_cube import SurveyCube
+            self._cube = SurveyCube.build(self)
+        return self._cube
+
+    def share(self):
+        """Write the dataset to a memory-mapped Arrow file for worker pools
+
+        Returns the file path to hand to shared_dataset.map_shared. The file
+        is rewritten only when stages have added columns since the last call.
+        """
+        from shared_dataset import shared_path_for, write_arrow_ipc
+        path = shared_path_for(self)
+        columns = list(self.df.columns)
+        if self._shared_columns != columns or not os.path.exists(path):
+            write_arrow_ipc(self.df, path)
+            self._shared_columns = columns
+        return path
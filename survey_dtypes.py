@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Compact Survey Dtypes
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Converts a loaded survey to compact dtypes using the question registry:
+low-cardinality answers (Likert scales, single-choice questions) become
+categoricals, open-ended and multi-select text becomes Arrow-backed strings,
+and the timestamp questions are parsed as datetimes.
+
+    python survey_dtypes.py [ACME.xlsx]     # per-column memory report
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from survey_schema import SurveySchema
+
+# A column becomes categorical when it has at most this many distinct answers
+# and repeats values (distinct answers at most half the non-null rows)
+CATEGORY_MAX_UNIQUE = 100
+CATEGORY_MAX_RATIO = 0.5
+
+# Question kinds that are kept as strings however few distinct answers they have
+STRING_KINDS = {'text', 'multi'}
+
+try:
+    # NaN-backed Arrow strings behave like object columns for isna/astype(str)
+    TEXT_DTYPE = pd.StringDtype('pyarrow', na_value=np.nan)
+except (TypeError, ImportError):
+    try:
+        import pyarrow  # noqa: F401
+        TEXT_DTYPE = pd.StringDtype('pyarrow')
+    except ImportError:
+        TEXT_DTYPE = None
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def _to_category(series):
+    """Categorical with categories in order of first appearance
+
+    Keeping the export's order (rather than sorting) means value_counts ties
+    come out in the same order as they did for the string column.
+    """
+    categories = pd.unique(series.dropna())
+    return pd.Series(pd.Categorical(series, categories=categories),
+                     index=series.index, name=series.name)
+
+
+def compact_series(series, kind=None):
+    """One column converted to its compact dtype, or unchanged"""
+    if kind == 'datetime':
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+        return pd.to_datetime(series, errors='coerce')
+    if not _is_text(series) or isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    non_null = series.dropna()
+    if non_null.map(type).ne(str).any():
+        # Mixed answers (e.g. numbers typed into a text box) stay as exported
+        return series
+    n_unique = non_null.nunique()
+    if (kind not in STRING_KINDS and n_unique <= CATEGORY_MAX_UNIQUE
+            and n_unique <= CATEGORY_MAX_RATIO * len(non_null)):
+        return _to_category(series)
+    if TEXT_DTYPE is not None and series.dtype != TEXT_DTYPE:
+        return series.astype(TEXT_DTYPE)
+    return series
+
+
+def compact_dtypes(df, schema=None):
+    """Compact copy of `df` plus a per-column memory report
+
+    The report has one row per column with the dtype and deep memory usage
+    before and after, and the bytes saved.
+    """
+    if schema is None:
+        schema = SurveySchema.resolve(df.columns)
+    kinds = {header: schema.kind(key) for key, header in schema.columns.items()}
+
+    columns = {}
+    rows = []
+    for col in df.columns:
+        before = df[col]
+        after = compact_series(before, kinds.get(col))
+        columns[col] = after
+        bytes_before = int(before.memory_usage(deep=True, index=False))
+        bytes_after = int(after.memory_usage(deep=True, index=False))
+        rows.append({
+            'column': col,
+            'dtype_before': str(before.dtype),
+            'dtype_after': str(after.dtype),
+            'bytes_before': bytes_before,
+            'bytes_after': bytes_after,
+            'bytes_saved': bytes_before - bytes_after,
+        })
+
+    compact = pd.DataFrame(columns, index=df.index)
+    return compact, pd.DataFrame(rows)
+
+
+def format_memory_report(report):
+    """Text table of a compact_dtypes report, largest savings first"""
+    lines = [f"{'saved':>10}  {'before':>10}  {'after':>10}  {'dtype':<32}  column"]
+    for row in report.sort_values('bytes_saved', ascending=False).itertuples():
+        dtype = f"{row.dtype_before} -> {row.dtype_after}"
+        header = ' '.join(str(row.column).split())
+        if len(header) > 60:
+            header = header[:57] + '...'
+        lines.append(f"{row.bytes_saved:>10,}  {row.bytes_before:>10,}  {row.bytes_after:>10,}  "
+                     f"{dtype:<32}  {header}")
+    before = report['bytes_before'].sum()
+    after = report['bytes_after'].sum()
+    lines.append(f"Total: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB "
+                 f"({before / max(after, 1):.1f}x smaller)")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    from survey_loader import load_survey
+    path = sys.argv[1] if len(sys.argv) > 1 else 'ACME.xlsx'
+    _, report = compact_dtypes(load_survey(path))
+    print(format_memory_report(report))
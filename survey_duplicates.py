@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Answer Detection
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Finds clusters of near-identical free-text answers (copy-paste campaigns,
+repeated submissions) without comparing every pair. Each answer becomes a
+MinHash signature over its word shingles; locality-sensitive hashing puts
+answers whose signatures agree on a whole band into the same bucket, and
+only those candidates are checked against the similarity threshold:
+
+    duplicates = dataset.near_duplicates('improvements')
+    duplicates.n_duplicates, duplicates.clusters()
+    dataset.answer_mask('improvements')    # rows counted when collapsing
+
+Answers shorter than MIN_TOKENS words ('N/A', 'None') are never flagged:
+identical short answers are expected, not a campaign.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+# Words per shingle
+SHINGLE_SIZE = 3
+# MinHash permutations, split into BANDS bands of NUM_PERM // BANDS rows
+NUM_PERM = 128
+BANDS = 16
+# Estimated Jaccard similarity above which two answers are near-duplicates
+THRESHOLD = 0.8
+# Answers with fewer words are left alone
+MIN_TOKENS = 8
+
+
+def _mix64(x):
+    """splitmix64 finalizer: a fast, well-mixed 64-bit hash of uint64 arrays"""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xbf58476d1ce4e5b9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94d049bb133111eb)
+    return x ^ (x >> np.uint64(31))
+
+
+def _shingles(tokens, rows, size):
+    """(document, shingle hash) for every word shingle of the selected rows
+
+    Answers shorter than `size` words form a single shingle.
+    """
+    ids = tokens.token_ids(fold=True).astype(np.uint64) + np.uint64(1)
+    lengths = tokens.lengths()[rows]
+    # Token stream of the selected rows only, with the document of each token
+    selected = np.zeros(len(tokens), dtype=bool)
+    selected[rows] = True
+    ids = ids[selected[tokens.rows()]]
+    docs = np.repeat(np.arange(len(rows)), lengths)
+
+    k = np.minimum(size, lengths)[docs]
+    h = np.zeros(len(ids), dtype=np.uint64)
+    for offset in range(size):
+        # Tokens past the end of a short answer's only shingle are skipped
+        ahead = np.arange(len(ids)) + offset
+        inside = (offset < k) & (ahead < len(ids))
+        inside[inside] &= docs[ahead[inside]] == docs[inside]
+        h[inside] = _mix64(h[inside] ^ ids[ahead[inside]])
+    # A shingle starts wherever its last word is still in the same answer
+    position = np.arange(len(ids)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    starts = position <= lengths[docs] - k
+    return docs[starts], h[starts]
+
+
+def minhash_signatures(tokens, rows, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE, seed=1):
+    """(len(rows) x num_perm) MinHash signatures of the answers in `rows`
+
+    Permutation i hashes a shingle as a_i * x + b_i (mod 2**64), with odd a_i.
+    """
+    docs, hashes = _shingles(tokens, rows, shingle_size)
+    starts = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+    a = _mix64(np.arange(1, num_perm + 1, dtype=np.uint64) * np.uint64(seed)) | np.uint64(1)
+    b = _mix64(a)
+    signatures = np.empty((len(rows), num_perm), dtype=np.uint64)
+    # One permutation at a time: 1-D reductions are much faster than 2-D ones
+    for i in range(num_perm):
+        signatures[:, i] = np.minimum.reduceat(hashes * a[i] + b[i], starts)
+    return signatures
+
+
+def _candidate_pairs(signatures, bands):
+    """Pairs of documents sharing a bucket in at least one band
+
+    Each bucket links its members to its first member only, so a large
+    bucket costs linear rather than quadratic work.
+    """
+    n_docs, num_perm = signatures.shape
+    rows_per_band = num_perm // bands
+    pairs = []
+    for b in range(bands):
+        band = signatures[:, b * rows_per_band:(b + 1) * rows_per_band]
+        key = np.zeros(n_docs, dtype=np.uint64)
+        for column in band.T:
+            key = _mix64(key ^ column)
+        _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+        leader = first[inverse.ravel()]
+        linked = np.flatnonzero(leader != np.arange(n_docs))
+        pairs.append(np.stack([leader[linked], linked], axis=1))
+    pairs = np.concatenate(pairs) if pairs else np.zeros((0, 2), dtype=np.int64)
+    return np.unique(pairs, axis=0)
+
+
+class NearDuplicates:
+    """Near-duplicate clusters among the answers to one question"""
+
+    def __init__(self, cluster, index, texts=None):
+        self.cluster = pd.Series(cluster, index=index, name='cluster')   # -1: no duplicates
+        self.texts = texts
+
+    @property
+    def duplicate(self):
+        """Answers repeating an earlier answer in their cluster (the ones to collapse)"""
+        clustered = self.cluster.to_numpy() >= 0
+        repeat = pd.Series(self.cluster.to_numpy()).duplicated().to_numpy()
+        return pd.Series(clustered & repeat, index=self.cluster.index, name='duplicate')
+
+    @property
+    def n_clusters(self):
+        return int(self.cluster.max() + 1) if len(self.cluster) else 0
+
+    @property
+    def n_duplicates(self):
+        return int(self.duplicate.sum())
+
+    def clusters(self):
+        """One row per cluster: size, member rows and the first answer's text"""
+        members = self.cluster[self.cluster >= 0]
+        grouped = members.groupby(members)
+        summary = pd.DataFrame({
+            'size': grouped.size(),
+            'rows': grouped.apply(lambda g: list(g.index)),
+        })
+        if self.texts is not None:
+            summary['text'] = [self.texts.loc[rows[0]] for rows in summary['rows']]
+        return summary.sort_values('size', ascending=False, kind='stable')
+
+
+def find_near_duplicates(tokens, texts=None, threshold=THRESHOLD, num_perm=NUM_PERM,
+                         bands=BANDS, shingle_size=SHINGLE_SIZE, min_tokens=MIN_TOKENS):
+    """Cluster near-identical answers of a survey_tokens.TokenizedText
+
+    `texts`, when given, is the answer column (for cluster samples and its
+    index). Signature agreement estimates Jaccard similarity of the shingle
+    sets; candidate pairs from LSH are kept when it reaches `threshold` and
+    clusters are the connected components of the kept pairs.
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+    index = texts.index if texts is not None else pd.RangeIndex(len(tokens))
+    cluster = np.full(len(tokens), -1, dtype=np.int64)
+    rows = np.flatnonzero(tokens.answered & (tokens.lengths() >= min_tokens))
+    if len(rows) < 2:
+        return NearDuplicates(cluster, index, texts)
+
+    signatures = minhash_signatures(tokens, rows, num_perm, shingle_size)
+    pairs = _candidate_pairs(signatures, bands)
+    similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+    pairs = pairs[similarity >= threshold]
+
+    graph = sparse.csr_matrix((np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+                              shape=(len(rows), len(rows)))
+    _, labels = connected_components(graph, directed=False)
+    # Number clusters with two or more answers in order of their first row
+    sizes = np.bincount(labels)
+    shared = sizes[labels] > 1
+    codes, _ = pd.factorize(labels[shared])
+    cluster[rows[shared]] = codes
+    return NearDuplicates(cluster, index, texts)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Inverted Index over Open-Ended Responses
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Maps every token of the free-text answers to a posting list of
+(response, position) pairs, so quote retrieval is a few array
+intersections instead of a rescan of every text column. The index is
+written next to the survey cache and reused until the survey changes.
+
+Queries combine terms with AND, OR, NOT and parentheses (adjacent terms
+are ANDed), "quoted phrases" match consecutive tokens and a trailing '*'
+matches a prefix:
+
+    index = dataset.text_index()
+    index.search('parking AND "east austin"', zip=['78702', '78721'])
+    index.search('(cost* OR fee*) NOT free', questions=['improvements'], role='Artist')
+
+From the command line:
+
+    python survey_index.py 'parking AND "east austin"' --role Musician
+"""
+
+import hashlib
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from survey_loader import cache_dir_for
+from survey_tokens import tokenize
+
+# Bump when the tokenizer or file layout changes so old indexes are rebuilt
+INDEX_VERSION = 2
+
+# Free-text questions left out of the index (respondent names)
+EXCLUDED_KEYS = ['name']
+
+QUERY_PATTERN = re.compile(r'"[^"]*"|\(|\)|[^\s()"]+')
+OPERATORS = {'AND', 'OR', 'NOT'}
+
+
+class TextIndex:
+    """Positional inverted index over the text answers of a survey"""
+
+    def __init__(self, vocabulary, offsets, post_docs, post_positions, doc_rows, doc_fields,
+                 fields, n_rows):
+        self.vocabulary = vocabulary            # sorted token strings
+        self.offsets = offsets                  # postings of token i: offsets[i]:offsets[i+1]
+        self.post_docs = post_docs
+        self.post_positions = post_positions
+        self.doc_rows = doc_rows                # respondent row of each document
+        self.doc_fields = doc_fields            # question (index into fields) of each document
+        self.fields = list(fields)
+        self.n_rows = n_rows
+        self._stride = int(post_positions.max()) + 2 if len(post_positions) else 1
+        self.dataset = None
+
+    @classmethod
+    def build(cls, columns, n_rows):
+        """Index {question key: survey_tokens.TokenizedText}, one document per answer"""
+        doc_rows, doc_fields, docs, positions, token_ids = [], [], [], [], []
+        n_docs = 0
+        for f, tokens in enumerate(columns.values()):
+            rows = np.flatnonzero(tokens.answered)
+            doc_of_row = np.full(len(tokens), -1, dtype=np.int32)
+            doc_of_row[rows] = n_docs + np.arange(len(rows), dtype=np.int32)
+            n_docs += len(rows)
+            doc_rows.append(rows.astype(np.int32))
+            doc_fields.append(np.full(len(rows), f, dtype=np.int16))
+            docs.append(doc_of_row[tokens.rows()])
+            positions.append(tokens.positions())
+            token_ids.append(tokens.token_ids(fold=True))
+        docs = np.concatenate(docs or [np.zeros(0, dtype=np.int32)])
+        positions = np.concatenate(positions or [np.zeros(0, dtype=np.int32)])
+        token_ids = np.concatenate(token_ids or [np.zeros(0, dtype=np.int32)])
+
+        # Renumber the lowercase tokens in sorted order for prefix lookups
+        shared = next(iter(columns.values())).vocabulary.tokens if columns else []
+        used = np.unique(token_ids)
+        strings = np.array(shared, dtype=str)[used] if len(used) else np.zeros(0, dtype=str)
+        order = np.argsort(strings, kind='stable')
+        remap = np.zeros(len(shared), dtype=np.int64)
+        remap[used[order]] = np.arange(len(used))
+        token_ids = remap[token_ids]
+        vocabulary = strings[order]
+
+        order = np.lexsort((positions, docs, token_ids))
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(token_ids, minlength=len(vocabulary)))
+        return cls(vocabulary, offsets, docs[order], positions[order],
+                   np.concatenate(doc_rows or [np.zeros(0, dtype=np.int32)]),
+                   np.concatenate(doc_fields or [np.zeros(0, dtype=np.int16)]),
+                   list(columns), n_rows)
+
+    @classmethod
+    def for_dataset(cls, dataset, keys=None, use_cache=True):
+        """Index of a dataset's text questions, loaded from disk when current"""
+        schema = dataset.schema
+        keys = [k for k in (keys or schema.keys('text')) if k in schema and k not in EXCLUDED_KEYS]
+        path = None
+        if use_cache and dataset.source_hash:
+            digest = hashlib.sha256(f"{INDEX_VERSION}:{','.join(keys)}".encode()).hexdigest()[:12]
+            path = os.path.join(cache_dir_for(dataset.source),
+                                f"{dataset.source_hash}.{digest}.index.npz")
+        if path and os.path.exists(path):
+            index = cls.load(path)
+        else:
+            index = cls.build({key: dataset.tokens(key) for key in keys}, len(dataset.df))
+            if path:
+                index.save(path)
+        index.dataset = dataset
+        return index
+
+    def save(self, path):
+        """Write the index arrays to an .npz file"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Write then rename, so an interrupted save never leaves a truncated index
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, vocabulary=self.vocabulary, offsets=self.offsets,
+                     post_docs=self.post_docs, post_positions=self.post_positions,
+                     doc_rows=self.doc_rows, doc_fields=self.doc_fields,
+                     fields=np.array(self.fields, dtype=str), n_rows=np.int64(self.n_rows))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['vocabulary'], data['offsets'], data['post_docs'],
+                       data['post_positions'], data['doc_rows'], data['doc_fields'],
+                       data['fields'].tolist(), int(data['n_rows']))
+
+    def __len__(self):
+        return len(self.doc_rows)
+
+    # Posting lists
+
+    def _token_range(self, token):
+        """Vocabulary range for a token, or for every token with a prefix"""
+        if token.endswith('*'):
+            prefix = token.rstrip('*')
+            lo = np.searchsorted(self.vocabulary, prefix, side='left')
+            hi = np.searchsorted(self.vocabulary, prefix + '\U0010ffff', side='left')
+            return lo, hi
+        lo = np.searchsorted(self.vocabulary, token, side='left')
+        found = lo < len(self.vocabulary) and self.vocabulary[lo] == token
+        return lo, lo + 1 if found else lo
+
+    def _postings(self, token):
+        lo, hi = self._token_range(token)
+        start, stop = self.offsets[lo], self.offsets[hi]
+        return self.post_docs[start:stop], self.post_positions[start:stop]
+
+    def term(self, token):
+        """Sorted ids of the documents containing a token (or prefix*)"""
+        docs, _ = self._postings(token)
+        return np.unique(docs)
+
+    def phrase(self, tokens):
+        """Sorted ids of the documents containing the tokens consecutively"""
+        if len(tokens) == 1:
+            return self.term(tokens[0])
+        keys = None
+        for offset, token in enumerate(tokens):
+            docs, positions = self._postings(token)
+            # Shift each token back to where the phrase would start
+            fits = positions >= offset
+            starts = docs[fits].astype(np.int64) * self._stride + (positions[fits] - offset)
+            keys = np.unique(starts) if keys is None else np.intersect1d(keys, starts)
+            if not len(keys):
+                break
+        return np.unique(keys // self._stride).astype(np.int32)
+
+    # Query evaluation
+
+    def _parse(self, query):
+        parts = QUERY_PATTERN.findall(query)
+        position = 0
+
+        def peek():
+            return parts[position] if position < len(parts) else None
+
+        def take():
+            # None at the end of the query, like peek(), so callers report what is missing
+            nonlocal position
+            part = peek()
+            position += part is not None
+            return part
+
+        def expression():
+            docs = conjunction()
+            while peek() == 'OR':
+                take()
+                docs = np.union1d(docs, conjunction())
+            return docs
+
+        def conjunction():
+            docs = unary()
+            while peek() is not None and peek() not in ('OR', ')'):
+                if peek() == 'AND':
+                    take()
+                docs = np.intersect1d(docs, unary())
+            return docs
+
+        def unary():
+            part = take()
+            if part is None:
+                raise ValueError(f"Incomplete query: {query!r}")
+            if part == 'NOT':
+                return np.setdiff1d(np.arange(len(self), dtype=np.int32), unary())
+            if part == '(':
+                docs = expression()
+                if take() != ')':
+                    raise ValueError(f"Unbalanced parentheses in query: {query!r}")
+                return docs
+            if part in OPERATORS or part == ')':
+                raise ValueError(f"Unexpected {part!r} in query: {query!r}")
+            # A quoted phrase, or a term that tokenizes to several words
+            wildcard = part.endswith('*') and not part.startswith('"')
+            tokens = [token.lower() for token in tokenize(part.strip('"'))]
+            if not tokens:
+                return np.array([], dtype=np.int32)
+            if wildcard:
+                tokens[-1] += '*'
+            return self.phrase(tokens)
+
+        docs = expression()
+        if position < len(parts):
+            raise ValueError(f"Unexpected {parts[position]!r} in query: {query!r}")
+        return docs
+
+    def documents(self, query, questions=None, rows=None):
+        """Ids of the documents matching a query, optionally restricted"""
+        docs = self._parse(query)
+        if questions is not None:
+            unknown = [q for q in questions if q not in self.fields]
+            if unknown:
+                raise KeyError(f"Questions not in the index: {unknown}")
+            fields = [self.fields.index(q) for q in questions]
+            docs = docs[np.isin(self.doc_fields[docs], fields)]
+        if rows is not None:
+            docs = docs[np.asarray(rows, dtype=bool)[self.doc_rows[docs]]]
+        return docs
+
+    def _filter_rows(self, zip=None, role=None):
+        if zip is None and role is None:
+            return None
+        if self.dataset is None:
+            raise ValueError("zip and role filters need an index built with for_dataset()")
+        rows = np.ones(self.n_rows, dtype=bool)
+        if zip is not None:
+            zips = [zip] if isinstance(zip, str) else list(zip)
+            rows &= self.dataset.clean_zip().isin(zips).to_numpy()
+        if role is not None:
+            rows &= self.dataset.multiselect('role').mentions(role).to_numpy()
+        return rows
+
+    def count(self, query, questions=None, zip=None, role=None):
+        """Number of answers matching a query"""
+        return len(self.documents(query, questions, self._filter_rows(zip, role)))
+
+    def search(self, query, questions=None, zip=None, role=None, limit=None):
+        """Matching answers as a DataFrame (row, question, zip, text)
+
+        `zip` takes one cleaned zip code or a list; `role` is a pattern
+        matched against the selected role options (see MultiSelect.mentions).
+        """
+        docs = self.documents(query, questions, self._filter_rows(zip, role))
+        # Answers in respondent order, question order within a respondent
+        docs = docs[np.lexsort((self.doc_fields[docs], self.doc_rows[docs]))]
+        if limit is not None:
+            docs = docs[:limit]
+        rows = self.doc_rows[docs]
+        questions = [self.fields[f] for f in self.doc_fields[docs]]
+        results = pd.DataFrame({'row': rows, 'question': questions})
+        if self.dataset is not None:
+            schema = self.dataset.schema
+            df = self.dataset.df
+            results['zip'] = self.dataset.clean_zip().to_numpy()[rows] if 'zip' in schema else None
+            results['text'] = [df[schema[questions[i]]].iat[rows[i]] for i in range(len(rows))]
+        return results
+
+
+if __name__ == '__main__':
+    import argparse
+    from survey_dataset import SurveyDataset
+
+    parser = argparse.ArgumentParser(description='Search the open-ended survey answers')
+    parser.add_argument('query')
+    parser.add_argument('--source', default='ACME.xlsx')
+    parser.add_argument('--question', action='append', dest='questions',
+                        help='survey_schema question key (repeatable)')
+    parser.add_argument('--zip', action='append', help='cleaned zip code (repeatable)')
+    parser.add_argument('--role', help='pattern matched against the selected roles')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    dataset = SurveyDataset.load(args.source)
+    index = dataset.text_index()
+    try:
+        results = index.search(args.query, args.questions, args.zip, args.role)
+    except (KeyError, ValueError) as e:
+        sys.exit(str(e))
+    print(f"{len(results)} answers match {args.query!r}")
+    for result in results.head(args.limit).itertuples():
+        text = result.text if len(result.text) <= 200 else result.text[:200] + '...'
+        print(f"\n[{result.question}, zip {result.zip}] {text}")
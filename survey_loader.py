@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Shared Survey Loader
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Parses the survey workbook once and keeps a columnar (Parquet) copy keyed by
+the workbook's content hash. Later loads of an unchanged workbook are served
+from the cache instead of re-parsing the Excel file, and a stage that only
+needs a few questions can read just those columns.
+
+Workbooks are converted with openpyxl's read-only mode in bounded batches, so
+building the cache for a very large export never holds the whole sheet in
+memory.
+"""
+
+import datetime
+import hashlib
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+try:
+    import openpyxl
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+CACHE_DIR_NAME = '.acme_cache'
+STREAM_BATCH_ROWS = 5000
+STREAMABLE_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# Cell values pandas.read_excel treats as missing by default
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null',
+])
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Content hash of a file, read in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_dir_for(path):
+    """Cache directory that sits next to the source workbook"""
+    return os.environ.get('ACME_CACHE_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+def cache_path_for(path, content_hash=None):
+    """Location of the Parquet cache for the current contents of `path`"""
+    if content_hash is None:
+        content_hash = file_sha256(path)
+    return os.path.join(cache_dir_for(path), f"{content_hash}.parquet")
+
+
+def _header_names(header):
+    """Column names for a header row, deduplicated the way pandas does"""
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _clean_cell(value):
+    if isinstance(value, str) and value in NA_STRINGS:
+        return None
+    return value
+
+
+def _iter_sheet_rows(path, width=None):
+    """Yield data rows from the first sheet, padded to a fixed width
+
+    Trailing blank rows (common in exported workbooks) are dropped, as
+    pandas.read_excel does. Blank rows between data rows are kept.
+    """
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        # Many exporters write a bogus <dimension> tag (e.g. "A1:A1"), which
+        # read-only mode would otherwise trust
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, ())
+        if width is None:
+            yield header
+            width = len(header)
+        pending_blank = 0
+        for row in rows:
+            row = [_clean_cell(v) for v in row[:width]]
+            row += [None] * (width - len(row))
+            if all(v is None for v in row):
+                pending_blank += 1
+                continue
+            for _ in range(pending_blank):
+                yield [None] * width
+            pending_blank = 0
+            yield row
+    finally:
+        wb.close()
+
+
+def _cell_kind(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return 'datetime'
+    return 'str'
+
+
+def _arrow_type(kinds, has_nulls):
+    """Arrow type for a column given the kinds of value seen in it"""
+    if not kinds:
+        return pa.float64()
+    if kinds == {'int'}:
+        # pandas has no missing value for int64, so gaps promote to float
+        return pa.float64() if has_nulls else pa.int64()
+    if kinds <= {'int', 'float'}:
+        return pa.float64()
+    if kinds == {'datetime'}:
+        return pa.timestamp('us')
+    if kinds == {'bool'}:
+        # As with int: pandas reads a boolean column with gaps as 1.0/0.0/NaN
+        return pa.float64() if has_nulls else pa.bool_()
+    return pa.string()
+
+
+def _infer_schema(path):
+    """First pass: scan the sheet once to fix a type for every column"""
+    rows = _iter_sheet_rows(path)
+    names = _header_names(next(rows))
+    kinds = [set() for _ in names]
+    has_nulls = [False] * len(names)
+    for row in rows:
+        for i, value in enumerate(row):
+            if value is None:
+                has_nulls[i] = True
+            else:
+                kinds[i].add(_cell_kind(value))
+    return pa.schema([pa.field(name, _arrow_type(k, n))
+                      for name, k, n in zip(names, kinds, has_nulls)])
+
+
+def _batch_to_table(batch, schema):
+    arrays = []
+    for i, field in enumerate(schema):
+        values = [row[i] for row in batch]
+        if pa.types.is_string(field.type):
+            values = [None if v is None else str(v) for v in values]
+        elif pa.types.is_floating(field.type):
+            values = [None if v is None else float(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def stream_excel_to_parquet(path, out_path, batch_rows=STREAM_BATCH_ROWS):
+    """Convert a workbook to Parquet without materialising the whole sheet
+
+    Rows are read through openpyxl's read-only mode and written out one
+    batch of `batch_rows` rows at a time, so peak memory depends on the
+    batch size rather than on the size of the export. Returns the row count.
+    """
+    schema = _infer_schema(path)
+    rows = _iter_sheet_rows(path, width=len(schema))
+    n_rows = 0
+    with pq.ParquetWriter(out_path, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                writer.write_table(_batch_to_table(batch, schema))
+                n_rows += len(batch)
+                batch = []
+        if batch or n_rows == 0:
+            writer.write_table(_batch_to_table(batch, schema))
+            n_rows += len(batch)
+    return n_rows
+
+
+def build_cache(path, cache_path):
+    """Parse the workbook and write it to `cache_path` as Parquet"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    # Write to a temporary file first so a crashed run never leaves a
+    # truncated cache that later loads would trust
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    if HAS_OPENPYXL and path.lower().endswith(STREAMABLE_EXTENSIONS):
+        stream_excel_to_parquet(path, tmp_path)
+    else:
+        pd.read_excel(path).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
+
+
+def project_columns(available, columns):
+    """Requested columns that exist, in the order they were requested
+
+    Unknown questions are dropped rather than raising, matching the
+    `if col in df.columns` guards the analysis scripts already use.
+    """
+    available = set(available)
+    seen = set()
+    projected = []
+    for col in columns:
+        if col in available and col not in seen:
+            seen.add(col)
+            projected.append(col)
+    return projected
+
+
+def load_survey(path='ACME.xlsx', columns=None, keys=None, use_cache=True):
+    """Load the survey responses, using the columnar cache when possible
+
+    Pass `columns` (a list of question headers) or `keys` (survey_schema
+    question keys) to read only those columns. Keys are resolved against
+    the export's headers and raise KeyError when a question is missing.
+    """
+    if not (use_cache and HAS_ARROW):
+        df = pd.read_excel(path)
+        columns = _with_keys(df.columns, columns, keys)
+        if columns is not None:
+            df = df[project_columns(df.columns, columns)]
+        return df
+
+    cache_path = cache_path_for(path)
+    if not os.path.exists(cache_path):
+        build_cache(path, cache_path)
+
+    if columns is None and keys is None:
+        return pd.read_parquet(cache_path)
+    available = pq.read_schema(cache_path).names
+    columns = _with_keys(available, columns, keys)
+    return pd.read_parquet(cache_path, columns=project_columns(available, columns))
+
+
+def _with_keys(available, columns, keys):
+    """Headers for `keys` appended to the requested `columns`"""
+    if keys is None:
+        return columns
+    from survey_schema import SurveySchema
+    return list(columns or []) + SurveySchema.resolve(available).projection(keys)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Multi-Select Answer Encoder
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Parses a select-all-that-apply question once into a sparse boolean
+respondent x option matrix with an option vocabulary. Counts, rates,
+per-group breakdowns and program mentions are then column sums and masked
+sums over the matrix instead of repeated string scans:
+
+    barriers = dataset.multiselect('barriers')
+    barriers.most_common(5)
+    barriers.by_group(dataset.clean_zip())
+    barriers.cooccurrence_edges()                # pairs with lift, PMI, Jaccard
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Microsoft Forms separates (and terminates) the selected options with ';'
+OPTION_SEP = ';'
+
+
+def normalize_option(option):
+    """Option text with non-breaking spaces and repeated whitespace collapsed"""
+    return ' '.join(unicodedata.normalize('NFKC', option).split())
+
+
+def _normalize_cooccurrence(both, total_a, total_b, n, measure):
+    """Co-occurrence counts rescaled by the two options' totals"""
+    if measure == 'lift':
+        return both * n / (total_a * total_b)
+    if measure == 'pmi':
+        with np.errstate(divide='ignore'):
+            return np.where(both > 0, np.log2(both * n / (total_a * total_b)), np.nan)
+    if measure == 'jaccard':
+        return both / (total_a + total_b - both)
+    raise ValueError(f"Unknown measure {measure!r}; use 'count', 'lift', 'pmi' or 'jaccard'")
+
+
+class MultiSelect:
+    """Sparse respondent x option matrix for one multi-select question"""
+
+    def __init__(self, matrix, options, index=None, answered=None):
+        self.matrix = sparse.csr_matrix(matrix, dtype=bool)
+        self.options = list(options)
+        self.option_index = {option: i for i, option in enumerate(self.options)}
+        self.index = pd.RangeIndex(self.matrix.shape[0]) if index is None else index
+        # Rows that answered the question at all (possibly with no options)
+        self.answered = np.ones(self.matrix.shape[0], dtype=bool) if answered is None else answered
+
+    @classmethod
+    def from_series(cls, series, sep=OPTION_SEP):
+        """Parse answers like 'Cost of tickets;Transportation / parking issues;'"""
+        answered = series.notna().to_numpy()
+        text = series.astype(object).where(answered)
+        options = text.dropna().astype(str).str.split(sep).explode()
+        options = options.map(normalize_option)
+        options = options[options != '']
+
+        # Rows of each selection, as positions rather than index labels
+        positions = pd.Series(np.arange(len(series)), index=series.index)
+        rows = positions.loc[options.index].to_numpy() if len(options) else np.array([], dtype=int)
+
+        # Vocabulary ordered by popularity, ties in order of first appearance
+        codes, vocabulary = pd.factorize(options.to_numpy())
+        order = np.argsort(-np.bincount(codes, minlength=len(vocabulary)), kind='stable')
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(codes), dtype=bool), (rows, remap[codes])),
+            shape=(len(series), len(vocabulary)), dtype=bool)
+        return cls(matrix, [vocabulary[i] for i in order], index=series.index, answered=answered)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @property
+    def n_answered(self):
+        return int(self.answered.sum())
+
+    def counts(self, mask=None):
+        """Respondents selecting each option, optionally within a row mask"""
+        matrix = self.matrix if mask is None else self.matrix[np.asarray(mask, dtype=bool)]
+        totals = np.asarray(matrix.sum(axis=0)).ravel()
+        return pd.Series(totals, index=self.options, dtype=np.int64)
+
+    def most_common(self, n=None, mask=None):
+        """[(option, count), ...] like Counter.most_common"""
+        counts = self.counts(mask).sort_values(ascending=False, kind='stable')
+        counts = counts[counts > 0]
+        return list(counts.head(n).items()) if n is not None else list(counts.items())
+
+    def rates(self, denominator=None):
+        """Percent of respondents selecting each option (default: all respondents)"""
+        denominator = len(self) if denominator is None else denominator
+        return self.counts() / denominator * 100
+
+    def n_selected(self):
+        """Number of options each respondent selected"""
+        return pd.Series(np.asarray(self.matrix.sum(axis=1)).ravel(), index=self.index)
+
+    def selected(self, option):
+        """Boolean mask of respondents who selected `option`"""
+        column = self.matrix[:, self.option_index[option]]
+        return pd.Series(column.toarray().ravel(), index=self.index)
+
+    def matching(self, pattern, case=False):
+        """Options whose text matches a regular expression"""
+        regex = re.compile(pattern, 0 if case else re.IGNORECASE)
+        return [option for option in self.options if regex.search(option)]
+
+    def mentions(self, pattern, case=False):
+        """Boolean mask of respondents selecting any option matching `pattern`
+
+        Equivalent to str.contains on the raw answer as long as the pattern
+        does not span the ';' between two options.
+        """
+        columns = [self.option_index[option] for option in self.matching(pattern, case)]
+        if not columns:
+            return pd.Series(False, index=self.index)
+        hits = self.matrix[:, columns].getnnz(axis=1) > 0
+        return pd.Series(hits, index=self.index)
+
+    def _cooccurrence_counts(self):
+        """Sparse option x option counts (XᵀX), diagonal holding option totals"""
+        matrix = self.matrix.astype(np.int64)
+        return (matrix.T @ matrix).tocsr()
+
+    def cooccurrence(self, measure='count'):
+        """Option x option co-occurrence as a DataFrame
+
+        `measure` is 'count', 'lift' (observed / expected under independence),
+        'pmi' (log2 of lift) or 'jaccard' (both / either). Rates use the
+        respondents who answered; the diagonal is left as the option totals
+        for 'count' and is NaN otherwise.
+        """
+        counts = self._cooccurrence_counts().toarray()
+        if measure == 'count':
+            return pd.DataFrame(counts, index=self.options, columns=self.options)
+        totals = np.diag(counts).astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = _normalize_cooccurrence(counts, totals[:, None], totals[None, :],
+                                             self.n_answered, measure)
+        np.fill_diagonal(values, np.nan)
+        return pd.DataFrame(values, index=self.options, columns=self.options)
+
+    def cooccurrence_edges(self, min_count=1):
+        """Edge list of co-occurring option pairs with count, lift, PMI and Jaccard
+
+        Built from the non-zero upper triangle of the sparse product, so only
+        pairs that actually co-occur are materialised.
+        """
+        counts = self._cooccurrence_counts()
+        totals = counts.diagonal().astype(float)
+        pairs = sparse.triu(counts, k=1).tocoo()
+        keep = pairs.data >= min_count
+        # Most frequent first, ties in option order
+        order = np.lexsort((pairs.col[keep], pairs.row[keep], -pairs.data[keep]))
+        i, j, both = pairs.row[keep][order], pairs.col[keep][order], pairs.data[keep][order]
+        names = np.array(self.options, dtype=object)
+        edges = pd.DataFrame({'source': names[i], 'target': names[j], 'count': both})
+        for measure in ('lift', 'pmi', 'jaccard'):
+            edges[measure] = _normalize_cooccurrence(both, totals[i], totals[j], self.n_answered, measure)
+        return edges
+
+    def by_group(self, groups):
+        """Group x option counts, e.g. selections per zip code
+
+        `groups` is aligned with the respondents; rows with a missing group
+        are left out.
+        """
+        groups = pd.Series(np.asarray(groups), index=self.index)
+        codes, labels = pd.factorize(groups)
+        keep = codes >= 0
+        indicator = sparse.csr_matrix(
+            (np.ones(keep.sum(), dtype=np.int64), (codes[keep], np.flatnonzero(keep))),
+            shape=(len(labels), len(self)))
+        counts = indicator @ self.matrix.astype(np.int64)
+        return pd.DataFrame(counts.toarray(), index=labels, columns=self.options)
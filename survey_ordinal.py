@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Ordinal Encoding and Rank Correlations
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Encodes every Likert-style question in one pass from a declarative level
+map, then computes Spearman or Kendall correlation matrices over
+pairwise-complete observations, with p-values.
+
+Because the encoded answers take only a few levels, all pairwise
+contingency tables come out of a single one-hot product (OᵀO). Rows missing
+either answer contribute nothing to a pair's table, so every statistic is
+pairwise-complete without aligning series by hand:
+
+    scores = encode_ordinals(dataset.df, dataset.schema)
+    result = rank_correlations(scores, method='spearman')
+    result['corr'], result['p_value'], result['n']
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+
+# Answer levels from lowest to highest, matched after trimming whitespace and
+# ignoring case. Answers listed under NOT_RATED have no position on the scale
+# and are treated as missing.
+ORDINAL_LEVELS = {
+    'participation': ['Never', 'Rarely', 'A few times a year', 'Monthly', 'Weekly'],
+    'importance': ['Not important at all', 'Not very important', 'Neutral',
+                   'Somewhat important', 'Very important'],
+    'equal_access': ['No, accessibility is a major issue',
+                     'Somewhat, but there are barriers for certain communities',
+                     'Yes, opportunities are widely accessible'],
+    'accessibility': ['Not accessible', 'Not very accessible', 'Neutral',
+                      'Somewhat accessible', 'Very accessible'],
+    'satisfaction': ['Very dissatisfied', 'Somewhat dissatisfied', 'Neutral',
+                     'Somewhat satisfied', 'Very satisfied'],
+}
+NOT_RATED = ['Unsure', 'Not applicable']
+
+
+def _normalize(answer):
+    return ' '.join(str(answer).split()).casefold()
+
+
+def encode_series(series, levels):
+    """Level positions (0 = lowest) as floats; unrated or unknown answers are NaN
+
+    Returns (codes, unknown) where `unknown` lists answers that are neither a
+    level nor NOT_RATED, so a changed answer wording is noticed.
+    """
+    lookup = {_normalize(level): float(i) for i, level in enumerate(levels)}
+    not_rated = {_normalize(answer) for answer in NOT_RATED}
+    # Map each distinct answer once, then broadcast through the codes
+    codes, uniques = pd.factorize(series.astype(object))
+    normalized = [_normalize(u) for u in uniques]
+    mapped = np.array([lookup.get(u, np.nan) for u in normalized] + [np.nan])
+    unknown = [orig for orig, u in zip(uniques, normalized) if u not in lookup and u not in not_rated]
+    return pd.Series(mapped[codes], index=series.index, name=series.name), unknown
+
+
+def encode_ordinals(df, schema, keys=None, levels=ORDINAL_LEVELS):
+    """DataFrame of level positions, one column per ordinal question key"""
+    keys = [k for k in (keys or levels) if k in schema]
+    columns = {}
+    unknown = {}
+    for key in keys:
+        columns[key], unmatched = encode_series(df[schema[key]], levels[key])
+        if unmatched:
+            unknown[key] = unmatched
+    scores = pd.DataFrame(columns, index=df.index)
+    scores.attrs['unknown_answers'] = unknown
+    return scores
+
+
+def _one_hot(scores):
+    """One-hot indicator of every (column, level) plus each level's value"""
+    blocks, values, owners = [], [], []
+    for j, col in enumerate(scores.columns):
+        codes, levels = pd.factorize(scores[col], sort=True)
+        onehot = np.zeros((len(scores), len(levels)), dtype=np.int64)
+        present = codes >= 0
+        onehot[np.flatnonzero(present), codes[present]] = 1
+        blocks.append(onehot)
+        values.append(np.asarray(levels, dtype=float))
+        owners.append(np.full(len(levels), j))
+    return np.hstack(blocks), values, np.concatenate(owners)
+
+
+def _midranks(counts):
+    """Average rank of each level given how many observations share it"""
+    return np.cumsum(counts) - (counts - 1) / 2
+
+
+def _spearman(table):
+    rows, cols = table.sum(axis=1), table.sum(axis=0)
+    n = rows.sum()
+    ra, rb = _midranks(rows), _midranks(cols)
+    ra, rb = ra - (rows @ ra) / n, rb - (cols @ rb) / n
+    denom = np.sqrt((rows @ ra ** 2) * (cols @ rb ** 2))
+    r = (ra @ table @ rb) / denom if denom > 0 else np.nan
+    if np.isnan(r) or n < 3:
+        return r, np.nan
+    # Same t approximation as scipy.stats.spearmanr
+    r = min(max(r, -1.0), 1.0)
+    if abs(r) == 1.0:
+        return r, 0.0
+    t = r * np.sqrt((n - 2) / (1 - r ** 2))
+    return r, 2 * stats.t.sf(abs(t), n - 2)
+
+
+def _kendall(table):
+    rows, cols = table.sum(axis=1), table.sum(axis=0)
+    n = rows.sum()
+    # Pairs below-right of each cell are concordant, below-left discordant
+    below = np.cumsum(np.cumsum(table[::-1, ::-1], axis=0), axis=1)[::-1, ::-1]
+    below_right = np.zeros_like(table)
+    below_right[:-1, :-1] = below[1:, 1:]
+    below_left = np.zeros_like(table)
+    left = np.cumsum(np.cumsum(table[::-1, :], axis=0), axis=1)[::-1, :]
+    below_left[:-1, 1:] = left[1:, :-1]
+    s = float((table * below_right).sum() - (table * below_left).sum())
+
+    n0 = n * (n - 1) / 2
+    ties_a = (rows * (rows - 1) / 2).sum()
+    ties_b = (cols * (cols - 1) / 2).sum()
+    denom = np.sqrt((n0 - ties_a) * (n0 - ties_b))
+    if denom == 0 or n < 3:
+        return np.nan, np.nan
+    tau = s / denom
+
+    # Tie-corrected normal approximation, as scipy.stats.kendalltau (asymptotic)
+    v0 = n * (n - 1) * (2 * n + 5)
+    vt = (rows * (rows - 1) * (2 * rows + 5)).sum()
+    vu = (cols * (cols - 1) * (2 * cols + 5)).sum()
+    v1 = (rows * (rows - 1)).sum() * (cols * (cols - 1)).sum() / (2 * n * (n - 1))
+    v2 = ((rows * (rows - 1) * (rows - 2)).sum() * (cols * (cols - 1) * (cols - 2)).sum()
+          / (9 * n * (n - 1) * (n - 2)))
+    var = (v0 - vt - vu) / 18 + v1 + v2
+    p = special.erfc(abs(s) / np.sqrt(var) / np.sqrt(2)) if var > 0 else np.nan
+    return tau, p
+
+
+def rank_correlations(scores, method='spearman'):
+    """Pairwise-complete rank correlation matrix with p-values and pair counts
+
+    `scores` holds discrete ordered values (encoded answers, counts); NaN
+    marks a missing answer. Returns {'corr', 'p_value', 'n'} DataFrames.
+    """
+    if method not in ('spearman', 'kendall'):
+        raise ValueError(f"Unknown method {method!r}; use 'spearman' or 'kendall'")
+    statistic = _spearman if method == 'spearman' else _kendall
+
+    onehot, _, owners = _one_hot(scores)
+    # Every pairwise contingency table in one product
+    tables = onehot.T @ onehot
+    k = scores.shape[1]
+    corr = np.full((k, k), np.nan)
+    p_value = np.full((k, k), np.nan)
+    n = np.zeros((k, k), dtype=np.int64)
+    blocks = [np.flatnonzero(owners == j) for j in range(k)]
+    for i in range(k):
+        for j in range(i, k):
+            table = tables[np.ix_(blocks[i], blocks[j])].astype(float)
+            n[i, j] = n[j, i] = int(table.sum())
+            if len(blocks[i]) < 2 or len(blocks[j]) < 2:
+                continue
+            corr[i, j], p_value[i, j] = statistic(table)
+            corr[j, i], p_value[j, i] = corr[i, j], p_value[i, j]
+
+    labels = list(scores.columns)
+    return {
+        'corr': pd.DataFrame(corr, index=labels, columns=labels),
+        'p_value': pd.DataFrame(p_value, index=labels, columns=labels),
+        'n': pd.DataFrame(n, index=labels, columns=labels),
+    }
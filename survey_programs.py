@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Grant Program Mentions
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Recognizes the ACME grant programs in every text and multi-select question
+in one pass, using the alias table of the 'programs' theme set (see
+survey_themes): "Art in Public Places" counts as AIPP, "Austin Live Music
+Fund" as ALMF, and ordinary words ('thrive', 'elevate', 'heritage') only
+count when capitalized or followed by grant/program, except in answers
+that can only name programs (NAMING_KEYS). The respondent x program
+matrices are saved next to the survey cache and every report reads them
+instead of searching for program names itself:
+
+    programs = dataset.programs()
+    programs.question('awareness').counts()      # aware of each program
+    programs.counts(['improvements'])            # answers mentioning each program
+    programs.mask('Thrive', ['improvements'])    # rows to read for Thrive feedback
+    programs.respondents().counts()              # respondents mentioning it anywhere
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from survey_loader import cache_dir_for
+from survey_multiselect import MultiSelect
+from survey_themes import THEME_SETS
+
+# Bump when recognition or the file layout changes so old caches are rebuilt
+PROGRAM_VERSION = 1
+
+# Questions never scanned for program names
+EXCLUDED_KEYS = ['name']
+
+# Questions whose answers can only name programs: matched in any case
+# ('nexus, elevate, thrive'), with the 'program_names' theme set
+NAMING_KEYS = ['applied_program', 'awareness']
+
+
+class ProgramMentions:
+    """Respondent x program mention matrices, one per question"""
+
+    def __init__(self, matrices, answered, programs, index=None):
+        self.matrices = matrices            # question key -> csr (respondents x programs)
+        self.answered = answered            # question key -> rows that answered it
+        self.programs = list(programs)
+        self.index = index
+
+    @classmethod
+    def build(cls, dataset, keys):
+        """Scan each question once (multi-select questions through their option texts)"""
+        matrices, answered = {}, {}
+        for key in keys:
+            mentions = dataset.themes(key, 'program_names' if key in NAMING_KEYS else 'programs')
+            matrices[key] = mentions.matrix
+            answered[key] = mentions.answered
+        return cls(matrices, answered, THEME_SETS['programs'][0], dataset.df.index)
+
+    @classmethod
+    def for_dataset(cls, dataset, keys=None, use_cache=True):
+        """Program mentions of a dataset, loaded from disk when current"""
+        schema = dataset.schema
+        keys = [k for k in (keys or schema.keys('text') + schema.keys('multi'))
+                if k in schema and k not in EXCLUDED_KEYS]
+        path = None
+        if use_cache and dataset.source_hash:
+            # The alias table is part of the key, so editing it rebuilds the matrices
+            themes, case_sensitive = THEME_SETS['programs']
+            spec = (f"{PROGRAM_VERSION}:{','.join(keys)}:{','.join(NAMING_KEYS)}:"
+                    f"{sorted(themes.items())}:{sorted(case_sensitive)}")
+            digest = hashlib.sha256(spec.encode()).hexdigest()[:12]
+            path = os.path.join(cache_dir_for(dataset.source),
+                                f"{dataset.source_hash}.{digest}.programs.npz")
+        if path and os.path.exists(path):
+            mentions = cls.load(path)
+        else:
+            mentions = cls.build(dataset, keys)
+            if path:
+                mentions.save(path)
+        mentions.index = dataset.df.index
+        return mentions
+
+    def save(self, path):
+        """Write the mention matrices to an .npz file"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        arrays = {'programs': np.array(self.programs, dtype=str),
+                  'keys': np.array(list(self.matrices), dtype=str)}
+        for key, matrix in self.matrices.items():
+            coo = matrix.tocoo()
+            arrays[f'{key}.rows'] = coo.row.astype(np.int64)
+            arrays[f'{key}.cols'] = coo.col.astype(np.int64)
+            arrays[f'{key}.answered'] = self.answered[key]
+        # Write then rename, so an interrupted save never leaves a truncated file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            programs = data['programs'].tolist()
+            matrices, answered = {}, {}
+            for key in data['keys'].tolist():
+                answered[key] = data[f'{key}.answered']
+                rows, cols = data[f'{key}.rows'], data[f'{key}.cols']
+                matrices[key] = sparse.csr_matrix(
+                    (np.ones(len(rows), dtype=bool), (rows, cols)),
+                    shape=(len(answered[key]), len(programs)), dtype=bool)
+        return cls(matrices, answered, programs)
+
+    @property
+    def questions(self):
+        return list(self.matrices)
+
+    def _keys(self, questions):
+        if questions is None:
+            return self.questions
+        unknown = [q for q in questions if q not in self.matrices]
+        if unknown:
+            raise KeyError(f"Questions not scanned for programs: {unknown}")
+        return list(questions)
+
+    def question(self, key):
+        """Program mentions in one question's answers, as a MultiSelect"""
+        return MultiSelect(self.matrices[self._keys([key])[0]], self.programs,
+                           index=self.index, answered=self.answered[key])
+
+    def respondents(self, questions=None):
+        """Respondents mentioning each program in any of the questions"""
+        keys = self._keys(questions)
+        matrix = sum(self.matrices[k].astype(np.int64) for k in keys) > 0
+        answered = np.logical_or.reduce([self.answered[k] for k in keys])
+        return MultiSelect(matrix, self.programs, index=self.index, answered=answered)
+
+    def counts(self, questions=None):
+        """Answers mentioning each program, summed over the questions"""
+        totals = sum(np.asarray(self.matrices[k].sum(axis=0)).ravel() for k in self._keys(questions))
+        return pd.Series(totals, index=self.programs, dtype=np.int64)
+
+    def mask(self, program, questions=None):
+        """Rows whose answer to any of the questions mentions `program`"""
+        column = self.programs.index(program)
+        hits = np.zeros(len(next(iter(self.answered.values()))), dtype=bool)
+        for key in self._keys(questions):
+            hits |= self.matrices[key][:, column].toarray().ravel()
+        return pd.Series(hits, index=self.index)
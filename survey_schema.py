@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Survey Question Registry
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Canonical keys for every survey question. Export headers carry non-breaking
+spaces, trailing whitespace, embedded newlines and truncation ("..."), so
+stages ask for a question by key and the registry resolves the key to the
+real header once per load:
+
+    schema = SurveySchema.resolve(df.columns)
+    df[schema['barriers']]
+"""
+
+import re
+import unicodedata
+from collections import namedtuple
+
+# kind: id, datetime, email, choice (single answer), likert (ordered single
+# answer), multi (select-all-that-apply, ';'-separated) or text (open-ended)
+Question = namedtuple('Question', ['key', 'header', 'kind'])
+
+QUESTIONS = [
+    Question('id', 'ID', 'id'),
+    Question('start_time', 'Start time', 'datetime'),
+    Question('completion_time', 'Completion time', 'datetime'),
+    Question('email', 'Email', 'email'),
+    Question('name', 'Name', 'text'),
+    Question('language', 'Language', 'choice'),
+    Question('role', "How would you describe your role or relationship with Austin's creative community? (Select all that apply)", 'multi'),
+    Question('experiences', 'Which types of arts and culture experiences do you most enjoy? (Select all that apply.)', 'multi'),
+    Question('venues', 'Which Austin-based venues or cultural spaces do you frequently visit for arts, culture and entertainment?', 'text'),
+    Question('info_sources', 'How do you typically learn about arts, music, and cultural events in Austin? (Select all that apply.)', 'multi'),
+    Question('preferred_language', 'What is your preferred language for receiving information and participating in discussions?', 'choice'),
+    Question('zip', 'What zip code do you reside in?', 'choice'),
+    Question('council_district', 'What Austin City Council District do you live in?', 'choice'),
+    Question('county', "Cultural funding grant applicants are eligible to apply within Austin's Extraterritorial Jurisdiction. Do you live within any of the counties below?", 'choice'),
+    Question('participation', 'How often do you attend or participate in arts, cultural, or entertainment events in Austin?', 'likert'),
+    Question('importance', 'How important is it to you that Austin preserves and supports its local arts, culture, music scene and historic character?', 'likert'),
+    Question('equal_access', 'Do you feel that all Austin residents have equal access to arts, cultural, music, and entertainment opportunities?', 'likert'),
+    Question('barriers', 'What barriers, if any, prevent you from participating in arts and culture events in Austin? (Select all that apply.)', 'multi'),
+    Question('challenges', "What do you believe are the biggest challenges facing Austin's arts, culture, and music scene? (Select up to 3)", 'multi'),
+    # The export truncates this header; it is matched by prefix
+    Question('support_organizations', "Austin's creative community has built a strong foundation of existing organizations that informs ACME's goals and mission. How do you believe ACME should better support these organizations and cul...", 'text'),
+    Question('more_opportunities', 'What type of cultural arts or entertainment opportunities would you like to see more of in Austin?', 'text'),
+    Question('awareness', 'Prior to this survey, were you aware of the following programs administered by the City of Austin/ACME? (Select all that you are aware of; checkboxes for each program)', 'multi'),
+    Question('applied', 'Have you ever applied for or received funding from any of these programs?', 'choice'),
+    Question('applied_program', 'If yes, please specify which program.', 'text'),
+    Question('satisfaction', 'How would you rate your level of satisfaction with these programs overall?', 'likert'),
+    Question('accessibility', 'How accessible do you think these programs are for historically underrepresented artists, organizations, and communities?', 'likert'),
+    Question('improvements', 'What improvements would you like to see in these cultural funding programs?', 'text'),
+    Question('values', "What values do you believe should guide ACME's mission and vision? (Select up to 3)", 'multi'),
+    Question('access_barriers', 'What barriers do you or your community face in accessing support or services related to arts, culture, music, and entertainment?', 'text'),
+    Question('priorities', 'What should ACME prioritize as its top goals over the next five years? (Select up to 3)', 'multi'),
+    Question('outcomes', "What outcomes or impacts would you most like to see from ACME's work? (Select up to 3)", 'multi'),
+    Question('programs_services', 'What kinds of programs or services would you like ACME to offer that currently do not exist or are underrepresented?', 'text'),
+    Question('focus_group_interest', "Would you be interested in participating in focus groups or community discussions to help shape policies and initiatives supporting Austin's creative scene?", 'choice'),
+    Question('stay_informed', 'How would you like to stay informed and involved with ACME initiatives and planning efforts? (Select all that apply)', 'multi'),
+    Question('focus_group_signup', 'Would you like to participate in our upcoming focus groups to discuss the future of ACME Cultural Funding programs?', 'choice'),
+    Question('contact_email', 'If yes, please include your email address below.', 'email'),
+    Question('additional_feedback', 'Do you have any additional ideas, concerns, or feedback you would like to share to help ACME better serve the public?', 'text'),
+]
+
+QUESTIONS_BY_KEY = {q.key: q for q in QUESTIONS}
+
+_TRUNCATION = re.compile(r'(\.\.\.|…)$')
+_QUOTES = str.maketrans({'‘': "'", '’': "'", '“': '"', '”': '"'})
+
+
+def normalize_header(header):
+    """Header text with whitespace, quotes, case and truncation normalized
+
+    Returns (text, truncated) where `truncated` marks headers that ended in
+    an ellipsis and should be matched by prefix.
+    """
+    text = unicodedata.normalize('NFKC', str(header)).translate(_QUOTES)
+    text = re.sub(r'\s+', ' ', text).strip()
+    truncated = bool(_TRUNCATION.search(text))
+    text = _TRUNCATION.sub('', text).rstrip().casefold()
+    return text, truncated
+
+
+class SurveySchema:
+    """Question keys resolved against the headers of one loaded survey"""
+
+    def __init__(self, columns, missing, unregistered):
+        self.columns = columns
+        self.missing = missing
+        self.unregistered = unregistered
+
+    @classmethod
+    def resolve(cls, headers, questions=QUESTIONS):
+        """Match every registered question to one of `headers`"""
+        exact = {}
+        truncated_headers = []
+        for header in headers:
+            text, truncated = normalize_header(header)
+            exact.setdefault(text, header)
+            if truncated:
+                truncated_headers.append((text, header))
+
+        columns = {}
+        missing = []
+        for question in questions:
+            text, truncated = normalize_header(question.header)
+            header = exact.get(text)
+            if header is None:
+                header = _match_prefix(text, truncated, exact, truncated_headers)
+            if header is None:
+                missing.append(question.key)
+            else:
+                columns[question.key] = header
+
+        matched = set(columns.values())
+        unregistered = [h for h in headers if h not in matched]
+        return cls(columns, missing, unregistered)
+
+    def __getitem__(self, key):
+        try:
+            return self.columns[key]
+        except KeyError:
+            if key not in QUESTIONS_BY_KEY:
+                raise KeyError(f"Unknown question key {key!r}") from None
+            raise KeyError(f"Question {key!r} is not in this survey export "
+                           f"(expected header: {QUESTIONS_BY_KEY[key].header!r})") from None
+
+    def __contains__(self, key):
+        return key in self.columns
+
+    def get(self, key, default=None):
+        return self.columns.get(key, default)
+
+    def kind(self, key):
+        return QUESTIONS_BY_KEY[key].kind
+
+    def keys(self, kind=None):
+        """Resolved question keys, optionally only those of one kind"""
+        return [k for k in self.columns if kind is None or QUESTIONS_BY_KEY[k].kind == kind]
+
+    def require(self, *keys):
+        """Raise KeyError naming every requested question that did not resolve"""
+        absent = [k for k in keys if k not in self.columns]
+        if absent:
+            unknown = [k for k in absent if k not in QUESTIONS_BY_KEY]
+            if unknown:
+                raise KeyError(f"Unknown question key(s): {', '.join(unknown)}")
+            raise KeyError(f"Survey export is missing required question(s): {', '.join(absent)}")
+        return self
+
+    def projection(self, keys):
+        """Headers to read so that `keys` are available, for load_survey"""
+        self.require(*keys)
+        return [self.columns[k] for k in keys]
+
+    def report(self):
+        """Human-readable summary of how the registry matched this export"""
+        lines = [f"Resolved {len(self.columns)} of {len(QUESTIONS)} registered questions"]
+        for key in self.missing:
+            lines.append(f"  MISSING  {key}: {QUESTIONS_BY_KEY[key].header}")
+        for header in self.unregistered:
+            lines.append(f"  UNREGISTERED  {header!r}")
+        return '\n'.join(lines)
+
+
+def _match_prefix(text, truncated, exact, truncated_headers):
+    """Fallback for headers cut off with '...' on either side"""
+    if truncated:
+        candidates = [h for t, h in exact.items() if t.startswith(text)]
+        if len(candidates) == 1:
+            return candidates[0]
+    candidates = [h for t, h in truncated_headers if text.startswith(t)]
+    if len(candidates) == 1:
+        return candidates[0]
+    return None
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Batched Sentiment Engine
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Scores a whole text column with VADER (or TextBlob) in one call. Identical
+answers are scored once, large batches are split over a process pool, and
+the scores come back as NumPy arrays aligned to the respondent index (NaN
+where there is no answer, or where the analyzer failed). Scores are kept in
+the persistent store (see survey_sentiment_store), so each answer is scored
+once across runs:
+
+    scores = dataset.sentiment('improvements')
+    scores.compound                              # one float per respondent
+    scores.counts()                              # positive / negative / neutral
+    scores.subset(mask).mean()
+    dataset.sentiment('improvements', 'textblob')['polarity']
+
+'vader-lexicon' scores with the same rules as NumPy operations over the
+whole batch (see survey_vader).
+"""
+
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# VADER's conventional cut-offs on the compound score
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+# Score columns of each analyzer, in array order (the first is the headline score)
+SCORE_FIELDS = ['compound', 'pos', 'neg', 'neu']
+TEXTBLOB_FIELDS = ['polarity', 'subjectivity']
+
+# Fewer distinct texts than this are scored in-process: starting a pool costs more
+MIN_PARALLEL_TEXTS = 2000
+# Texts per task sent to a worker
+CHUNK_SIZE = 500
+
+# The analyzer of the current process, created on first use
+_ANALYZER = None
+
+
+def vader_analyzer():
+    """NLTK's VADER analyzer, downloading its lexicon when missing"""
+    global _ANALYZER
+    if _ANALYZER is None:
+        import nltk
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        try:
+            _ANALYZER = SentimentIntensityAnalyzer()
+        except LookupError:
+            nltk.download('vader_lexicon', quiet=True)
+            _ANALYZER = SentimentIntensityAnalyzer()
+    return _ANALYZER
+
+
+def vader_version():
+    """NLTK release plus a digest of the lexicon, for keying stored scores"""
+    import nltk
+    lexicon = vader_analyzer().lexicon_file
+    digest = hashlib.sha256(lexicon.encode('utf-8')).hexdigest()[:12]
+    return f"nltk-{nltk.__version__}-{digest}"
+
+
+def _score_chunk(texts):
+    """(len(texts) x 4) VADER scores; module-level so worker processes can run it"""
+    analyzer = vader_analyzer()
+    scores = np.empty((len(texts), len(SCORE_FIELDS)))
+    for i, text in enumerate(texts):
+        result = analyzer.polarity_scores(text)
+        scores[i] = [result[field] for field in SCORE_FIELDS]
+    return scores
+
+
+def _textblob_chunk(texts):
+    """(len(texts) x 2) TextBlob polarity/subjectivity, NaN where TextBlob fails"""
+    from textblob import TextBlob
+    scores = np.full((len(texts), len(TEXTBLOB_FIELDS)), np.nan)
+    for i, text in enumerate(texts):
+        try:
+            sentiment = TextBlob(text).sentiment
+        except Exception:
+            continue
+        scores[i] = [sentiment.polarity, sentiment.subjectivity]
+    return scores
+
+
+def classify(compound):
+    """'positive', 'negative' or 'neutral' per compound score (None where NaN)"""
+    compound = np.asarray(compound, dtype=float)
+    labels = np.select([compound >= POSITIVE_THRESHOLD, compound <= NEGATIVE_THRESHOLD],
+                       ['positive', 'negative'], 'neutral').astype(object)
+    labels[np.isnan(compound)] = None
+    return labels
+
+
+class SentimentScores:
+    """Per-respondent sentiment scores for one text column"""
+
+    def __init__(self, scores, index, answered, failed=None, fields=SCORE_FIELDS):
+        self.scores = scores                # respondents x fields, NaN if not scored
+        self.index = index
+        self.answered = answered            # rows with an answer (possibly blank)
+        # Rows with a non-blank answer the analyzer could not score
+        self.failed = np.zeros(len(index), dtype=bool) if failed is None else failed
+        self.fields = list(fields)
+
+    def __getitem__(self, field):
+        return self.scores[:, self.fields.index(field)]
+
+    @property
+    def compound(self):
+        return self['compound']
+
+    @property
+    def pos(self):
+        return self['pos']
+
+    @property
+    def neg(self):
+        return self['neg']
+
+    @property
+    def neu(self):
+        return self['neu']
+
+    @property
+    def headline(self):
+        """The analyzer's summary score (VADER compound, TextBlob polarity)"""
+        return self.scores[:, 0]
+
+    @property
+    def scored(self):
+        """Rows with a score (non-blank answers that did not fail)"""
+        return ~np.isnan(self.headline)
+
+    @property
+    def n_failed(self):
+        return int(self.failed.sum())
+
+    def __len__(self):
+        return len(self.index)
+
+    def subset(self, rows):
+        """Scores with the rows outside a boolean mask left unanswered"""
+        keep = np.asarray(rows, dtype=bool)
+        scores = np.where(keep[:, None], self.scores, np.nan)
+        return SentimentScores(scores, self.index, self.answered & keep, self.failed & keep,
+                               self.fields)
+
+    def labels(self):
+        return pd.Series(classify(self.headline), index=self.index, name='sentiment')
+
+    def counts(self):
+        """{'positive': n, 'negative': n, 'neutral': n} over the scored answers"""
+        compound = self.headline[self.scored]
+        positive = int((compound >= POSITIVE_THRESHOLD).sum())
+        negative = int((compound <= NEGATIVE_THRESHOLD).sum())
+        return {'positive': positive, 'negative': negative,
+                'neutral': len(compound) - positive - negative}
+
+    def mean(self):
+        """Average headline score of the scored answers"""
+        headline = self.headline[self.scored]
+        return float(headline.mean()) if len(headline) else float('nan')
+
+    def frame(self):
+        return pd.DataFrame(self.scores, index=self.index, columns=self.fields)
+
+
+class SentimentEngine(ABC):
+    """Scores text columns, each distinct text once
+
+    Subclasses name the analyzer, its score fields, its version and the
+    module-level function scoring a chunk of texts. With a
+    survey_sentiment_store.SentimentStore, texts scored by any earlier run
+    are read back instead of being scored again.
+    """
+
+    analyzer = None
+    fields = SCORE_FIELDS
+
+    def __init__(self, processes=None, chunk_size=CHUNK_SIZE, min_parallel=MIN_PARALLEL_TEXTS,
+                 store=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.min_parallel = min_parallel
+        self.store = store
+
+    @property
+    @abstractmethod
+    def version(self):
+        """String keying this analyzer's stored scores"""
+
+    @staticmethod
+    @abstractmethod
+    def score_chunk(texts):
+        """(len(texts) x fields) scores; subclasses assign a module-level function, so workers can run it"""
+
+    def score_texts(self, texts):
+        """(len(texts) x fields) scores for a list of distinct texts"""
+        if len(texts) < self.min_parallel or self.processes == 1:
+            return self.score_chunk(texts)
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            return np.concatenate(list(executor.map(self.score_chunk, chunks)))
+
+    def score(self, series):
+        """SentimentScores for a text column; blank answers are left unscored"""
+        answered = series.notna().to_numpy()
+        text = series[answered].astype(str)
+        rows = np.flatnonzero(answered)[(text.str.strip() != '').to_numpy()]
+        codes, unique = pd.factorize(series.iloc[rows].astype(str).to_numpy())
+        scores = np.full((len(series), len(self.fields)), np.nan)
+        if len(unique):
+            unique = list(unique)
+            if self.store is not None:
+                unique_scores = self.store.score(unique, self.analyzer, self.version, self.score_texts)
+            else:
+                unique_scores = self.score_texts(unique)
+            scores[rows] = unique_scores[codes]
+        failed = np.zeros(len(series), dtype=bool)
+        failed[rows] = np.isnan(scores[rows, 0])
+        return SentimentScores(scores, series.index, answered, failed, self.fields)
+
+
+class VaderEngine(SentimentEngine):
+    """NLTK VADER: compound, pos, neg, neu"""
+
+    analyzer = 'vader'
+    fields = SCORE_FIELDS
+    score_chunk = staticmethod(_score_chunk)
+
+    @property
+    def version(self):
+        return vader_version()
+
+
+class TextBlobEngine(SentimentEngine):
+    """TextBlob's pattern analyzer: polarity, subjectivity"""
+
+    analyzer = 'textblob'
+    fields = TEXTBLOB_FIELDS
+    score_chunk = staticmethod(_textblob_chunk)
+
+    @property
+    def version(self):
+        from importlib.metadata import version
+        return f"textblob-{version('textblob')}"
+
+
+# Engines by analyzer name, for dataset.sentiment()
+ENGINES = {'vader': VaderEngine, 'textblob': TextBlobEngine}
+
+
+def engine_for(analyzer, store=None):
+    """Engine for an analyzer name: 'vader', 'vader-lexicon' or 'textblob'"""
+    if analyzer == 'vader-lexicon':
+        # Imported here: survey_vader builds on this module
+        from survey_vader import LexiconVaderEngine
+        return LexiconVaderEngine(store=store)
+    if analyzer not in ENGINES:
+        raise ValueError(f"Unknown sentiment analyzer: {analyzer!r}")
+    return ENGINES[analyzer](store=store)
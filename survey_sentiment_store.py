@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Persistent Sentiment Score Store
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Keeps every sentiment score ever computed in one SQLite file next to the
+survey cache, keyed by (normalized text hash, analyzer, analyzer version).
+Scores are looked up in bulk and only the misses are computed, so rerunning
+after a new wave costs in proportion to the new answers, and every stage
+and script scoring the same answer reuses one result:
+
+    store = SentimentStore.for_source('ACME.xlsx')
+    scores = store.score(texts, 'vader', version, compute)   # compute(misses) -> array
+
+Changing the analyzer or its lexicon changes the version, so stale scores
+are never returned; they stay in the file until it is deleted.
+"""
+
+import hashlib
+import os
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+
+from survey_loader import cache_dir_for
+
+STORE_FILE_NAME = 'sentiment.sqlite'
+
+# Keys per SELECT, below SQLite's bound-parameter limit
+LOOKUP_BATCH = 500
+
+
+def normalize_for_hash(text):
+    """Text as scored, minus surrounding whitespace (which no analyzer reads)"""
+    return str(text).strip()
+
+
+def text_hash(text):
+    return hashlib.blake2b(normalize_for_hash(text).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class SentimentStore:
+    """(text hash, analyzer, version) -> score vector, in SQLite"""
+
+    def __init__(self, path):
+        self.path = path
+        # Hits and misses of the last score() call
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn, conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS scores (
+                                text_hash TEXT NOT NULL,
+                                analyzer TEXT NOT NULL,
+                                version TEXT NOT NULL,
+                                scores BLOB NOT NULL,
+                                PRIMARY KEY (text_hash, analyzer, version))""")
+
+    @classmethod
+    def for_source(cls, source):
+        """The store shared by every export in the source's cache directory"""
+        return cls(os.path.join(cache_dir_for(source), STORE_FILE_NAME))
+
+    def _connect(self):
+        """A connection closed on leaving the block (sqlite3's own block only commits)"""
+        # Several pipeline processes may write at once; wait rather than fail
+        return closing(sqlite3.connect(self.path, timeout=30))
+
+    def lookup(self, hashes, analyzer, version):
+        """{text hash: score vector} for the hashes already stored"""
+        found = {}
+        with self._connect() as conn, conn:
+            for start in range(0, len(hashes), LOOKUP_BATCH):
+                batch = hashes[start:start + LOOKUP_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                rows = conn.execute(
+                    f"SELECT text_hash, scores FROM scores WHERE analyzer = ? AND version = ? "
+                    f"AND text_hash IN ({placeholders})", [analyzer, version, *batch])
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype='<f8')
+        return found
+
+    def put(self, hashes, scores, analyzer, version):
+        """Store one score vector per hash (a texts x fields array)"""
+        scores = np.asarray(scores, dtype='<f8')
+        with self._connect() as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO scores (text_hash, analyzer, version, scores) VALUES (?, ?, ?, ?)",
+                [(key, analyzer, version, row.tobytes()) for key, row in zip(hashes, scores)])
+
+    def score(self, texts, analyzer, version, compute):
+        """(len(texts) x fields) scores, computing only texts not stored yet
+
+        `compute` takes a list of texts and returns their scores as an array.
+        """
+        hashes = [text_hash(text) for text in texts]
+        found = self.lookup(sorted(set(hashes)), analyzer, version)
+        missing = {}
+        for text, key in zip(texts, hashes):
+            if key not in found:
+                missing.setdefault(key, text)
+        self.hits = len(texts) - sum(1 for key in hashes if key not in found)
+        self.misses = len(missing)
+        if missing:
+            computed = np.asarray(compute(list(missing.values())), dtype=float)
+            self.put(list(missing), computed, analyzer, version)
+            found.update(zip(missing, computed))
+        if not texts:
+            return np.zeros((0, 0))
+        return np.stack([found[key] for key in hashes])
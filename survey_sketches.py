@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Streaming Theme Sketches
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Counts words and phrases over text streams of any size in fixed memory.
+A Space-Saving summary keeps the heavy hitters (the top-k candidates with
+per-term error bounds) and a Count-Min sketch answers point queries for
+any term. Both merge exactly, so sketches built per wave, per city or per
+year combine into one summary without revisiting the text:
+
+    sketch = ThemeSketch(stop_words=stop_words)
+    for texts in iter_text_batches('ACME.xlsx', ['improvements']):
+        sketch.add_texts(texts)
+    sketch.top(15)                        # [(term, count, max overcount), ...]
+    sketch.merge(other_wave_sketch)
+
+From the command line:
+
+    python survey_sketches.py ACME.xlsx wave2.xlsx --question improvements --top 20
+"""
+
+import base64
+import hashlib
+import math
+import os
+from collections import Counter
+
+import numpy as np
+
+from survey_loader import HAS_ARROW, build_cache, cache_path_for, load_survey
+from survey_schema import SurveySchema
+from survey_terms import MIN_WORD_LENGTH
+from survey_tokens import tokenize
+
+if HAS_ARROW:
+    import pyarrow.parquet as pq
+
+# Heavy-hitter capacity: any term above 1/CAPACITY of the total is retained
+CAPACITY = 2000
+# Count-Min: overcount <= e/WIDTH of the total, with probability 1 - e**-DEPTH
+CMS_WIDTH = 4096
+CMS_DEPTH = 5
+
+# Rows per batch when streaming answers from the survey cache
+BATCH_ROWS = 5000
+
+
+def term_hash(term):
+    """Stable 64-bit hash of a term (Python's hash() changes between runs)"""
+    return int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class CountMinSketch:
+    """Approximate counts for any number of keys in a fixed-size table"""
+
+    def __init__(self, width=CMS_WIDTH, depth=CMS_DEPTH, table=None, total=0):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64) if table is None else table
+        self.total = total
+        # One multiply-shift hash per row, derived deterministically
+        self._multipliers = (np.arange(1, depth + 1, dtype=np.uint64)
+                             * np.uint64(0x9e3779b97f4a7c15)) | np.uint64(1)
+
+    def _columns(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        mixed = hashes[None, :] * self._multipliers[:, None]
+        return ((mixed >> np.uint64(32)) % np.uint64(self.width)).astype(np.intp)
+
+    def add(self, hashes, counts):
+        """Add counts for the keys with the given term hashes"""
+        counts = np.asarray(counts, dtype=np.int64)
+        columns = self._columns(hashes)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts)
+        self.total += int(counts.sum())
+
+    def estimate(self, hashes):
+        """Upper-bound count estimates (never below the true count)"""
+        columns = self._columns(hashes)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    @property
+    def error_bound(self):
+        """Maximum overcount of an estimate, with probability 1 - e**-depth"""
+        return math.e / self.width * self.total
+
+    def merge(self, other):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Count-Min sketches must have the same width and depth to merge")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def to_dict(self):
+        # The table is stored as base64 so JSON files stay compact
+        table = base64.b64encode(self.table.astype('<i8').tobytes()).decode('ascii')
+        return {'width': self.width, 'depth': self.depth, 'total': int(self.total), 'table': table}
+
+    @classmethod
+    def from_dict(cls, data):
+        table = np.frombuffer(base64.b64decode(data['table']), dtype='<i8')
+        return cls(data['width'], data['depth'], table.reshape(data['depth'], data['width']).copy(),
+                   data['total'])
+
+
+class SpaceSaving:
+    """Top-k heavy hitters with at most `capacity` counters (weighted Space-Saving)
+
+    Each counter holds (count, error): the true count lies in
+    [count - error, count], and any term occurring more than total/capacity
+    times is guaranteed to be held.
+    """
+
+    def __init__(self, capacity=CAPACITY, counters=None, total=0):
+        self.capacity = capacity
+        self.counters = dict(counters or {})    # term -> [count, error]
+        self.total = total
+
+    def _min_count(self):
+        return min(c for c, _ in self.counters.values()) if len(self.counters) >= self.capacity else 0
+
+    def update(self, counts):
+        """Add a batch of exact {term: count}"""
+        self._combine(counts.items(), 0, sum(counts.values()))
+        return self
+
+    def merge(self, other):
+        """Combine two summaries (terms missing from one get its minimum as error)"""
+        other_counters = ((t, (c, e)) for t, (c, e) in other.counters.items())
+        self._combine(other_counters, other._min_count(), other.total, errors=True)
+        return self
+
+    def _combine(self, items, other_floor, other_total, errors=False):
+        """Mergeable Space-Saving: add both sides' counts, keep the `capacity` largest
+
+        A term absent from a full summary may have occurred up to that
+        summary's smallest count, which is added to both its count and error.
+        """
+        floor = self._min_count()
+        merged = {t: [c + other_floor, e + other_floor] for t, (c, e) in self.counters.items()}
+        for term, value in items:
+            count, error = value if errors else (value, 0)
+            counter = merged.get(term)
+            if counter is None:
+                merged[term] = [floor + count, floor + error]
+            else:
+                counter[0] += count - other_floor
+                counter[1] += error - other_floor
+        keep = sorted(merged, key=lambda t: (-merged[t][0], t))[:self.capacity]
+        self.counters = {t: merged[t] for t in keep}
+        self.total += other_total
+
+    def top(self, k=10):
+        """[(term, count, error), ...] by estimated count"""
+        ranked = sorted(self.counters.items(), key=lambda item: (-item[1][0], item[0]))[:k]
+        return [(term, count, error) for term, (count, error) in ranked]
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'total': self.total,
+                'counters': {t: list(map(int, c)) for t, c in self.counters.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['capacity'], {t: list(c) for t, c in data['counters'].items()},
+                   data['total'])
+
+
+class ThemeSketch:
+    """Streaming word and phrase counts: Space-Saving heavy hitters + Count-Min"""
+
+    def __init__(self, ngrams=(1, 2), stop_words=(), min_length=MIN_WORD_LENGTH,
+                 heavy=None, cms=None):
+        self.ngrams = tuple(ngrams)
+        self.stop_words = set(stop_words)
+        self.min_length = min_length
+        self.heavy = heavy or SpaceSaving()
+        self.cms = cms or CountMinSketch()
+
+    def _usable(self, token):
+        word = token.replace("'", '')
+        return word.isalpha() and len(word) >= self.min_length and word not in self.stop_words
+
+    def _terms(self, text):
+        """Words and phrases of one answer (same rules as survey_terms)"""
+        tokens = [t.lower() for t in tokenize(text)]
+        usable = [self._usable(t) for t in tokens]
+        for n in self.ngrams:
+            for i in range(len(tokens) - n + 1):
+                if usable[i] and usable[i + n - 1]:
+                    yield ' '.join(tokens[i:i + n])
+
+    def add_texts(self, texts):
+        """Fold a batch of answers into the sketch; only the batch is held in memory"""
+        counts = Counter()
+        for text in texts:
+            if text is not None and not (isinstance(text, float) and np.isnan(text)):
+                counts.update(self._terms(text))
+        if not counts:
+            return self
+        self.heavy.update(counts)
+        self.cms.add([term_hash(t) for t in counts], list(counts.values()))
+        return self
+
+    def merge(self, other):
+        self.heavy.merge(other.heavy)
+        self.cms.merge(other.cms)
+        return self
+
+    @property
+    def total(self):
+        return self.cms.total
+
+    def estimate(self, term):
+        """Upper-bound count for any term, tracked as a heavy hitter or not"""
+        counter = self.heavy.counters.get(term)
+        sketch = int(self.cms.estimate([term_hash(term)])[0])
+        return min(counter[0], sketch) if counter else sketch
+
+    def top(self, k=10, ngram=None):
+        """[(term, count, max overcount), ...] for the top-k words and/or phrases
+
+        The count is the tighter of the Space-Saving and Count-Min upper
+        bounds; the true count is at least count - max overcount.
+        """
+        ranked = []
+        for term, count, error in self.heavy.top(len(self.heavy.counters)):
+            if ngram is not None and len(term.split()) not in np.atleast_1d(ngram):
+                continue
+            sketch = int(self.cms.estimate([term_hash(term)])[0])
+            best = min(count, sketch)
+            ranked.append((term, best, error - (count - best)))
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return [(term, count, max(error, 0)) for term, count, error in ranked[:k]]
+
+    def to_dict(self):
+        return {'ngrams': list(self.ngrams), 'min_length': self.min_length,
+                'heavy': self.heavy.to_dict(), 'cms': self.cms.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data, stop_words=()):
+        return cls(data['ngrams'], stop_words, data['min_length'],
+                   SpaceSaving.from_dict(data['heavy']), CountMinSketch.from_dict(data['cms']))
+
+
+def iter_text_batches(path, keys, batch_rows=BATCH_ROWS):
+    """Answers to the given text questions, `batch_rows` rows at a time
+
+    Reads the Parquet cache in batches when pyarrow is available, so memory
+    stays bounded however large the export is.
+    """
+    if not HAS_ARROW:
+        df = load_survey(path)
+        columns = [SurveySchema.resolve(df.columns)[k] for k in keys]
+        for start in range(0, len(df), batch_rows):
+            chunk = df.iloc[start:start + batch_rows]
+            yield [text for col in columns for text in chunk[col].dropna()]
+        return
+    cache_path = cache_path_for(path)
+    if not os.path.exists(cache_path):
+        build_cache(path, cache_path)
+    schema = SurveySchema.resolve(pq.read_schema(cache_path).names).require(*keys)
+    columns = [schema[k] for k in keys]
+    for batch in pq.ParquetFile(cache_path).iter_batches(batch_size=batch_rows, columns=columns):
+        yield [text for col in batch.columns for text in col.to_pylist() if text is not None]
+
+
+def english_stop_words():
+    """NLTK's English stopwords, or none when NLTK or its corpus is missing"""
+    try:
+        from nltk.corpus import stopwords
+        return set(stopwords.words('english'))
+    except (ImportError, LookupError):
+        return set()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Streaming top themes over one or more survey exports')
+    parser.add_argument('exports', nargs='+')
+    parser.add_argument('--question', action='append', dest='questions',
+                        help='survey_schema text question key (repeatable; default improvements)')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    stop_words = english_stop_words()
+    merged = None
+    for export in args.exports:
+        # One sketch per export, merged: the same as sketching them together
+        sketch = ThemeSketch(stop_words=stop_words)
+        for texts in iter_text_batches(export, args.questions or ['improvements']):
+            sketch.add_texts(texts)
+        merged = sketch if merged is None else merged.merge(sketch)
+
+    print(f"{merged.total:,} words and phrases counted; Count-Min overcount "
+          f"<= {merged.cms.error_bound:.1f} with 99.3% probability")
+    for label, ngram in (('Words', 1), ('Phrases', 2)):
+        print(f"\n{label}:")
+        for term, count, error in merged.top(args.top, ngram=ngram):
+            bound = f" (true count >= {count - error})" if error else ''
+            print(f"  {term}: {count}{bound}")
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Term-Document Matrix
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Builds one sparse answer x term matrix for several free-text questions in a
+single pass over their cached token ids (see survey_tokens). Terms are
+unigrams plus configurable bigrams/trigrams ("application process",
+"public transportation"), pruned by document frequency. Top themes for a
+question, a zip code or a role are then column sums over masked rows:
+
+    terms = TermMatrix.build({key: dataset.tokens(key) for key in keys},
+                             ngrams=(1, 2, 3), stop_words=stop_words)
+    terms.top(15, questions=['improvements'])
+    terms.top(10, ngram=2, rows=dataset.austin_mask())
+    terms.top_by_group(dataset.clean_zip(), k=5)
+    terms.top_by_option(dataset.multiselect('role'), k=5)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Shortest word counted as a theme
+MIN_WORD_LENGTH = 4
+
+
+def _word_mask(vocabulary, stop_words, min_length=MIN_WORD_LENGTH):
+    """Vocabulary ids usable as theme words: alphabetic, long enough, not stopwords
+
+    Apostrophes are ignored ("don't" is checked as "dont").
+    """
+    def usable(token):
+        word = token.replace("'", '')
+        return word.isalpha() and len(word) >= min_length and word not in stop_words
+    return vocabulary.mask(usable)
+
+
+class TermMatrix:
+    """Sparse answer x term counts over one or more text questions"""
+
+    def __init__(self, matrix, terms, term_ngrams, doc_rows, doc_fields, fields, n_rows):
+        self.matrix = matrix                    # answers x terms (csr)
+        self.terms = np.asarray(terms, dtype=object)
+        self.term_ngrams = term_ngrams          # words in each term
+        self.doc_rows = doc_rows                # respondent row of each answer
+        self.doc_fields = doc_fields            # question (index into fields) of each answer
+        self.fields = list(fields)
+        self.n_rows = n_rows
+
+    @classmethod
+    def build(cls, columns, ngrams=(1, 2), min_df=2, stop_words=(), min_length=MIN_WORD_LENGTH):
+        """Term matrix for {question key: survey_tokens.TokenizedText}
+
+        Unigrams must pass the word filter (see _word_mask); longer n-grams
+        must start and end with such a word and may contain any words in
+        between. Terms found in fewer than `min_df` answers are dropped.
+        """
+        stop_words = set(stop_words)
+        doc_rows, doc_fields, token_docs, token_ids = [], [], [], []
+        n_docs = 0
+        vocabulary = None
+        for f, tokens in enumerate(columns.values()):
+            vocabulary = tokens.vocabulary
+            rows = np.flatnonzero(tokens.answered)
+            doc_of_row = np.full(len(tokens), -1, dtype=np.int64)
+            doc_of_row[rows] = n_docs + np.arange(len(rows))
+            n_docs += len(rows)
+            doc_rows.append(rows)
+            doc_fields.append(np.full(len(rows), f, dtype=np.int16))
+            token_docs.append(doc_of_row[tokens.rows()])
+            token_ids.append(tokens.token_ids(fold=True).astype(np.int64))
+        if vocabulary is None:
+            raise ValueError("No questions to build a term matrix from")
+        docs = np.concatenate(token_docs)
+        ids = np.concatenate(token_ids)
+        # Folding can grow the vocabulary, so build the mask afterwards
+        usable = _word_mask(vocabulary, stop_words, min_length)
+        n_words = len(vocabulary)
+        if n_words ** max(ngrams) >= 2 ** 63:
+            raise ValueError(f"Vocabulary of {n_words} words is too large for {max(ngrams)}-grams")
+
+        # Every n-gram of every answer, encoded as one integer key
+        term_docs, term_keys, term_sizes = [], [], []
+        for n in ngrams:
+            if n < 1 or n > 3:
+                raise ValueError(f"ngrams must be between 1 and 3, got {n}")
+            if len(ids) < n:
+                continue
+            starts = np.arange(len(ids) - n + 1)
+            ends = starts + n - 1
+            keep = (docs[starts] == docs[ends]) & usable[ids[starts]] & usable[ids[ends]]
+            starts = starts[keep]
+            key = np.zeros(len(starts), dtype=np.int64)
+            for offset in range(n):
+                key = key * n_words + ids[starts + offset]
+            term_docs.append(docs[starts])
+            term_keys.append(key)
+            term_sizes.append(np.full(len(starts), n, dtype=np.int8))
+        term_docs = np.concatenate(term_docs)
+        term_keys = np.concatenate(term_keys)
+        term_sizes = np.concatenate(term_sizes)
+
+        # Unigram and bigram keys can collide numerically, so key on the size too
+        codes, inverse = np.unique(np.stack([term_sizes.astype(np.int64), term_keys]),
+                                   axis=1, return_inverse=True)
+        inverse = inverse.ravel()
+        matrix = sparse.csr_matrix(
+            (np.ones(len(inverse), dtype=np.int32), (term_docs, inverse)),
+            shape=(n_docs, codes.shape[1]))
+        matrix.sum_duplicates()
+
+        # Document-frequency pruning
+        df_counts = np.bincount(matrix.indices, minlength=matrix.shape[1])
+        kept = np.flatnonzero(df_counts >= min_df)
+        matrix = matrix[:, kept]
+        sizes, keys = codes[0, kept], codes[1, kept]
+
+        strings = vocabulary.strings()
+        terms = []
+        for size, key in zip(sizes, keys):
+            words = []
+            for _ in range(size):
+                key, word = divmod(int(key), n_words)
+                words.append(strings[word])
+            terms.append(' '.join(reversed(words)))
+        return cls(matrix.tocsr(), terms, sizes.astype(np.int8), np.concatenate(doc_rows),
+                   np.concatenate(doc_fields), list(columns), len(next(iter(columns.values()))))
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def _doc_mask(self, questions=None, rows=None):
+        mask = np.ones(len(self), dtype=bool)
+        if questions is not None:
+            unknown = [q for q in questions if q not in self.fields]
+            if unknown:
+                raise KeyError(f"Questions not in the term matrix: {unknown}")
+            mask &= np.isin(self.doc_fields, [self.fields.index(q) for q in questions])
+        if rows is not None:
+            mask &= np.asarray(rows, dtype=bool)[self.doc_rows]
+        return mask
+
+    def _term_mask(self, ngram=None):
+        if ngram is None:
+            return np.ones(len(self.terms), dtype=bool)
+        return np.isin(self.term_ngrams, [ngram] if np.isscalar(ngram) else list(ngram))
+
+    def counts(self, questions=None, rows=None, ngram=None):
+        """Occurrences of each term in the selected answers"""
+        totals = np.asarray(self.matrix[self._doc_mask(questions, rows)].sum(axis=0)).ravel()
+        terms = self._term_mask(ngram)
+        return pd.Series(totals[terms], index=self.terms[terms], dtype=np.int64)
+
+    def top(self, k=10, questions=None, rows=None, ngram=None):
+        """[(term, count), ...] for the k most frequent terms"""
+        counts = self.counts(questions, rows, ngram)
+        counts = counts[counts > 0]
+        order = np.lexsort((counts.index.to_numpy(), -counts.to_numpy()))[:k]
+        return [(counts.index[i], int(counts.iat[i])) for i in order]
+
+    def _top_per_group(self, indicator, labels, k, questions, ngram):
+        """Top terms per group given a groups x respondents indicator"""
+        docs = self._doc_mask(questions)
+        # groups x answers, through each answer's respondent
+        to_docs = sparse.csr_matrix(
+            (np.ones(docs.sum(), dtype=np.int64), (self.doc_rows[docs], np.flatnonzero(docs))),
+            shape=(self.n_rows, len(self)))
+        totals = (indicator @ to_docs @ self.matrix).toarray()
+        terms = self._term_mask(ngram)
+        names = self.terms[terms]
+        result = {}
+        for label, row in zip(labels, totals[:, terms]):
+            order = np.lexsort((names, -row))[:k]
+            result[label] = [(names[i], int(row[i])) for i in order if row[i] > 0]
+        return result
+
+    def top_by_group(self, groups, k=10, questions=None, ngram=None):
+        """{group: [(term, count), ...]} for a label per respondent (e.g. zip)
+
+        Respondents with a missing label are left out.
+        """
+        codes, labels = pd.factorize(pd.Series(np.asarray(groups)))
+        keep = codes >= 0
+        indicator = sparse.csr_matrix(
+            (np.ones(keep.sum(), dtype=np.int64), (codes[keep], np.flatnonzero(keep))),
+            shape=(len(labels), self.n_rows))
+        return self._top_per_group(indicator, list(labels), k, questions, ngram)
+
+    def top_by_option(self, selections, k=10, questions=None, ngram=None):
+        """{option: [(term, count), ...]} for a multi-select question (e.g. role)
+
+        A respondent's answers count towards every option they selected.
+        """
+        indicator = selections.matrix.T.astype(np.int64).tocsr()
+        return self._top_per_group(indicator, selections.options, k, questions, ngram)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Keyword Theme Matcher
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Tags open-ended responses with themes using one Aho-Corasick automaton per
+theme set, so every keyword of every theme is found in a single scan of each
+response. Matches respect word boundaries ('ada' no longer matches 'canada',
+'far' no longer matches 'fare'); a trailing '*' makes a keyword a prefix
+('transport*' matches 'transportation'), and keywords listed as
+case-sensitive must match exactly ('ADA', not 'Ada'). pyahocorasick is used
+for the scan when installed, otherwise a pure-Python automaton.
+
+The result is a sparse response x theme matrix wrapped in a
+survey_multiselect.MultiSelect, so theme counts, rates and per-zip
+breakdowns work the same way as for multi-select questions:
+
+    themes = dataset.themes('access_barriers', 'access_barriers')
+    themes.most_common()
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from survey_multiselect import MultiSelect
+from survey_tokens import TOKEN_PATTERN
+
+# Optional C implementation of the automaton (pip install pyahocorasick)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# ACME grant programs and the ways respondents refer to them
+PROGRAM_ALIASES = {
+    'Nexus': ['nexus'],
+    'Heritage': ['Heritage', 'HERITAGE', 'heritage grant*', 'heritage program*',
+                 'heritage preservation', 'HPG'],
+    'AIPP': ['aipp', 'art in public places', 'arts in public places'],
+    'Thrive': ['Thrive', 'THRIVE', 'thrive grant*', 'thrive program*', 'thrive fund*'],
+    'Elevate': ['Elevate', 'ELEVATE', 'elevate grant*', 'elevate program*', 'elevate fund*'],
+    'ALMF': ['almf', 'live music fund*', 'music fund grant*'],
+    'CSAP': ['csap', 'creative space assistance', 'creative space program*',
+             'creative spaces program*'],
+}
+
+# Theme sets: name -> ({theme: [keywords]}, case-sensitive keywords)
+THEME_SETS = {
+    # Open-ended access barriers (equity_analysis)
+    'access_barriers': ({
+        'financial': ['cost*', 'expensive', 'afford*', 'money', 'fee', 'fees', 'price*', 'pricing',
+                      'budget*', 'income*', 'economic*'],
+        'transportation': ['transport*', 'parking', 'bus', 'buses', 'drive', 'driving', 'distance*',
+                           'far', 'location*', 'travel*'],
+        'information': ['know*', 'aware*', 'information', 'communicat*', 'find', 'finding',
+                        'discover*', 'marketing'],
+        'time': ['time', 'times', 'schedul*', 'busy', 'work*', 'hours', 'weekend*', 'evening*'],
+        'language': ['language*', 'english', 'spanish', 'translat*', 'bilingual'],
+        'digital': ['online', 'website*', 'internet', 'computer*', 'technolog*', 'digital'],
+        'childcare': ['child*', 'kids', 'family', 'families', 'babysit*'],
+        'disability': ['accessible', 'accessibility', 'disab*', 'wheelchair*', 'mobility', 'ADA'],
+    }, {'ADA'}),
+    # Selected barrier options (generate_visualizations)
+    'barrier_types': ({
+        'Cost/Admission': ['cost*', 'admission*', 'ticket*'],
+        'Transportation/Parking': ['transport*', 'parking'],
+        'Location/Distance': ['location*', 'distance*', 'neighborhood*'],
+        'Lack of Awareness': ['aware*', 'know*', 'information'],
+        'Time Constraints': ['time', 'times', 'schedul*'],
+        'Limited Diversity': ['divers*', 'represent*', 'inclusion', 'inclusive'],
+        'Language Barriers': ['language*'],
+        'Accessibility Issues': ['accessib*', 'disab*'],
+        'Childcare': ['child*', 'family', 'families'],
+        'Safety Concerns': ['safe', 'safety', 'unsafe'],
+    }, set()),
+    # Program improvement suggestions (advanced_analysis)
+    'improvements': ({
+        'funding': ['fund', 'funds', 'funding', 'funded'],
+        'communication': ['communicat*'],
+        'equity': ['equity', 'equitable', 'inequit*'],
+        'access': ['access*'],
+        'process': ['process*'],
+        'transparency': ['transparen*'],
+        'diversity': ['divers*'],
+        'community': ['community', 'communities'],
+        'support': ['support*'],
+        'awareness': ['aware*'],
+    }, set()),
+    # Grant program names and aliases (survey_programs). Names that are also
+    # ordinary words count only when capitalized or followed by grant/program
+    'programs': (PROGRAM_ALIASES, {'Heritage', 'HERITAGE', 'HPG', 'Thrive', 'THRIVE',
+                                   'Elevate', 'ELEVATE'}),
+    # The same aliases in any case, for answers that can only name programs
+    'program_names': (PROGRAM_ALIASES, set()),
+}
+
+
+class ThemeMatcher:
+    """Aho-Corasick automaton over the keywords of a theme set"""
+
+    def __init__(self, themes, case_sensitive=()):
+        self.themes = list(themes)
+        # Per keyword: (length, theme index, is prefix, exact text if case-sensitive)
+        self.keywords = []
+        self.goto = [{}]
+        self.output = [[]]
+        by_text = {}
+        for t, theme in enumerate(self.themes):
+            for keyword in themes[theme]:
+                prefix = keyword.endswith('*')
+                text = keyword.rstrip('*')
+                exact = text if keyword in case_sensitive or text in case_sensitive else None
+                by_text.setdefault(text.lower(), []).append(len(self.keywords))
+                self.keywords.append((len(text), t, prefix, exact))
+        for text, keyword_ids in by_text.items():
+            self._add(text, keyword_ids)
+        self._link()
+
+        # Every keyword is one word: themes can be read off token ids
+        self.single_token = all(TOKEN_PATTERN.fullmatch(text) for text in by_text)
+
+        self._automaton = None
+        if HAS_AHOCORASICK and by_text:
+            self._automaton = ahocorasick.Automaton()
+            for text, keyword_ids in by_text.items():
+                self._automaton.add_word(text, keyword_ids)
+            self._automaton.make_automaton()
+
+    def _add(self, text, keyword_ids):
+        state = 0
+        for ch in text:
+            if ch not in self.goto[state]:
+                self.goto.append({})
+                self.output.append([])
+                self.goto[state][ch] = len(self.goto) - 1
+            state = self.goto[state][ch]
+        self.output[state].extend(keyword_ids)
+
+    def _link(self):
+        """Breadth-first failure links, merging outputs along them"""
+        self.fail = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def _scan(self, lower):
+        """(end position, keyword ids) for every keyword occurrence"""
+        if self._automaton is not None:
+            yield from self._automaton.iter(lower)
+            return
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for i, ch in enumerate(lower):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                yield i, output[state]
+
+    def match(self, text):
+        """Indices of the themes found in `text`, in one pass over it"""
+        original = str(text)
+        lower = original.lower()
+        if len(lower) != len(original):
+            # Lowercasing changed the length; case-sensitive checks use lower
+            original = lower
+        keywords = self.keywords
+        n = len(lower)
+        found = set()
+        for i, keyword_ids in self._scan(lower):
+            for keyword_id in keyword_ids:
+                length, theme, prefix, exact = keywords[keyword_id]
+                if theme in found:
+                    continue
+                start = i - length + 1
+                if start > 0 and lower[start - 1].isalnum():
+                    continue
+                if not prefix and i + 1 < n and lower[i + 1].isalnum():
+                    continue
+                if exact is not None and original[start:i + 1] != exact:
+                    continue
+                found.add(theme)
+        return found
+
+    def encode(self, series):
+        """Sparse response x theme matrix for a column of free text"""
+        answered = series.notna().to_numpy()
+        rows, cols = [], []
+        for row in np.flatnonzero(answered):
+            for theme in self.match(series.iat[row]):
+                rows.append(row)
+                cols.append(theme)
+        matrix = sparse.csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)),
+                                   shape=(len(series), len(self.themes)), dtype=bool)
+        return MultiSelect(matrix, self.themes, index=series.index, answered=answered)
+
+    def encode_tokens(self, tokens, index=None):
+        """Theme matrix from a survey_tokens.TokenizedText
+
+        Each distinct vocabulary token is matched once and responses pick up
+        the themes of their tokens, so no response text is rescanned. Only
+        valid when every keyword is a single word (see `single_token`).
+        """
+        if not self.single_token:
+            raise ValueError("Theme set has multi-word keywords; use encode() on the text")
+        vocabulary = tokens.vocabulary
+        rows, cols = [], []
+        for token_id, token in enumerate(vocabulary.tokens):
+            for theme in self.match(token):
+                rows.append(token_id)
+                cols.append(theme)
+        token_themes = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)),
+                                         shape=(len(vocabulary), len(self.themes)))
+        matrix = (tokens.doc_matrix(fold=False) @ token_themes) > 0
+        return MultiSelect(matrix, self.themes, index=index, answered=tokens.answered)
+
+    def encode_options(self, selections):
+        """Theme matrix for a multi-select question, matching its option texts
+
+        Each option is scanned once; a respondent has a theme when any of
+        their selected options does.
+        """
+        option_themes = self.encode(pd.Series(selections.options, dtype=object)).matrix
+        matrix = (selections.matrix.astype(np.int64) @ option_themes.astype(np.int64)) > 0
+        return MultiSelect(matrix, self.themes, index=selections.index, answered=selections.answered)
+
+
+_MATCHERS = {}
+
+
+def matcher_for(theme_set):
+    """Compiled matcher for a named theme set, built once per process"""
+    if theme_set not in _MATCHERS:
+        themes, case_sensitive = THEME_SETS[theme_set]
+        _MATCHERS[theme_set] = ThemeMatcher(themes, case_sensitive)
+    return _MATCHERS[theme_set]
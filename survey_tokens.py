@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Cached Tokenization
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Normalizes and tokenizes every free-text answer exactly once into integer
+token-id arrays over one vocabulary shared by all questions. The arrays are
+saved next to the survey cache, so later runs skip the regex work entirely;
+theme counts, keyword tagging and the search index read the ids instead of
+re-cleaning the text.
+
+Token ids keep the original case ('ADA' and 'Ada' are different tokens);
+`fold=True` (the default for counts and matrices) maps each id to the id
+of its lowercase form:
+
+    tokens = dataset.tokens('improvements')
+    tokens.row(0)                                # token ids of one answer
+    tokens.counts()                              # lowercase token frequencies
+    tokens.doc_matrix()                          # answers x vocabulary counts
+"""
+
+import os
+import re
+import unicodedata
+
+import numpy as np
+from scipy import sparse
+
+from survey_loader import cache_dir_for
+
+# Bump when the tokenizer or file layout changes so old caches are rebuilt
+TOKEN_VERSION = 1
+
+# Words of letters/digits, keeping inner apostrophes ("don't" is one token)
+TOKEN_PATTERN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+
+def normalize_text(text):
+    """NFKC-normalized text with curly apostrophes straightened"""
+    return unicodedata.normalize('NFKC', str(text)).replace('’', "'")
+
+
+def tokenize(text):
+    """Word tokens of one answer, original case kept"""
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+class Vocabulary:
+    """Token strings <-> integer ids, shared by every tokenized question"""
+
+    def __init__(self, tokens=()):
+        self.tokens = []
+        self.ids = {}
+        self._folded = np.zeros(0, dtype=np.int32)
+        for token in tokens:
+            self.add(token)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def add(self, token):
+        """Id of a token, adding it when new"""
+        token_id = self.ids.get(token)
+        if token_id is None:
+            token_id = self.ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return token_id
+
+    def lookup(self, token):
+        """Id of a token, or -1 when it never occurs"""
+        return self.ids.get(token, -1)
+
+    def strings(self, ids=None):
+        """Token strings as an array, for all ids or the given ones"""
+        strings = np.array(self.tokens, dtype=object)
+        return strings if ids is None else strings[ids]
+
+    def folded(self):
+        """Array mapping every id to the id of its lowercase form"""
+        if len(self._folded) < len(self.tokens):
+            start = len(self._folded)
+            extra = [self.add(token.lower()) for token in self.tokens[start:]]
+            # Lowercase forms added above map to themselves
+            extra += list(range(start + len(extra), len(self.tokens)))
+            self._folded = np.concatenate([self._folded, np.array(extra, dtype=np.int32)])
+        return self._folded
+
+    def mask(self, predicate):
+        """Boolean array over ids: which token strings satisfy `predicate`"""
+        return np.fromiter((predicate(token) for token in self.tokens), dtype=bool,
+                           count=len(self.tokens))
+
+
+class TokenizedText:
+    """Token ids of every answer to one question, stored CSR-style"""
+
+    def __init__(self, ids, offsets, answered, vocabulary):
+        self.ids = ids                  # all token ids, answer after answer
+        self.offsets = offsets          # tokens of row i: ids[offsets[i]:offsets[i+1]]
+        self.answered = answered        # rows with a (possibly empty) answer
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_series(cls, series, vocabulary):
+        answered = series.notna().to_numpy()
+        lengths = np.zeros(len(series), dtype=np.int64)
+        ids = []
+        add = vocabulary.add
+        for row in np.flatnonzero(answered):
+            tokens = tokenize(series.iat[row])
+            lengths[row] = len(tokens)
+            ids.extend(add(token) for token in tokens)
+        offsets = np.zeros(len(series) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        return cls(np.array(ids, dtype=np.int32), offsets, answered, vocabulary)
+
+    def __len__(self):
+        return len(self.answered)
+
+    def lengths(self):
+        """Number of tokens in each answer"""
+        return np.diff(self.offsets)
+
+    def rows(self):
+        """Row of every token in `ids`"""
+        return np.repeat(np.arange(len(self), dtype=np.int32), self.lengths())
+
+    def positions(self):
+        """Position of every token within its answer"""
+        lengths = self.lengths()
+        return (np.arange(len(self.ids)) - np.repeat(self.offsets[:-1], lengths)).astype(np.int32)
+
+    def token_ids(self, fold=True):
+        return self.vocabulary.folded()[self.ids] if fold else self.ids
+
+    def row(self, i, fold=False):
+        """Token ids of one answer"""
+        ids = self.ids[self.offsets[i]:self.offsets[i + 1]]
+        return self.vocabulary.folded()[ids] if fold else ids
+
+    def decode(self, i, fold=False):
+        """Token strings of one answer"""
+        return self.vocabulary.strings(self.row(i, fold)).tolist()
+
+    def masked(self, rows):
+        """Copy keeping only the answers of the rows in a boolean mask"""
+        keep = np.asarray(rows, dtype=bool) & self.answered
+        lengths = np.where(keep, self.lengths(), 0)
+        offsets = np.zeros(len(self) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        return TokenizedText(self.ids[keep[self.rows()]], offsets, keep, self.vocabulary)
+
+    def counts(self, mask=None, fold=True):
+        """Occurrences of each vocabulary id, optionally within a row mask"""
+        ids = self.token_ids(fold)
+        if mask is not None:
+            ids = ids[np.asarray(mask, dtype=bool)[self.rows()]]
+        return np.bincount(ids, minlength=len(self.vocabulary))
+
+    def doc_matrix(self, fold=True):
+        """Sparse answers x vocabulary token counts"""
+        # Copied: summing duplicates sorts the index arrays in place
+        matrix = sparse.csr_matrix(
+            (np.ones(len(self.ids), dtype=np.int32), self.token_ids(fold), self.offsets),
+            shape=(len(self), len(self.vocabulary)), copy=True)
+        matrix.sum_duplicates()
+        return matrix
+
+
+class TokenStore:
+    """Tokenized text questions of one dataset, saved alongside its cache"""
+
+    def __init__(self, vocabulary, columns, path=None):
+        self.vocabulary = vocabulary
+        self.columns = columns
+        self.path = path
+
+    @classmethod
+    def for_dataset(cls, dataset, use_cache=True):
+        path = None
+        if use_cache and dataset.source_hash:
+            path = os.path.join(cache_dir_for(dataset.source),
+                                f"{dataset.source_hash}.v{TOKEN_VERSION}.tokens.npz")
+        if path and os.path.exists(path):
+            return cls.load(path)
+        return cls(Vocabulary(), {}, path)
+
+    def get(self, key, series):
+        """Token ids for a question, tokenizing (and saving) it on first use"""
+        if key not in self.columns:
+            self.columns[key] = TokenizedText.from_series(series, self.vocabulary)
+            if self.path:
+                self.save(self.path)
+        return self.columns[key]
+
+    def save(self, path):
+        """Write the vocabulary and every tokenized question to an .npz file"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        arrays = {'vocabulary': np.array(self.vocabulary.tokens, dtype=str),
+                  'keys': np.array(list(self.columns), dtype=str)}
+        for key, column in self.columns.items():
+            arrays[f'{key}.ids'] = column.ids
+            arrays[f'{key}.offsets'] = column.offsets
+            arrays[f'{key}.answered'] = column.answered
+        # Write then rename, so an interrupted save never leaves a truncated file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            vocabulary = Vocabulary(data['vocabulary'].tolist())
+            columns = {key: TokenizedText(data[f'{key}.ids'], data[f'{key}.offsets'],
+                                          data[f'{key}.answered'], vocabulary)
+                       for key in data['keys'].tolist()}
+        return cls(vocabulary, columns, path)
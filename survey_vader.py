@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Vectorized VADER Scorer
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Scores a batch of texts with VADER's lexicon and rules as NumPy operations
+over integer token-id arrays, instead of calling polarity_scores() once per
+answer. Texts are split into VADER's own tokens once, every distinct token
+is looked up in the lexicon once, and the negation, booster, capitalization
+and idiom windows become shifted copies of the flat id array (the previous
+three and next two tokens of every position), so the whole batch is scored
+with a fixed number of vector steps:
+
+    engine = LexiconVaderEngine()
+    dataset.sentiment('improvements', 'vader-lexicon')
+    python acme.py run --sentiment vader-lexicon
+
+The rules mirror NLTK's SentimentIntensityAnalyzer, including its quirk of
+scoring a repeated word with the context of its first occurrence;
+check_sentiment_parity.py reports how far the two disagree on an export.
+"""
+
+import string
+
+import numpy as np
+
+from survey_sentiment import SCORE_FIELDS, SentimentEngine, vader_analyzer, vader_version
+from survey_tokens import Vocabulary
+
+# Bump when the vectorized rules change so stored scores are recomputed
+VECTOR_VERSION = 1
+
+# VADER's normalization constant for the compound score
+ALPHA = 15
+
+_PUNCTUATION = set(string.punctuation)
+
+
+def _is_word(token):
+    return len(token) > 1 and not any(c in _PUNCTUATION for c in token)
+
+
+def _strip_punctuation(token, punc_list):
+    """VADER's token cleanup: one leading or trailing mark dropped from a plain word"""
+    if token[0] not in _PUNCTUATION and token[-1] not in _PUNCTUATION:
+        return token
+    for mark in punc_list:
+        if token.endswith(mark) and _is_word(token[:-len(mark)]):
+            return token[:-len(mark)]
+    for mark in punc_list:
+        if token.startswith(mark) and _is_word(token[len(mark):]):
+            return token[len(mark):]
+    return token
+
+
+class _Features:
+    """Per-vocabulary-id lookups, with one extra 'no token' id at the end"""
+
+    def __init__(self, vocabulary, analyzer):
+        constants = analyzer.constants
+        lexicon = analyzer.lexicon
+        boosters = constants.BOOSTER_DICT
+        strings = vocabulary.tokens + ['']
+        lower = [s.lower() for s in strings]
+        self.none = len(vocabulary)
+
+        def flags(predicate, source):
+            return np.array([predicate(s) for s in source], dtype=bool)
+
+        self.in_lexicon = flags(lambda s: s in lexicon, lower)
+        self.in_lexicon[self.none] = False
+        self.valence = np.array([lexicon.get(s, 0.0) for s in lower], dtype=np.float64)
+        self.is_booster = flags(lambda s: s in boosters, lower)
+        self.is_booster[self.none] = False
+        self.booster = np.array([boosters.get(s, 0.0) for s in lower], dtype=np.float64)
+        self.upper = flags(str.isupper, strings)
+        self.negate = flags(lambda s: s in constants.NEGATE or "n't" in s, lower)
+        self.negate[self.none] = False
+        # 'never so/this' compares the words as written
+        self.never = flags(lambda s: s == 'never', strings)
+        self.so_this = flags(lambda s: s in ('so', 'this'), strings)
+        self.least = flags(lambda s: s == 'least', lower)
+        self.at_very = flags(lambda s: s in ('at', 'very'), lower)
+        self.kind = flags(lambda s: s == 'kind', lower)
+        self.of = flags(lambda s: s == 'of', lower)
+        self.but = flags(lambda s: s == 'but', lower)
+
+        # Multi-word idioms and boosters as id tuples (matched as written);
+        # phrases containing a word absent from the batch can never match
+        def id_phrases(phrases):
+            found = {}
+            for phrase, value in phrases.items():
+                ids = tuple(vocabulary.lookup(word) for word in phrase.split(' '))
+                if -1 not in ids:
+                    found[ids] = value
+            return found
+
+        self.idioms = id_phrases(constants.SPECIAL_CASE_IDIOMS)
+        self.booster_phrases = id_phrases({k: v for k, v in boosters.items() if ' ' in k})
+
+
+def _shifted(ids, position, lengths_by_token, offset, none):
+    """Id `offset` tokens before (or after, if negative) each token; `none` past the ends"""
+    n = len(ids)
+    source = np.arange(n) - offset
+    valid = (position >= offset) & (position - offset < lengths_by_token)
+    return np.where(valid, ids[np.clip(source, 0, max(n - 1, 0))], none)
+
+
+def _match(windows, phrases):
+    """Positions whose id window equals any of the phrases; value where matched"""
+    matched = np.zeros(len(windows[0]), dtype=bool)
+    value = np.zeros(len(windows[0]))
+    for ids, phrase_value in phrases.items():
+        if len(ids) != len(windows):
+            continue
+        hit = np.logical_and.reduce([w == i for w, i in zip(windows, ids)])
+        value[hit & ~matched] = phrase_value
+        matched |= hit
+    return matched, value
+
+
+def score_texts(texts, analyzer=None):
+    """(len(texts) x 4) compound, pos, neg, neu scores, as polarity_scores() gives"""
+    analyzer = analyzer or vader_analyzer()
+    constants = analyzer.constants
+    scores = np.zeros((len(texts), len(SCORE_FIELDS)))
+    if not len(texts):
+        return scores
+
+    # Tokenize once into one flat id array plus per-text lengths; each distinct
+    # whitespace token is cleaned and given its id once
+    vocabulary, raw_ids, flat, lengths = Vocabulary(), {}, [], []
+    for text in texts:
+        n_tokens = len(flat)
+        for token in text.split():
+            if len(token) > 1:
+                token_id = raw_ids.get(token)
+                if token_id is None:
+                    token_id = raw_ids[token] = vocabulary.add(
+                        _strip_punctuation(token, constants.PUNC_LIST))
+                flat.append(token_id)
+        lengths.append(len(flat) - n_tokens)
+    n_texts = len(texts)
+    lengths = np.array(lengths, dtype=np.int64)
+    ids = np.array(flat, dtype=np.int64)
+    features = _Features(vocabulary, analyzer)
+    none = features.none
+    doc = np.repeat(np.arange(n_texts), lengths)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    position = np.arange(len(ids)) - starts[doc]
+    length = lengths[doc]
+
+    def shift(offset):
+        return _shifted(ids, position, length, offset, none)
+
+    before = {k: shift(k) for k in (1, 2, 3)}
+    after = {k: shift(-k) for k in (1, 2)}
+
+    # Mixed-case text: ALL-CAPS words are emphasized
+    n_upper = np.bincount(doc, weights=features.upper[ids], minlength=n_texts)
+    cap_diff = ((n_upper > 0) & (n_upper < lengths))[doc]
+
+    # Lexicon words (boosters and the 'kind' of 'kind of' score zero)
+    skipped = (features.kind[ids] & features.of[after[1]]) | features.is_booster[ids]
+    scored = features.in_lexicon[ids] & ~skipped
+    valence = np.where(scored, features.valence[ids], 0.0)
+    emphasized = scored & features.upper[ids] & cap_diff
+    valence = np.where(emphasized, np.where(valence > 0, valence + constants.C_INCR,
+                                            valence - constants.C_INCR), valence)
+
+    # Booster and negation window over the three preceding words
+    for distance, damping in ((1, 1.0), (2, 0.95), (3, 0.9)):
+        word = before[distance]
+        active = scored & (position >= distance) & ~features.in_lexicon[word]
+        boost = features.booster[word] * np.where(valence < 0, -1.0, 1.0)
+        caps = features.is_booster[word] & features.upper[word] & cap_diff
+        boost = boost + np.where(caps, np.where(valence > 0, constants.C_INCR, -constants.C_INCR), 0.0)
+        valence = np.where(active, valence + boost * damping, valence)
+
+        # Negation in the window ('never so' / 'never this' intensify instead)
+        negated = features.negate[word]
+        if distance == 1:
+            factor = np.where(negated, constants.N_SCALAR, 1.0)
+        elif distance == 2:
+            never_so = features.never[before[2]] & features.so_this[before[1]]
+            factor = np.where(never_so, 1.5, np.where(negated, constants.N_SCALAR, 1.0))
+        else:
+            # As in polarity_scores(): 'so'/'this' right before the word also counts
+            never_so = ((features.never[before[3]] & features.so_this[before[2]])
+                        | features.so_this[before[1]])
+            factor = np.where(never_so, 1.25, np.where(negated, constants.N_SCALAR, 1.0))
+        valence = np.where(active, valence * factor, valence)
+
+        if distance == 3:
+            valence = _idioms(valence, active, ids, before, after, features, constants)
+
+    # 'least' before a word negates it, unless 'at least' / 'very least'
+    least = scored & ~features.in_lexicon[before[1]] & features.least[before[1]]
+    negated = least & (((position > 1) & ~features.at_very[before[2]]) | (position == 1))
+    valence = np.where(negated, valence * constants.N_SCALAR, valence)
+
+    # A repeated word is scored with the context of its first occurrence
+    key = doc * (none + 1) + ids
+    _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    sentiment = valence[first[inverse]]
+
+    # 'but': words before it count half, words after it half again
+    but_at = np.full(n_texts, -1)
+    buts = np.flatnonzero(features.but[ids])[::-1]
+    but_at[doc[buts]] = position[buts]
+    but_at = but_at[doc]
+    sentiment = sentiment * np.where(but_at < 0, 1.0, np.where(
+        position < but_at, 0.5, np.where(position > but_at, 1.5, 1.0)))
+
+    # Sum per text, in token order, as polarity_scores() does
+    total = np.bincount(doc, weights=sentiment, minlength=n_texts)
+    pos_sum = np.bincount(doc, weights=np.where(sentiment > 0, sentiment + 1, 0.0), minlength=n_texts)
+    neg_sum = np.bincount(doc, weights=np.where(sentiment < 0, sentiment - 1, 0.0), minlength=n_texts)
+    neu_count = np.bincount(doc, weights=sentiment == 0, minlength=n_texts)
+
+    # Exclamation and question marks amplify whatever direction the text has
+    exclamations = np.array([text.count('!') for text in texts])
+    questions = np.array([text.count('?') for text in texts])
+    amplifier = np.minimum(exclamations, 4) * 0.292 + np.where(
+        questions > 1, np.where(questions <= 3, questions * 0.18, 0.96), 0.0)
+    total = np.where(total > 0, total + amplifier, np.where(total < 0, total - amplifier, total))
+    compound = total / np.sqrt(total * total + ALPHA)
+
+    pos_heavier = pos_sum > np.abs(neg_sum)
+    neg_heavier = pos_sum < np.abs(neg_sum)
+    pos_sum = np.where(pos_heavier, pos_sum + amplifier, pos_sum)
+    neg_sum = np.where(neg_heavier, neg_sum - amplifier, neg_sum)
+    denominator = pos_sum + np.abs(neg_sum) + neu_count
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Texts without tokens score all zeros
+        has_words = lengths > 0
+        scores[:, 0] = np.where(has_words, compound, 0.0)
+        scores[:, 1] = np.where(has_words, np.abs(pos_sum / denominator), 0.0)
+        scores[:, 2] = np.where(has_words, np.abs(neg_sum / denominator), 0.0)
+        scores[:, 3] = np.where(has_words, np.abs(neu_count / denominator), 0.0)
+    # Python's round(), not np.round(), so ties land where polarity_scores() puts them
+    return np.array([[round(c, 4), round(p, 3), round(n, 3), round(u, 3)]
+                     for c, p, n, u in scores.tolist()])
+
+
+def _idioms(valence, active, ids, before, after, features, constants):
+    """Idiom overrides and 'kind of'-style dampers, checked three words into the window"""
+    # The first of these matching (in this order) sets the valence
+    set_value = np.zeros(len(ids), dtype=bool)
+    value = np.zeros(len(ids))
+    for window in ((before[1], ids), (before[2], before[1], ids), (before[2], before[1]),
+                   (before[3], before[2], before[1]), (before[3], before[2])):
+        matched, phrase_value = _match(window, features.idioms)
+        new = matched & ~set_value
+        value[new] = phrase_value[new]
+        set_value |= matched
+    # Idioms starting at the word itself override those
+    for window in ((ids, after[1]), (ids, after[1], after[2])):
+        matched, phrase_value = _match(window, features.idioms)
+        value[matched] = phrase_value[matched]
+        set_value |= matched
+    valence = np.where(active & set_value, value, valence)
+
+    damped = (_match((before[3], before[2]), features.booster_phrases)[0]
+              | _match((before[2], before[1]), features.booster_phrases)[0])
+    return np.where(active & damped, valence + constants.B_DECR, valence)
+
+
+class LexiconVaderEngine(SentimentEngine):
+    """VADER's rules as vector operations: compound, pos, neg, neu"""
+
+    analyzer = 'vader-lexicon'
+    fields = SCORE_FIELDS
+    score_chunk = staticmethod(score_texts)
+
+    @property
+    def version(self):
+        return f"{vader_version()}-vector{VECTOR_VERSION}"
+
+    def score_texts(self, texts):
+        # One vectorized pass over the batch; a process pool would only add overhead
+        return self.score_chunk(texts)
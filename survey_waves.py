@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Incremental Survey Waves
+City of Austin ACME - Arts, Culture, Music & Entertainment Division
+
+Appends new survey exports to the responses already analyzed. Each export is
+deduplicated against earlier waves (by response ID, or by start time + email
+when the exports do not share IDs), only the new rows are stored, and the
+running aggregates (zip counts, barrier counts, sentiment, and a fixed-size
+sketch of the top improvement themes) are updated from those new rows alone.
+"""
+
+import json
+import os
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from survey_loader import file_sha256, load_survey
+from survey_multiselect import MultiSelect
+from survey_schema import SurveySchema
+from survey_sketches import ThemeSketch, english_stop_words
+
+WAVES_DIR_NAME = '.acme_waves'
+WAVE_COL = '_wave'
+
+# Questions (survey_schema keys) that identify a response for each key type
+KEY_QUESTIONS = {'id': ['id'], 'start_email': ['start_time', 'email']}
+
+
+def waves_dir_for(base_path):
+    """Wave store that sits next to the base workbook"""
+    return os.path.join(os.path.dirname(os.path.abspath(base_path)), WAVES_DIR_NAME)
+
+
+def resolve_key(columns, key='auto'):
+    """'auto' becomes 'id' when the export has response IDs"""
+    if key == 'auto':
+        return 'id' if 'id' in SurveySchema.resolve(columns) else 'start_email'
+    return key
+
+
+def key_questions(key):
+    if key not in KEY_QUESTIONS:
+        raise ValueError(f"Unknown deduplication key: {key!r}")
+    return KEY_QUESTIONS[key]
+
+
+def _key_part(value):
+    """Text of one key value: None when missing, whole-number floats as integers
+
+    An ID column with a gap is read as float, so 123 arrives as 123.0 and
+    must still match the '123' of an earlier wave.
+    """
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value).strip() or None
+
+
+def _key_strings(values):
+    return pd.Series([_key_part(v) for v in values.tolist()], index=values.index, dtype='string')
+
+
+def response_keys(df, key='auto'):
+    """One deduplication key per response, <NA> where part of the key is missing
+
+    'id' uses the response ID, 'start_email' uses start time + email, and
+    'auto' picks the ID when the export has one.
+    """
+    key = resolve_key(df.columns, key)
+    schema = SurveySchema.resolve(df.columns)
+    missing = [q for q in key_questions(key) if q not in schema]
+    if missing:
+        raise KeyError(f"Cannot deduplicate by {key!r}: export has no {', '.join(missing)} question")
+    if key == 'id':
+        return 'id:' + _key_strings(df[schema['id']])
+    start = pd.to_datetime(df[schema['start_time']], errors='coerce')
+    start = start.astype(str).astype('string').mask(start.isna())
+    email = _key_strings(df[schema['email']]).str.lower()
+    # <NA> propagates through the concatenation, so a partial key stays missing
+    return 'start_email:' + start + '|' + email
+
+
+class IncrementalAggregates:
+    """Running totals that can be advanced with only the newly added rows"""
+
+    def __init__(self, rows=0, zip_counts=None, barrier_counts=None, sentiment=None, themes=None):
+        self.rows = rows
+        self.zip_counts = Counter(zip_counts or {})
+        self.barrier_counts = Counter(barrier_counts or {})
+        self.sentiment = sentiment or {
+            'responses': 0, 'positive': 0, 'negative': 0, 'neutral': 0, 'compound_sum': 0.0
+        }
+        self.themes = themes or ThemeSketch(stop_words=english_stop_words())
+
+    def update(self, delta):
+        """Fold a frame of new responses into the totals"""
+        self.rows += len(delta)
+        schema = SurveySchema.resolve(delta.columns)
+        if 'zip' in schema:
+            zips = delta[schema['zip']].astype(str).str.strip()
+            self.zip_counts.update(zips.value_counts().to_dict())
+        if 'barriers' in schema:
+            barriers = MultiSelect.from_series(delta[schema['barriers']])
+            self.barrier_counts.update(dict(barriers.most_common()))
+        if 'improvements' in schema:
+            self._update_sentiment(delta[schema['improvements']].dropna())
+            # Sketch the wave on its own, then merge: memory stays fixed however many waves
+            wave_themes = ThemeSketch(stop_words=self.themes.stop_words)
+            self.themes.merge(wave_themes.add_texts(delta[schema['improvements']].dropna()))
+        return self
+
+    def _update_sentiment(self, responses):
+        try:
+            from survey_sentiment import VaderEngine
+            scores = VaderEngine().score(responses)
+        except (ImportError, LookupError):
+            return
+        counts = scores.counts()
+        self.sentiment['responses'] += int(scores.scored.sum())
+        self.sentiment['compound_sum'] += float(np.nansum(scores.compound))
+        for label in ('positive', 'negative', 'neutral'):
+            self.sentiment[label] += counts[label]
+
+    def to_dict(self):
+        return {
+            'rows': int(self.rows),
+            'zip_counts': {k: int(v) for k, v in self.zip_counts.most_common()},
+            'barrier_counts': {k: int(v) for k, v in self.barrier_counts.most_common()},
+            'sentiment': self.sentiment,
+            'themes': self.themes.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        # Aggregates saved before theme sketches existed start an empty sketch
+        themes = data.get('themes')
+        if themes is not None:
+            themes = ThemeSketch.from_dict(themes, english_stop_words())
+        return cls(data['rows'], data['zip_counts'], data['barrier_counts'], data['sentiment'], themes)
+
+
+class WaveStore:
+    """New rows from each ingested export, plus a manifest and aggregates"""
+
+    def __init__(self, base_path='ACME.xlsx', key='auto'):
+        self.base_path = base_path
+        self.key = key
+        self.directory = waves_dir_for(base_path)
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        self.aggregates_path = os.path.join(self.directory, 'aggregates.json')
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {'key': key, 'waves': []}
+
+    def _wave_path(self, wave):
+        return os.path.join(self.directory, f"wave_{wave['index']:04d}.parquet")
+
+    def load(self, columns=None, keys=None):
+        """All deduplicated responses across waves, tagged with `_wave`
+
+        `keys` names survey_schema questions to read, resolved against the
+        base wave's headers.
+        """
+        self._ensure_base()
+        if keys is not None:
+            headers = pq.read_schema(self._wave_path(self.manifest['waves'][0])).names
+            columns = list(columns or []) + SurveySchema.resolve(headers).projection(keys)
+        if columns is not None:
+            columns = list(columns) + [WAVE_COL]
+        frames = [pd.read_parquet(self._wave_path(w), columns=columns) for w in self.manifest['waves']]
+        return pd.concat(frames, ignore_index=True)
+
+    def aggregates(self):
+        self._ensure_base()
+        with open(self.aggregates_path) as f:
+            return IncrementalAggregates.from_dict(json.load(f))
+
+    def append(self, export_path):
+        """Ingest an export; returns the rows that were not seen before"""
+        self._ensure_base()
+        content_hash = file_sha256(export_path)
+        if any(w['content_hash'] == content_hash for w in self.manifest['waves']):
+            print(f"{export_path} was already ingested; nothing to add")
+            return load_survey(export_path).iloc[0:0]
+
+        export = load_survey(export_path)
+        key = self.manifest['key']
+        seen = set(response_keys(self.load(keys=key_questions(key)), key).dropna())
+        keys = response_keys(export, key)
+        # Rows without a complete key cannot be matched, so they are always new
+        is_new = keys.isna() | (~keys.isin(seen) & ~keys.duplicated())
+        delta = export[is_new.to_numpy(dtype=bool)].reset_index(drop=True)
+
+        self._write_wave(export_path, content_hash, delta, rows_in_export=len(export))
+
+        aggregates = self.aggregates().update(delta)
+        self._save_aggregates(aggregates)
+        return delta
+
+    def _ensure_base(self):
+        """The base workbook is wave 0"""
+        if self.manifest['waves']:
+            return
+        base = load_survey(self.base_path)
+        self.manifest['key'] = resolve_key(base.columns, self.key)
+        self._write_wave(self.base_path, file_sha256(self.base_path), base, rows_in_export=len(base))
+        self._save_aggregates(IncrementalAggregates().update(base))
+
+    def _write_wave(self, source, content_hash, delta, rows_in_export):
+        os.makedirs(self.directory, exist_ok=True)
+        wave = {
+            'index': len(self.manifest['waves']),
+            'source': os.path.basename(source),
+            'content_hash': content_hash,
+            'ingested_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'rows_in_export': int(rows_in_export),
+            'new_rows': int(len(delta)),
+            'duplicates': int(rows_in_export - len(delta)),
+        }
+        delta = delta.assign(**{WAVE_COL: wave['index']})
+        delta.to_parquet(self._wave_path(wave), index=False)
+        self.manifest['waves'].append(wave)
+        with open(self.manifest_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+
+    def _save_aggregates(self, aggregates):
+        with open(self.aggregates_path, 'w') as f:
+            json.dump(aggregates.to_dict(), f, indent=2)